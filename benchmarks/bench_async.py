@@ -0,0 +1,127 @@
+"""
+/webhook load test — Flask (threaded WSGI) vs. the asyncio (ASGI) server mode.
+
+Both servers get the same synthetic fetcher and one Slack-style channel
+pointed at a local sink that answers after ``--delay`` seconds, i.e. a slow
+notification on every alert. ``--concurrency`` clients post alerts until
+``--requests`` are done; the table shows throughput, latency and the peak
+thread count of this process while the server was under load.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_async
+  python -m benchmarks.bench_async --requests 5000 --concurrency 1000 --delay 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import threading
+import time
+
+import numpy as np
+from werkzeug.serving import make_server
+
+from src.alerts import AlertRouter
+from src.alerts.aio_http import AsyncHTTPPool
+from src.server import create_app, create_asgi_app
+from src.server.asgi import serve_async
+from src.utils import DataFetcher, MetricsRegistry
+
+
+def start_loop_server(app) -> tuple[str, int]:
+    """Serve an ASGI app on a background event loop; returns (host, port)."""
+    loop  = asyncio.new_event_loop()
+    bound = loop.create_future()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    asyncio.run_coroutine_threadsafe(serve_async(app, "127.0.0.1", 0, started=bound), loop)
+    listening = asyncio.wait_for(asyncio.shield(bound), 10)
+    return asyncio.run_coroutine_threadsafe(listening, loop).result()
+
+
+def slow_sink(delay: float):
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        await receive()
+        await asyncio.sleep(delay)
+        await send({
+            "type": "http.response.start", "status": 200, "headers": [(b"content-length", b"2")],
+        })
+        await send({"type": "http.response.body", "body": b"ok"})
+    return app
+
+
+async def load(url: str, requests: int, concurrency: int) -> tuple[np.ndarray, int, float, int]:
+    client  = AsyncHTTPPool(max_idle_per_host=concurrency)
+    alert   = {"ticker": "AAPL", "price": 180.5, "action": "buy", "interval": "1h"}
+    payload = json.dumps(alert).encode()
+    pending = iter(range(requests))
+    latency: list[float] = []
+    errors  = 0
+    peak    = threading.active_count()
+
+    async def worker() -> None:
+        nonlocal errors, peak
+        for _ in pending:
+            t0 = time.perf_counter()
+            try:
+                status, _ = await client.request("POST", url, payload, timeout=120)
+            except Exception:
+                status = 0
+            latency.append((time.perf_counter() - t0) * 1000)
+            errors += status != 200
+            peak    = max(peak, threading.active_count())
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - t0
+    await client.close()
+    return np.array(latency), errors, wall, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests",    type=int,   default=1000)
+    parser.add_argument("--concurrency", type=int,   default=200)
+    parser.add_argument("--delay",       type=float, default=0.2, help="sink latency (s)")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    sink_host, sink_port = start_loop_server(slow_sink(args.delay))
+    sink = f"http://{sink_host}:{sink_port}/hook"
+
+    def router(metrics: MetricsRegistry) -> AlertRouter:
+        r = AlertRouter(metrics=metrics, timeout=60)
+        r.add_slack(sink)
+        return r
+
+    print(f"  {args.requests} webhooks, {args.concurrency} concurrent,"
+          f" notification sink {args.delay:g}s")
+    print(f"  {'server':<8}  {'req/s':>8}  {'p50 ms':>9}  {'p99 ms':>9}"
+          f"  {'errors':>6}  {'threads':>7}")
+    for name in ("flask", "asgi"):
+        metrics = MetricsRegistry()
+        fetcher = DataFetcher(use_synthetic=True, metrics=metrics)
+        if name == "flask":
+            app  = create_app(fetcher=fetcher, router=router(metrics), metrics=metrics)
+            wsgi = make_server("127.0.0.1", 0, app, threaded=True)
+            wsgi.request_queue_size = 4096
+            threading.Thread(target=wsgi.serve_forever, daemon=True).start()
+            host, port = "127.0.0.1", wsgi.server_port
+        else:
+            app = create_asgi_app(fetcher=fetcher, router=router(metrics), metrics=metrics)
+            host, port = start_loop_server(app)
+
+        url = f"http://{host}:{port}/webhook"
+        lat, errors, wall, peak = asyncio.run(load(url, args.requests, args.concurrency))
+        print(f"  {name:<8}  {args.requests / wall:>8.1f}  {np.percentile(lat, 50):>9.1f}  "
+              f"{np.percentile(lat, 99):>9.1f}  {errors:>6}  {peak:>7}")
+        if name == "flask":
+            wsgi.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Indicator micro-benchmarks with a JSON baseline and a regression gate.
+
+Times every indicator, CustomSignalEngine.run / .history and BatchSignalEngine on
+deterministic synthetic data (DataFetcher._synthetic_data — fully offline),
+and records best-of-N wall time plus tracemalloc peak memory per case.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_indicators                       # run + print
+  python -m benchmarks.bench_indicators --save                # write the baseline
+  python -m benchmarks.bench_indicators --check               # exit 1 on regression
+  python -m benchmarks.bench_indicators --sizes 200 5000 --only rsi st --check --threshold 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.indicators import (
+    BatchSignalEngine, BollingerBands, CustomSignalEngine, MACDIndicator,
+    RSIIndicator, SuperTrend, VWAPIndicator,
+)
+from src.indicators.kernels import JIT_AVAILABLE
+from src.utils.data_fetcher import DataFetcher
+
+BASELINE      = Path(__file__).with_name("baseline.json")
+SIZES         = (200, 5_000, 50_000, 1_000_000)
+BATCH_TICKERS = (10, 100, 1_000)
+BATCH_BARS    = 500
+
+Case = Callable[[], object]
+
+
+@dataclass
+class Result:
+    name:    str
+    ms:      float          # best of ``repeat`` runs
+    peak_kb: float          # tracemalloc peak of one run
+
+
+@dataclass
+class Regression:
+    name:     str
+    metric:   str
+    baseline: float
+    current:  float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+# ── Cases ─────────────────────────────────────────────────────────────────────
+def series_cases(n: int) -> dict[str, Case]:
+    df = DataFetcher._synthetic_data("BENCH", n)
+    h, l, c, v = df["high"], df["low"], df["close"], df["volume"]
+    rsi, macd, bb = RSIIndicator(), MACDIndicator(), BollingerBands()
+    st, vwap      = SuperTrend(), VWAPIndicator()
+    engine = CustomSignalEngine()
+    return {
+        f"rsi/{n}":    lambda: rsi.calculate(c),
+        f"macd/{n}":   lambda: macd.calculate(c),
+        f"bb/{n}":     lambda: bb.calculate(c),
+        f"st/{n}":     lambda: st.calculate(h, l, c),
+        f"vwap/{n}":   lambda: vwap.calculate(h, l, c, v),
+        f"engine/{n}": lambda: engine.run(h, l, c, v),
+        f"history/{n}": lambda: engine.history(h, l, c, v),
+    }
+
+
+def batch_cases(tickers: Iterable[int], bars: int = BATCH_BARS) -> dict[str, Case]:
+    cases  = {}
+    engine = BatchSignalEngine()
+    for k in tickers:
+        frames = [DataFetcher._synthetic_data(f"T{i}", bars) for i in range(k)]
+        stack  = lambda col, frames=frames: np.vstack([f[col].to_numpy() for f in frames])
+        h, l, c, v = map(stack, ("high", "low", "close", "volume"))
+        cases[f"batch/{k}x{bars}"] = lambda h=h, l=l, c=c, v=v: engine.run(h, l, c, v)
+    return cases
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+def measure(name: str, fn: Case, repeat: int) -> Result:
+    fn()                                          # warm up (JIT, caches)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()                           # separate run: tracing skews timing
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(name, round(best * 1000, 4), round(peak / 1024, 1))
+
+
+def _repeat_for(name: str, default: int) -> int:
+    size = name.rsplit("/", 1)[-1]
+    return 1 if size.isdigit() and int(size) >= 1_000_000 else default
+
+
+def run(
+    sizes:   Iterable[int] = SIZES,
+    tickers: Iterable[int] = BATCH_TICKERS,
+    only:    Optional[set[str]] = None,
+    repeat:  int = 5,
+    out=sys.stdout,
+) -> list[Result]:
+    cases: dict[str, Case] = {}
+    if not only or only - {"batch"}:
+        for n in sizes:
+            cases.update(series_cases(n))
+    if not only or "batch" in only:
+        cases.update(batch_cases(tickers))
+
+    results = []
+    for name, fn in cases.items():
+        if only and name.split("/")[0] not in only:
+            continue
+        r = measure(name, fn, _repeat_for(name, repeat))
+        results.append(r)
+        print(f"  {r.name:<22} {r.ms:>11.3f} ms  {r.peak_kb:>12.1f} KiB", file=out, flush=True)
+    return results
+
+
+# ── Baseline ──────────────────────────────────────────────────────────────────
+def environment() -> dict[str, str]:
+    return {
+        "python":  platform.python_version(),
+        "numpy":   np.__version__,
+        "pandas":  pd.__version__,
+        "backend": "numba" if JIT_AVAILABLE else "python",
+        "machine": f"{platform.system()} {platform.machine()}",
+    }
+
+
+def save_baseline(results: list[Result], path: Path = BASELINE) -> None:
+    existing = load_baseline(path) if path.exists() else {}
+    existing.update({r.name: {"ms": r.ms, "peak_kb": r.peak_kb} for r in results})
+    data = {"env": environment(), "results": existing}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def load_baseline(path: Path = BASELINE) -> dict[str, dict[str, float]]:
+    return json.loads(path.read_text())["results"]
+
+
+def compare(
+    results:       list[Result],
+    baseline:      dict[str, dict[str, float]],
+    threshold:     float = 0.25,
+    mem_threshold: float = 0.25,
+    min_ms:        float = 0.05,
+) -> list[Regression]:
+    """
+    Cases slower (or larger) than baseline × (1 + threshold). Timings under
+    ``min_ms`` are too noisy to gate on; cases missing from the baseline are skipped.
+    """
+    found = []
+    for r in results:
+        base = baseline.get(r.name)
+        if base is None:
+            continue
+        if r.ms > base["ms"] * (1 + threshold) and r.ms - base["ms"] > min_ms:
+            found.append(Regression(r.name, "ms", base["ms"], r.ms))
+        if r.peak_kb > base["peak_kb"] * (1 + mem_threshold) and r.peak_kb - base["peak_kb"] > 64:
+            found.append(Regression(r.name, "peak_kb", base["peak_kb"], r.peak_kb))
+    return found
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes",   type=int, nargs="+", default=list(SIZES),
+                        help="Series lengths (bars)")
+    parser.add_argument("--tickers", type=int, nargs="+", default=list(BATCH_TICKERS),
+                        help=f"Batch sizes (tickers × {BATCH_BARS} bars)")
+    parser.add_argument("--only",    nargs="+", metavar="CASE",
+                        help="Subset of: rsi macd bb st vwap engine history batch")
+    parser.add_argument("--repeat",  type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save",    action="store_true",
+                        help="Write/merge results into the baseline")
+    parser.add_argument("--check",   action="store_true", help="Exit 1 if any case regressed")
+    parser.add_argument("--threshold",     type=float, default=0.25,
+                        help="Allowed slowdown (0.25 = +25%%)")
+    parser.add_argument("--mem-threshold", type=float, default=0.25,
+                        help="Allowed peak-memory growth")
+    args = parser.parse_args(argv)
+
+    print(f"  backend: {environment()['backend']}")
+    results = run(args.sizes, args.tickers, set(args.only) if args.only else None, args.repeat)
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"  baseline written to {args.baseline}")
+    if not args.check:
+        return 0
+    if not args.baseline.exists():
+        print(f"  no baseline at {args.baseline} — run with --save first", file=sys.stderr)
+        return 2
+
+    regressions = compare(results, load_baseline(args.baseline), args.threshold, args.mem_threshold)
+    for reg in regressions:
+        print(f"  REGRESSION {reg.name} {reg.metric}: "
+              f"{reg.baseline:g} -> {reg.current:g} ({reg.ratio:.2f}x)")
+    print(f"  {len(regressions)} regression(s) beyond "
+          f"+{args.threshold:.0%} time / +{args.mem_threshold:.0%} memory")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Watchlist scan scaling — the same synthetic universe on 1 … N processes.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_scan
+  python -m benchmarks.bench_scan --tickers 2000 --bars 1000 --processes 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+from src.scan import scan
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickers",   type=int, default=500)
+    parser.add_argument("--bars",      type=int, default=500)
+    parser.add_argument("--interval",  default="1h")
+    parser.add_argument("--processes", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    tickers = [f"T{i:05d}" for i in range(args.tickers)]
+    print(f"  {args.tickers} tickers × {args.bars} bars, {os.cpu_count()} CPUs")
+    print(f"  {'procs':>5}  {'wall s':>8}  {'tickers/s':>10}  {'speedup':>8}")
+    base = None
+    for p in args.processes:
+        report = scan(tickers, args.interval, source="synthetic", processes=p, bars=args.bars)
+        base   = base or report.wall_s
+        rate   = report.throughput()["tickers_per_s"]
+        print(f"  {p:>5}  {report.wall_s:>8.2f}  {rate:>10.1f}  {base / report.wall_s:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
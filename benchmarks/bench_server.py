@@ -0,0 +1,86 @@
+"""
+/signal load test — shared ServerContext vs. building engine + fetcher per request.
+
+"per-request" replays the old view (a fresh CustomSignalEngine and
+DataFetcher on every call, so no warm bar cache); "shared" is the app's own
+/signal with and without the SignalCache. Requests go through the Flask
+test client from ``--clients`` threads over a small synthetic universe.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_server
+  python -m benchmarks.bench_server --requests 2000 --clients 8 --tickers 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from flask import jsonify
+
+from src.alerts.handler import compute_signal
+from src.indicators import CustomSignalEngine
+from src.server import ServerContext, create_app
+from src.utils import DataFetcher, MetricsRegistry, SignalCache
+
+
+def make_app(mode: str):
+    metrics = MetricsRegistry()
+    context = ServerContext.build(
+        fetcher = DataFetcher(use_synthetic=True, metrics=metrics),
+        signals = SignalCache(0 if mode == "shared-nocache" else 4096),
+        metrics = metrics,
+    )
+    app = create_app(context=context, metrics=metrics)
+
+    @app.get("/signal-per-request/<ticker>")
+    def per_request(ticker: str):
+        ohlcv  = DataFetcher(use_synthetic=True, metrics=metrics).get(ticker.upper(), "1h")
+        result = compute_signal(CustomSignalEngine(), ohlcv)
+        return jsonify({"ticker": ticker.upper(), "rating": result.rating, "score": result.score})
+
+    return app
+
+
+def load(app, path: str, tickers: list[str], requests: int, clients: int) -> np.ndarray:
+    def one(i: int) -> float:
+        with app.test_client() as c:
+            t0 = time.perf_counter()
+            assert c.get(f"{path}/{tickers[i % len(tickers)]}?interval=1h").status_code == 200
+            return (time.perf_counter() - t0) * 1000
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        return np.array(list(pool.map(one, range(requests))))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--clients",  type=int, default=4)
+    parser.add_argument("--tickers",  type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    tickers = [f"T{i:03d}" for i in range(args.tickers)]
+    print(f"  {args.requests} requests, {args.clients} clients, {args.tickers} tickers")
+    print(f"  {'mode':<15}  {'req/s':>8}  {'p50 ms':>8}  {'p99 ms':>8}")
+    modes = (
+        ("per-request",    "/signal-per-request"),
+        ("shared-nocache", "/signal"),
+        ("shared",         "/signal"),
+    )
+    for mode, path in modes:
+        app = make_app(mode)
+        load(app, path, tickers, len(tickers), 1)                  # warm-up: first fetch per ticker
+        t0  = time.perf_counter()
+        lat = load(app, path, tickers, args.requests, args.clients)
+        wall = time.perf_counter() - t0
+        p50, p99 = np.percentile(lat, [50, 99])
+        print(f"  {mode:<15}  {args.requests / wall:>8.1f}  {p50:>8.2f}  {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+SuperTrend per-call benchmark — array kernel vs. the original .iloc loops.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_supertrend
+  python -m benchmarks.bench_supertrend --sizes 1000 10000 --repeat 5 --no-reference
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.reference      import supertrend_iloc
+from src.indicators.kernels    import JIT_AVAILABLE
+from src.indicators.supertrend import SuperTrend
+from src.utils.data_fetcher    import DataFetcher
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes",  type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-reference", action="store_true", help="Skip the slow .iloc baseline")
+    args = parser.parse_args()
+
+    st = SuperTrend()
+    print(f"  backend: {'numba' if JIT_AVAILABLE else 'python'}")
+    print(f"  {'bars':>8}  {'kernel ms':>10}  {'iloc ms':>10}  {'speedup':>8}")
+    for n in args.sizes:
+        df = DataFetcher._synthetic_data("BENCH", n)
+        h, l, c = df["high"], df["low"], df["close"]
+        st.calculate(h, l, c)                               # warm up JIT / caches
+        fast = _best_of(lambda h=h, l=l, c=c: st.calculate(h, l, c), args.repeat)
+        if args.no_reference:
+            print(f"  {n:>8}  {fast:>10.2f}  {'-':>10}  {'-':>8}")
+            continue
+        slow = _best_of(lambda h=h, l=l, c=c: supertrend_iloc(h, l, c), 1)
+        print(f"  {n:>8}  {fast:>10.2f}  {slow:>10.1f}  {slow / fast:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Reference implementations — the original per-bar code, kept verbatim as
+ground truth for the parity tests and as the baseline the benchmarks
+report speedups against. Deliberately independent of src.indicators, so a
+change there cannot move the reference along with it.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+
+def supertrend_atr(
+    high: pd.Series, low: pd.Series, close: pd.Series, period: int = 10,
+) -> pd.Series:
+    """The original SuperTrend ATR: pd.concat true range, EMA-smoothed."""
+    tr = pd.concat([
+        high - low,
+        (high - close.shift()).abs(),
+        (low  - close.shift()).abs(),
+    ], axis=1).max(axis=1)
+    return tr.ewm(span=period, adjust=False).mean()
+
+
+def supertrend_iloc(
+    high: pd.Series, low: pd.Series, close: pd.Series, period: int = 10, multiplier: float = 3.0,
+) -> tuple[pd.Series, pd.Series]:
+    """The original per-bar .iloc SuperTrend → (supertrend, direction)."""
+    hl2 = (high + low) / 2
+    atr = supertrend_atr(high, low, close, period)
+    upper_band = hl2 + multiplier * atr
+    lower_band = hl2 - multiplier * atr
+    for i in range(1, len(upper_band)):
+        upper_band.iloc[i] = (
+            upper_band.iloc[i]
+            if upper_band.iloc[i] < upper_band.iloc[i - 1]
+            or close.iloc[i - 1] > upper_band.iloc[i - 1]
+            else upper_band.iloc[i - 1]
+        )
+        lower_band.iloc[i] = (
+            lower_band.iloc[i]
+            if lower_band.iloc[i] > lower_band.iloc[i - 1]
+            or close.iloc[i - 1] < lower_band.iloc[i - 1]
+            else lower_band.iloc[i - 1]
+        )
+    direction = pd.Series(index=close.index, dtype=float)
+    st        = pd.Series(index=close.index, dtype=float)
+    for i in range(len(close)):
+        if i == 0:
+            direction.iloc[i] = 1
+            st.iloc[i]        = lower_band.iloc[i]
+            continue
+        if st.iloc[i - 1] == upper_band.iloc[i - 1]:
+            direction.iloc[i] = -1 if close.iloc[i] <= upper_band.iloc[i] else 1
+        else:
+            direction.iloc[i] = 1 if close.iloc[i] >= lower_band.iloc[i] else -1
+        st.iloc[i] = lower_band.iloc[i] if direction.iloc[i] == 1 else upper_band.iloc[i]
+    return st, direction
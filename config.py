@@ -23,6 +23,27 @@ class Config:
     # ── Security ──────────────────────────────────────────────────────────────
     WEBHOOK_SECRET: str = os.getenv("WEBHOOK_SECRET", "")   # Set to secure random string in prod
 
+    # ── Webhook processing ────────────────────────────────────────────────────
+    ASYNC_WEBHOOKS:     bool = os.getenv("ASYNC_WEBHOOKS", "false").lower() == "true"
+    WEBHOOK_WORKERS:    int  = int(os.getenv("WEBHOOK_WORKERS",    "4"))
+    WEBHOOK_QUEUE_SIZE: int  = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+
+    # ── Asyncio server mode (python main.py --asgi) ───────────────────────────
+    ASGI:             bool = os.getenv("ASGI", "false").lower() == "true"
+    ASGI_IO_WORKERS:  int  = int(os.getenv("ASGI_IO_WORKERS",  "32"))    # blocking fetches at once
+    ASGI_CPU_WORKERS: int  = int(os.getenv("ASGI_CPU_WORKERS", "0"))     # composites (0 = CPUs)
+
+    # ── Batch signals (POST /signals) ─────────────────────────────────────────
+    # per request: concurrent fetches, and at most this many ticker × interval pairs
+    SIGNALS_BATCH_WORKERS: int = int(os.getenv("SIGNALS_BATCH_WORKERS", "8"))
+    SIGNALS_BATCH_MAX:     int = int(os.getenv("SIGNALS_BATCH_MAX",     "500"))
+
+    # ── Live signal stream (GET /stream, Server-Sent Events) ──────────────────
+    # buffer: events held per slow subscriber; heartbeat: keep-alive comment interval
+    STREAM_BUFFER:          int   = int(os.getenv("STREAM_BUFFER",          "100"))
+    STREAM_MAX_SUBSCRIBERS: int   = int(os.getenv("STREAM_MAX_SUBSCRIBERS", "1000"))
+    STREAM_HEARTBEAT_S:     float = float(os.getenv("STREAM_HEARTBEAT_S",   "15"))
+
     # ── Notifications ─────────────────────────────────────────────────────────
     TELEGRAM_TOKEN:   str = os.getenv("TELEGRAM_TOKEN",   "")
     TELEGRAM_CHAT_ID: str = os.getenv("TELEGRAM_CHAT_ID", "")
@@ -33,6 +54,15 @@ class Config:
     USE_SYNTHETIC:    bool = os.getenv("USE_SYNTHETIC", "false").lower() == "true"
     DEFAULT_INTERVAL: str  = os.getenv("DEFAULT_INTERVAL", "1h")
 
+    # ── OHLCV cache ───────────────────────────────────────────────────────────
+    CACHE_ENABLED:     bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_MAX_ENTRIES: int  = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+    CACHE_MAX_MB:      int  = int(os.getenv("CACHE_MAX_MB",      "256"))
+    SIGNAL_CACHE_ENTRIES: int = int(os.getenv("SIGNAL_CACHE_ENTRIES", "4096"))   # 0 = no caching
+
+    # ── Local bar store (empty = disabled) ────────────────────────────────────
+    BAR_STORE_DIR: str = os.getenv("BAR_STORE_DIR", "")
+
     # ── Indicator defaults ─────────────────────────────────────────────────────
     RSI_PERIOD:   int   = int(os.getenv("RSI_PERIOD",   "14"))
     RSI_OB:       float = float(os.getenv("RSI_OB",     "70"))
@@ -41,6 +71,32 @@ class Config:
     BB_STD:       float = float(os.getenv("BB_STD",     "2.0"))
     ST_PERIOD:    int   = int(os.getenv("ST_PERIOD",    "10"))
     ST_MULT:      float = float(os.getenv("ST_MULT",    "3.0"))
+    # VWAP session reset: daily / weekly / monthly / a pandas frequency / none
+    VWAP_SESSION:       str = os.getenv("VWAP_SESSION",       "daily")
+    VWAP_SESSION_START: str = os.getenv("VWAP_SESSION_START", "")      # e.g. 18:00 for futures
+    EXCHANGE_TZ:        str = os.getenv("EXCHANGE_TZ",        "")      # empty = the data's own tz
+
+    # ── Multi-timeframe confluence (/mtf, --signal --mtf) ─────────────────────
+    # MTF_BASE is the one interval downloaded; MTF_TIMEFRAMES is interval:weight, …
+    MTF_BASE:       str = os.getenv("MTF_BASE",       "1h")
+    MTF_TIMEFRAMES: str = os.getenv("MTF_TIMEFRAMES", "1h:0.25,4h:0.35,D:0.4")
+
+    # ── Warmup-aware history trimming (empty tolerance = full history) ────────
+    WARMUP_TOLERANCE: float | None = float(os.getenv("WARMUP_TOLERANCE") or 0) or None
+    WARMUP_STRICT:    bool = os.getenv("WARMUP_STRICT", "false").lower() == "true"
+
+    # ── Composite weights / rating floors (JSON from src.backtest.optimize) ───
+    ENGINE_PROFILE: str = os.getenv("ENGINE_PROFILE", "")      # empty = built-in weights
+
+    # ── Backtests (--backtest) ────────────────────────────────────────────────
+    BACKTEST_FEE_BPS:      float = float(os.getenv("BACKTEST_FEE_BPS",      "1.0"))
+    BACKTEST_SLIPPAGE_BPS: float = float(os.getenv("BACKTEST_SLIPPAGE_BPS", "2.0"))
+    BACKTEST_PROCESSES:    int   = int(os.getenv("BACKTEST_PROCESSES",      "0"))    # 0 = CPU count
+
+    # ── Watchlist scans (--scan) ──────────────────────────────────────────────
+    SCAN_PROCESSES:     int = int(os.getenv("SCAN_PROCESSES",     "0"))     # 0 = CPU count
+    SCAN_FETCH_WORKERS: int = int(os.getenv("SCAN_FETCH_WORKERS", "8"))     # concurrent downloads
+    SCAN_BARS:          int = int(os.getenv("SCAN_BARS",          "500"))   # --demo bars per ticker
 
     # ── Logging ───────────────────────────────────────────────────────────────
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -8,6 +8,10 @@ Usage:
   python main.py                    # Start webhook server (default)
   python main.py --signal AAPL      # Query signal for a ticker
   python main.py --signal BTCUSD --interval 4h
+  python main.py --signal AAPL --mtf  # 1h / 4h / D confluence from one download
+  python main.py --backtest AAPL MSFT --interval 1h   # Offline backtest (bar store)
+  python main.py --scan watchlist.txt --out ranked.csv # Rank a watchlist
+  python main.py --asgi             # asyncio server: /health, /webhook, /signal
   python main.py --demo             # Run with synthetic data
   python main.py --port 8080        # Custom port
 """
@@ -21,22 +25,53 @@ from config import cfg
 from src.utils.logger import setup_logging
 
 
-def run_server(host: str, port: int, debug: bool) -> None:
-    from src.server    import create_app
-    from src.alerts    import AlertRouter
-    from src.utils     import DataFetcher
+def make_engine():
+    from src.server.context import engine_from_config
+    return engine_from_config(cfg)
+
+
+def make_confluence(engine, fetcher=None):
+    from src.server.context import confluence_from_config
+    return confluence_from_config(cfg, engine, fetcher)
+
+
+def make_fetcher(engine=None, confluence=None, fallback_synthetic=True):
+    from src.server.context import fetcher_from_config
+    return fetcher_from_config(cfg, engine, confluence, fallback_synthetic=fallback_synthetic)
+
 
-    fetcher = DataFetcher(use_synthetic=cfg.USE_SYNTHETIC)
-    router  = AlertRouter()
+def make_router():
+    from src.alerts import AlertRouter
 
+    router = AlertRouter()
     if cfg.TELEGRAM_TOKEN and cfg.TELEGRAM_CHAT_ID:
         router.add_telegram(cfg.TELEGRAM_TOKEN, cfg.TELEGRAM_CHAT_ID)
     if cfg.SLACK_WEBHOOK:
         router.add_slack(cfg.SLACK_WEBHOOK)
     if cfg.DISCORD_WEBHOOK:
         router.add_discord(cfg.DISCORD_WEBHOOK)
+    return router
 
-    app = create_app(fetcher=fetcher, router=router)
+
+def run_server(host: str, port: int, debug: bool) -> None:
+    from src.server    import ServerContext, create_app
+    from src.alerts    import SignalHub
+
+    context = ServerContext.from_config(cfg)      # one engine / fetcher / cache for all requests
+    router  = make_router()
+    hub     = SignalHub(buffer=cfg.STREAM_BUFFER, max_subscribers=cfg.STREAM_MAX_SUBSCRIBERS)
+
+    app = create_app(
+        context    = context,
+        router     = router,
+        async_mode = cfg.ASYNC_WEBHOOKS,
+        workers    = cfg.WEBHOOK_WORKERS,
+        queue_size = cfg.WEBHOOK_QUEUE_SIZE,
+        batch_workers = cfg.SIGNALS_BATCH_WORKERS,
+        batch_max     = cfg.SIGNALS_BATCH_MAX,
+        hub           = hub,
+        stream_heartbeat = cfg.STREAM_HEARTBEAT_S,
+    )
 
     print(f"""
   ┌─────────────────────────────────────────────────┐
@@ -45,6 +80,9 @@ def run_server(host: str, port: int, debug: bool) -> None:
   │  Webhook:  http://{host}:{port}/webhook          │
   │  Health:   http://{host}:{port}/health           │
   │  Signal:   http://{host}:{port}/signal/<ticker>  │
+  │  Batch:    POST http://{host}:{port}/signals     │
+  │  Stream:   http://{host}:{port}/stream           │
+  │  MTF:      http://{host}:{port}/mtf/<ticker>     │
   │                                                 │
   │  Point your TradingView alerts at:              │
   │    POST http://<your-ip>:{port}/webhook          │
@@ -54,13 +92,36 @@ def run_server(host: str, port: int, debug: bool) -> None:
     app.run(host=host, port=port, debug=debug)
 
 
-def run_signal(ticker: str, interval: str) -> None:
-    from src.indicators import CustomSignalEngine
-    from src.utils      import DataFetcher
+def asgi_app():
+    """ASGI factory, e.g. ``uvicorn "main:asgi_app" --factory``."""
+    from src.server import ServerContext, create_asgi_app
+
+    return create_asgi_app(
+        context     = ServerContext.from_config(cfg),
+        router      = make_router(),
+        io_workers  = cfg.ASGI_IO_WORKERS,
+        cpu_workers = cfg.ASGI_CPU_WORKERS or None,
+    )
+
+
+def run_asgi_server(host: str, port: int) -> None:
+    from src.server import serve
 
-    fetcher = DataFetcher(use_synthetic=cfg.USE_SYNTHETIC)
+    app = asgi_app()
+    print(f"  asyncio server on http://{host}:{port}"
+          "  (/health, /webhook, /signal/<ticker>, /stats, /metrics)")
+    try:
+        import uvicorn
+    except ImportError:                 # optional: the built-in HTTP/1.1 server needs nothing extra
+        serve(app, host, port)
+    else:
+        uvicorn.run(app, host=host, port=port, log_level=cfg.LOG_LEVEL.lower())
+
+
+def run_signal(ticker: str, interval: str) -> None:
+    engine  = make_engine()
+    fetcher = make_fetcher(engine)
     ohlcv   = fetcher.get(ticker, interval)
-    engine  = CustomSignalEngine()
     result  = engine.run(
         high   = ohlcv["high"],
         low    = ohlcv["low"],
@@ -83,26 +144,126 @@ def run_signal(ticker: str, interval: str) -> None:
 """)
 
 
+def run_mtf(ticker: str) -> None:
+    engine     = make_engine()
+    confluence = make_confluence(engine)
+    confluence.fetcher = make_fetcher(engine, confluence)
+    result     = confluence.signal(ticker)
+
+    rows = "\n".join(
+        f"  {tf:<8} {sig.rating:<12} {sig.score:+.4f}  (weight {confluence.timeframes[tf]:g})"
+        for tf, sig in result.frames.items()
+    )
+    print(f"""
+  Ticker:  {ticker}
+  Base:    {result.base}
+  ──────────────────────────────
+  Rating:  {result.rating}
+  Score:   {result.score:+.4f}{"  (all timeframes agree)" if result.aligned else ""}
+  ──────────────────────────────
+{rows}
+""")
+
+
+def run_backtest(tickers: list[str], interval: str, short: bool, synthetic: bool) -> None:
+    import pandas as pd
+    from src.backtest import Backtester, run_universe, summary
+
+    backtester = Backtester(
+        engine       = make_engine(),
+        fee_bps      = cfg.BACKTEST_FEE_BPS,
+        slippage_bps = cfg.BACKTEST_SLIPPAGE_BPS,
+        allow_short  = short,
+    )
+    results = run_universe(
+        tickers, interval, backtester,
+        store_dir = None if synthetic else (cfg.BAR_STORE_DIR or None),
+        processes = cfg.BACKTEST_PROCESSES or None,
+    )
+    table = summary(results)
+    if table.empty:
+        print("  No bars to backtest — set BAR_STORE_DIR or use --demo")
+        return
+    with pd.option_context(
+        "display.width", 160, "display.max_columns", None, "display.float_format", "{:.4f}".format,
+    ):
+        print(table)
+
+
+def run_scan(path: str, interval: str, out: str | None, source: str, processes: int | None) -> None:
+    from src.scan import read_watchlist, scan
+
+    engine  = make_engine()
+    tickers = read_watchlist(path)
+    # a failed download must be an error row, not a rating from random bars
+    fetcher = make_fetcher(engine, fallback_synthetic=False) if source == "live" else None
+    report  = scan(
+        tickers, interval, engine,
+        source        = source,
+        fetcher       = fetcher,
+        store_dir     = cfg.BAR_STORE_DIR or None,
+        processes     = processes or cfg.SCAN_PROCESSES or None,
+        fetch_workers = cfg.SCAN_FETCH_WORKERS,
+        bars          = cfg.SCAN_BARS,
+    )
+    if out:
+        report.write(out)
+        print(f"  {len(report.rows)} rows written to {out}")
+    else:
+        import pandas as pd
+        with pd.option_context(
+            "display.width", 160, "display.max_columns", None, "display.max_rows", 50,
+        ):
+            print(report.table().drop(columns="error").head(50) if report.ok else "  No signals")
+
+    r = report.throughput()
+    print(f"\n  {len(report.ok)}/{len(tickers)} tickers ({source}, {interval})"
+          f" on {report.processes} process(es)")
+    print(f"  wall     {report.wall_s:8.2f} s   {r['tickers_per_s']:9.1f} tickers/s"
+          f"   {r['bars_per_s']:12.0f} bars/s")
+    print(f"  fetch    {report.fetch_s:8.2f} s   {r['fetch_tickers_per_s']:9.1f} tickers/s"
+          "  (busy time, all fetchers)")
+    print(f"  compute  {report.compute_s:8.2f} s   {r['compute_tickers_per_s']:9.1f} tickers/s"
+          "  (busy time, all workers)\n")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="TradingView Indicator Extension — webhook server + signal engine"
     )
     parser.add_argument("--signal",   metavar="TICKER", help="Query composite signal for ticker")
     parser.add_argument("--interval", default=cfg.DEFAULT_INTERVAL, help="Timeframe (default: 1h)")
-    parser.add_argument("--port",     type=int, default=cfg.PORT,   help="Server port (default: 5000)")
-    parser.add_argument("--host",     default=cfg.HOST,             help="Bind host (default: 0.0.0.0)")
+    parser.add_argument("--port",     type=int, default=cfg.PORT,   help="Port (default: 5000)")
+    parser.add_argument("--host",     default=cfg.HOST,             help="Host (default: 0.0.0.0)")
+    parser.add_argument("--mtf",      action="store_true",          help="Signal: multi-timeframe")
+    parser.add_argument("--backtest", metavar="TICKER", nargs="+",  help="Backtest tickers offline")
+    parser.add_argument("--short",    action="store_true",          help="Backtest: short on SELL")
+    parser.add_argument("--scan",     metavar="FILE",               help="Rank a watchlist file")
+    parser.add_argument("--out",      metavar="FILE",               help="Scan: write .csv/.json")
+    parser.add_argument("--offline",  action="store_true",          help="Scan: stored bars only")
+    parser.add_argument("--processes",type=int,                     help="Scan: worker processes")
+    parser.add_argument("--asgi",     action="store_true",          help="Asyncio server mode")
     parser.add_argument("--demo",     action="store_true",          help="Use synthetic demo data")
     parser.add_argument("--debug",    action="store_true",          help="Enable debug mode")
-    parser.add_argument("--log-level",default=cfg.LOG_LEVEL,        help="LOG level (default: INFO)")
+    parser.add_argument("--log-level",default=cfg.LOG_LEVEL,        help="Log level (default INFO)")
     args = parser.parse_args()
 
     setup_logging(args.log_level)
 
     if args.demo:
-        import os; os.environ["USE_SYNTHETIC"] = "true"
+        cfg.USE_SYNTHETIC = True        # cfg is already loaded; the environment is read at import
 
-    if args.signal:
+    if args.scan:
+        source = "synthetic" if args.demo else "store" if args.offline else "live"
+        run_scan(args.scan, args.interval, args.out, source, args.processes)
+    elif args.backtest:
+        run_backtest([t.upper() for t in args.backtest], args.interval, args.short, args.demo)
+    elif args.signal and args.mtf:
+        run_mtf(args.signal.upper())
+    elif args.signal:
         run_signal(args.signal.upper(), args.interval)
+    elif args.asgi or cfg.ASGI:
+        run_asgi_server(args.host, args.port)
     else:
         run_server(args.host, args.port, args.debug or cfg.DEBUG)
 
@@ -1,6 +1,9 @@
 """TradingView webhook alert processing."""
 from .parser  import AlertParser
 from .handler import AlertHandler
-from .router  import AlertRouter
+from .hub     import HubFull, SignalHub
+from .router  import AlertRouter, DispatchReport
+from .workers import AlertQueue, QueueFull
 
-__all__ = ["AlertParser", "AlertHandler", "AlertRouter"]
+__all__ = ["AlertParser", "AlertHandler", "AlertRouter", "DispatchReport", "AlertQueue",
+           "QueueFull", "SignalHub", "HubFull"]
@@ -0,0 +1,128 @@
+"""
+AsyncHTTPPool — HTTPPool's asyncio counterpart for the ASGI server.
+
+Keep-alive connections are asyncio streams pooled per (scheme, host, port);
+waiting on a slow webhook costs a suspended coroutine, not a thread, so one
+event loop can hold thousands of notifications in flight. Like HTTPPool, a
+request on a reused connection that the server has since closed is retried
+once on a fresh connection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import ssl
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+_Key = tuple[str, str, int]
+_Conn = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncHTTPPool:
+    def __init__(self, max_idle_per_host: int = 32) -> None:
+        self.max_idle = max_idle_per_host
+        self._idle: dict[_Key, list[_Conn]] = defaultdict(list)
+        self._ssl  = ssl.create_default_context()
+        self.opened = 0
+        self.reused = 0
+
+    async def post_json(self, url: str, payload: dict, timeout: float = 10.0) -> int:
+        """POST ``payload`` as JSON; returns the HTTP status code."""
+        status, _ = await self.request("POST", url, json.dumps(payload).encode(), timeout)
+        return status
+
+    async def request(
+        self, method: str, url: str, body: bytes = b"", timeout: float = 10.0,
+    ) -> tuple[int, bytes]:
+        """One request with a JSON body → (status, response body)."""
+        parts = urlsplit(url)
+        port  = parts.port or (443 if parts.scheme == "https" else 80)
+        key   = (parts.scheme, parts.hostname or "", port)
+        path  = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        head  = (
+            f"{method} {path} HTTP/1.1\r\nHost: {key[1]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n"
+        ).encode()
+        return await asyncio.wait_for(self._exchange(key, head + body), timeout)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, defaultdict(list)
+        for conns in idle.values():
+            for _, writer in conns:
+                writer.close()
+
+    def stats(self) -> dict[str, int]:
+        idle = sum(len(c) for c in self._idle.values())
+        return {"opened": self.opened, "reused": self.reused, "idle": idle}
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+    async def _exchange(self, key: _Key, request: bytes) -> tuple[int, bytes]:
+        conn, reused = await self._acquire(key)
+        try:
+            try:
+                status, body, keep = await self._send(conn, request)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                if not reused:
+                    raise
+                conn[1].close()                  # server dropped the idle connection: retry once
+                conn = await self._connect(key)
+                status, body, keep = await self._send(conn, request)
+        except BaseException:                    # includes the cancellation from wait_for
+            conn[1].close()
+            raise
+        if keep:
+            self._release(key, conn)
+        else:
+            conn[1].close()
+        return status, body
+
+    @staticmethod
+    async def _send(conn: _Conn, request: bytes) -> tuple[int, bytes, bool]:
+        reader, writer = conn
+        writer.write(request)
+        await writer.drain()
+        status_line = await reader.readuntil(b"\r\n")
+        version, status, *_ = status_line.decode("latin-1").split(" ", 2)
+        headers: dict[str, str] = {}
+        while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = b""
+            while size := int((await reader.readuntil(b"\r\n")).split(b";")[0], 16):
+                body += (await reader.readexactly(size + 2))[:-2]
+            await reader.readuntil(b"\r\n")      # trailer end
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            return int(status), await reader.read(), False
+
+        connection = headers.get("connection", "").lower()
+        keep = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+        return int(status), body, keep
+
+    async def _acquire(self, key: _Key) -> tuple[_Conn, bool]:
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if not conn[0].at_eof():
+                self.reused += 1
+                return conn, True
+            conn[1].close()
+        return await self._connect(key), False
+
+    async def _connect(self, key: _Key) -> _Conn:
+        scheme, host, port = key
+        self.opened += 1
+        ssl = self._ssl if scheme == "https" else None
+        return await asyncio.open_connection(host, port, ssl=ssl)
+
+    def _release(self, key: _Key, conn: _Conn) -> None:
+        idle = self._idle[key]
+        if len(idle) < self.max_idle:
+            idle.append(conn)
+        else:
+            conn[1].close()
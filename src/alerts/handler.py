@@ -1,19 +1,30 @@
 """
 AlertHandler — receives a ParsedAlert, fetches OHLCV data,
 runs the CustomSignalEngine, and emits an enriched AlertResult.
+Fetch, each indicator and the whole alert are timed into a MetricsRegistry.
+With a SignalCache, alerts on a series whose last bar has not changed reuse
+the previous composite instead of recomputing it.
+``handle_async`` is the asyncio variant: the blocking fetch and the
+CPU-bound indicator work run on executors, off the event loop.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
 import pandas as pd
 
 from .parser import ParsedAlert
 from ..indicators import CustomSignalEngine
+from ..utils.cache import SignalCache
 from ..utils.data_fetcher import DataFetcher
+from ..utils.metrics import REGISTRY, MetricsRegistry
 
 log = logging.getLogger(__name__)
 
@@ -23,40 +34,81 @@ class AlertResult:
     alert:        ParsedAlert
     composite:    object    # CompositeSignal
     processed_at: datetime
-    latency_ms:   float
+    latency_ms:   float     # fetch + indicators
 
 
 class AlertHandler:
-    def __init__(self, fetcher: DataFetcher | None = None) -> None:
-        self._engine  = CustomSignalEngine()
-        self._fetcher = fetcher or DataFetcher()
+    def __init__(
+        self,
+        fetcher: DataFetcher | None = None,
+        metrics: Optional[MetricsRegistry] = None,
+        engine:  CustomSignalEngine | None = None,
+        signals: SignalCache | None = None,
+    ) -> None:
+        self.metrics  = metrics or REGISTRY
+        # stage timings only on an engine built here: a caller's engine stays untouched
+        self._engine  = engine or CustomSignalEngine(metrics=self.metrics)
+        self._fetcher = fetcher or DataFetcher(metrics=self.metrics)
+        self.signals  = signals
 
     def handle(self, alert: ParsedAlert) -> AlertResult | None:
         if not alert.valid:
             log.warning("Skipping invalid alert: %s", alert.error)
             return None
 
-        t0 = datetime.utcnow()
+        t0 = time.perf_counter()
         log.info("Handling alert: %s %s @ %s", alert.action, alert.ticker, alert.price)
 
         try:
             ohlcv = self._fetcher.get(alert.ticker, alert.interval)
         except Exception as exc:
             log.error("Data fetch failed for %s: %s", alert.ticker, exc)
+            self.metrics.inc("alert_errors", stage="fetch")
             return None
 
         try:
-            signal = self._engine.run(
-                high   = ohlcv["high"],
-                low    = ohlcv["low"],
-                close  = ohlcv["close"],
-                volume = ohlcv.get("volume"),
+            signal = compute_signal(self._engine, ohlcv, self.signals, alert.ticker, alert.interval)
+        except Exception as exc:
+            log.error("Indicator calculation failed: %s", exc)
+            self.metrics.inc("alert_errors", stage="compute")
+            return None
+
+        return self._result(alert, signal, t0)
+
+    async def handle_async(
+        self, alert: ParsedAlert, io: Optional[Executor] = None, cpu: Optional[Executor] = None,
+    ) -> AlertResult | None:
+        """``handle``, fetching on ``io`` and computing on ``cpu`` (None = loop default)."""
+        if not alert.valid:
+            log.warning("Skipping invalid alert: %s", alert.error)
+            return None
+
+        t0   = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        log.info("Handling alert: %s %s @ %s", alert.action, alert.ticker, alert.price)
+
+        try:
+            ohlcv = await loop.run_in_executor(io, self._fetcher.get, alert.ticker, alert.interval)
+        except Exception as exc:
+            log.error("Data fetch failed for %s: %s", alert.ticker, exc)
+            self.metrics.inc("alert_errors", stage="fetch")
+            return None
+
+        try:
+            signal = await loop.run_in_executor(
+                cpu, compute_signal,
+                self._engine, ohlcv, self.signals, alert.ticker, alert.interval,
             )
         except Exception as exc:
             log.error("Indicator calculation failed: %s", exc)
+            self.metrics.inc("alert_errors", stage="compute")
             return None
 
-        latency = (datetime.utcnow() - t0).total_seconds() * 1000
+        return self._result(alert, signal, t0)
+
+    def _result(self, alert: ParsedAlert, signal, t0: float) -> AlertResult:
+        latency = (time.perf_counter() - t0) * 1000
+        self.metrics.observe("alert", latency)
 
         log.info(
             "Signal for %s: %s (score=%.3f) | RSI=%s MACD=%s ST=%s",
@@ -68,3 +120,24 @@ class AlertHandler:
             alert=alert, composite=signal,
             processed_at=datetime.utcnow(), latency_ms=latency,
         )
+
+
+def compute_signal(
+    engine:   CustomSignalEngine,
+    ohlcv:    pd.DataFrame,
+    signals:  SignalCache | None = None,
+    ticker:   str = "",
+    interval: str = "",
+):
+    """``engine.run`` on ``ohlcv``, through ``signals`` (if given): unchanged bars are not rerun."""
+    def run():
+        return engine.run(
+            high   = ohlcv["high"],
+            low    = ohlcv["low"],
+            close  = ohlcv["close"],
+            volume = ohlcv.get("volume"),
+        )
+
+    if signals is None:
+        return run()
+    return signals.get_or_compute((ticker, interval, engine.fingerprint()), ohlcv, run)
@@ -0,0 +1,108 @@
+"""
+HTTPPool — persistent keep-alive connections for notification webhooks.
+
+Idle http.client connections are pooled per (scheme, host, port) and reused
+across messages, so a Telegram/Slack/Discord post skips the TCP + TLS
+handshake after the first one. A request on a reused connection that the
+server has since closed is retried once on a fresh connection.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import logging
+import ssl
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+log = logging.getLogger(__name__)
+
+_Key = tuple[str, str, int]
+
+
+class HTTPPool:
+    def __init__(self, max_idle_per_host: int = 4) -> None:
+        self.max_idle = max_idle_per_host
+        self._idle: dict[_Key, list[http.client.HTTPConnection]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._ssl  = ssl.create_default_context()
+        self.opened = 0
+        self.reused = 0
+
+    def post_json(self, url: str, payload: dict, timeout: float = 10.0) -> int:
+        """POST ``payload`` as JSON; returns the HTTP status code."""
+        parts = urlsplit(url)
+        port  = parts.port or (443 if parts.scheme == "https" else 80)
+        key   = (parts.scheme, parts.hostname or "", port)
+        path  = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        body  = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+        conn, reused = self._acquire(key, timeout)
+        try:
+            status = self._send(conn, path, body, headers)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            conn, reused = self._connect(key, timeout), False
+            status = self._send(conn, path, body, headers)
+        except Exception:
+            conn.close()
+            raise
+        self._release(key, conn)
+        return status
+
+    def close(self) -> None:
+        with self._lock:
+            for conns in self._idle.values():
+                for c in conns:
+                    c.close()
+            self._idle.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            idle = sum(len(c) for c in self._idle.values())
+            return {"opened": self.opened, "reused": self.reused, "idle": idle}
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+    @staticmethod
+    def _send(conn: http.client.HTTPConnection, path: str, body: bytes, headers: dict) -> int:
+        conn.request("POST", path, body=body, headers=headers)
+        resp = conn.getresponse()
+        resp.read()                      # drain so the connection can be reused
+        if resp.will_close:
+            conn.close()
+        return resp.status
+
+    def _acquire(self, key: _Key, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                self.reused += 1
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        return self._connect(key, timeout), False
+
+    def _connect(self, key: _Key, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        with self._lock:
+            self.opened += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _release(self, key: _Key, conn: http.client.HTTPConnection) -> None:
+        if conn.sock is None:            # server closed it
+            return
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
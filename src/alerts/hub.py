@@ -0,0 +1,187 @@
+"""
+SignalHub — fan out processed alerts to live subscribers (the /stream SSE feed).
+
+Each AlertResult is serialized once into an SSE frame and offered to the
+subscribers whose filters match. Subscribers are indexed by ticker, so
+publishing touches only the interested ones, and nothing a subscriber does
+reaches the indicator engine — a thousand open dashboards cost a thousand
+buffer appends per alert, not a thousand composites.
+
+Every subscriber has its own bounded buffer. A reader that falls behind
+loses its oldest events (counted in ``dropped``) instead of blocking the
+publisher or growing without limit.
+
+    hub = SignalHub(buffer=100)
+    router.dispatch(result)
+    hub.publish(result)
+    with hub.subscribe(tickers={"AAPL"}, ratings={"STRONG BUY"}) as sub:
+        event = sub.get(timeout=15)
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from .handler import AlertResult
+
+
+class HubFull(Exception):
+    """Raised by SignalHub.subscribe when ``max_subscribers`` are already connected."""
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    id:     int
+    ticker: str
+    rating: str
+    frame:  bytes            # ready-to-send SSE frame, shared by every subscriber
+
+
+def event_payload(result: AlertResult) -> dict[str, Any]:
+    a, c = result.alert, result.composite
+    return {
+        "ticker":       a.ticker,
+        "exchange":     a.exchange,
+        "interval":     a.interval,
+        "action":       a.action,
+        "price":        a.price,
+        "rating":       c.rating,
+        "score":        c.score,
+        "rsi_signal":   c.rsi_signal,
+        "macd_signal":  c.macd_signal,
+        "bb_signal":    c.bb_signal,
+        "st_signal":    c.st_signal,
+        "vwap_signal":  c.vwap_signal,
+        "components":   c.components,
+        "processed_at": result.processed_at.isoformat() + "Z",
+        "latency_ms":   round(result.latency_ms, 2),
+    }
+
+
+class Subscription:
+    """One reader's filtered, bounded view of the hub. Close it (or use ``with``) when done."""
+
+    def __init__(
+        self,
+        hub:     "SignalHub",
+        tickers: Optional[frozenset[str]],
+        ratings: Optional[frozenset[str]],
+        buffer:  int,
+    ) -> None:
+        self.tickers  = tickers          # None = every ticker
+        self.ratings  = ratings          # None = every rating
+        self.dropped  = 0                # events discarded because the buffer was full
+        self.received = 0
+        self.closed   = False
+        self._hub     = hub
+        self._buffer: deque[StreamEvent] = deque(maxlen=max(1, buffer))
+        self._cond    = threading.Condition()
+
+    def offer(self, event: StreamEvent) -> None:
+        with self._cond:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1        # deque(maxlen) pushes the oldest out
+            self._buffer.append(event)
+            self.received += 1
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[StreamEvent]:
+        """Next event, or None on timeout / after ``close``."""
+        with self._cond:
+            if not self._buffer and not self.closed:
+                self._cond.wait(timeout)
+            return self._buffer.popleft() if self._buffer and not self.closed else None
+
+    def close(self) -> None:
+        with self._cond:
+            if self.closed:
+                return
+            self.closed = True
+            self._cond.notify_all()
+        self._hub._remove(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class SignalHub:
+    def __init__(self, buffer: int = 100, max_subscribers: int = 1000) -> None:
+        self.buffer          = buffer
+        self.max_subscribers = max_subscribers
+        self._lock   = threading.Lock()
+        self._ids    = itertools.count(1)
+        # ticker (None = unfiltered) → subscribers; tuples are replaced, never mutated,
+        # so publish can iterate them without holding the lock
+        self._routes: dict[Optional[str], tuple[Subscription, ...]] = {}
+        self._count     = 0
+        self._dropped   = 0            # by subscribers that have since closed
+        self.published  = 0
+        self.delivered  = 0
+
+    def subscribe(
+        self,
+        tickers: Optional[Iterable[str]] = None,
+        ratings: Optional[Iterable[str]] = None,
+        buffer:  Optional[int] = None,
+    ) -> Subscription:
+        """Events for ``tickers`` (None = all) whose rating is in ``ratings`` (None = all)."""
+        tickers = frozenset(t.upper() for t in tickers) if tickers else None
+        ratings = frozenset(r.upper() for r in ratings) if ratings else None
+        sub = Subscription(self, tickers, ratings, buffer or self.buffer)
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                raise HubFull(f"{self._count} subscribers connected (max {self.max_subscribers})")
+            for key in tickers or (None,):
+                self._routes[key] = self._routes.get(key, ()) + (sub,)
+            self._count += 1
+        return sub
+
+    def _remove(self, sub: Subscription) -> None:
+        with self._lock:
+            for key in sub.tickers or (None,):
+                rest = tuple(s for s in self._routes.get(key, ()) if s is not sub)
+                if rest:
+                    self._routes[key] = rest
+                else:
+                    self._routes.pop(key, None)
+            self._count   -= 1
+            self._dropped += sub.dropped
+
+    def publish(self, result: AlertResult) -> int:
+        """Offer ``result`` to every matching subscriber; returns how many got it."""
+        payload = event_payload(result)
+        event_id = next(self._ids)
+        event = StreamEvent(
+            id     = event_id,
+            ticker = payload["ticker"].upper(),
+            rating = payload["rating"],
+            frame  = f"id: {event_id}\nevent: signal\ndata: {json.dumps(payload)}\n\n".encode(),
+        )
+        routes = self._routes
+        delivered = 0
+        for sub in routes.get(event.ticker, ()) + routes.get(None, ()):
+            if sub.ratings is None or event.rating in sub.ratings:
+                sub.offer(event)
+                delivered += 1
+        with self._lock:
+            self.published += 1
+            self.delivered += delivered
+        return delivered
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            subs = {s for group in self._routes.values() for s in group}
+            return {
+                "subscribers": self._count,
+                "published":   self.published,
+                "delivered":   self.delivered,
+                "dropped":     self._dropped + sum(s.dropped for s in subs),
+            }
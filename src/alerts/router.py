@@ -5,63 +5,312 @@ AlertRouter — fan out AlertResult notifications to configured channels:
   • Discord webhook
   • Custom HTTP callback
   • Console / log (always active)
+
+Channels are sent concurrently over pooled keep-alive connections and every
+dispatch returns a DispatchReport with per-channel latency and outcome;
+the same latencies feed the ``notify`` stage histograms in a MetricsRegistry.
+``dispatch_async`` is the asyncio variant for the ASGI server: HTTP channels
+go out over an AsyncHTTPPool, custom callables run on the thread pool.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-import urllib.request
-import urllib.parse
-from typing import Callable
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
 
-from .handler import AlertResult
+from .aio_http  import AsyncHTTPPool
+from .handler   import AlertResult
+from .http_pool import HTTPPool
+from ..utils.metrics import REGISTRY, MetricsRegistry
 
 log = logging.getLogger(__name__)
 
 
+@dataclass
+class ChannelOutcome:
+    channel:    str
+    ok:         bool
+    latency_ms: float
+    status:     Optional[int] = None     # HTTP status, for webhook channels
+    error:      Optional[str] = None
+
+
+@dataclass
+class DispatchReport:
+    ticker:   str
+    total_ms: float
+    outcomes: list[ChannelOutcome] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(o.ok for o in self.outcomes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ticker":   self.ticker,
+            "ok":       self.ok,
+            "total_ms": round(self.total_ms, 2),
+            "channels": [
+                {
+                    "channel": o.channel, "ok": o.ok, "latency_ms": round(o.latency_ms, 2),
+                    "status": o.status, "error": o.error,
+                }
+                for o in self.outcomes
+            ],
+        }
+
+
+@dataclass
+class _Channel:
+    name:    str
+    send:    Callable[[AlertResult], Optional[int]]
+    timeout: float
+    # HTTP channels: result → (url, JSON payload), so dispatch_async can post it itself
+    request: Optional[Callable[[AlertResult], tuple[str, dict]]] = None
+
+
+class _Slot:
+    """
+    Start of one queued send. A channel's timeout counts from when its send
+    starts, not from when it was queued behind other channels; a send that
+    has not started within its timeout is dropped instead of going out late.
+    The send (``start``) and the dispatcher (``expire``) settle which of the
+    two happened under a lock, so the report always matches what was sent.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.queued  = time.perf_counter()
+        self.at: Optional[float] = None      # perf_counter when the send started
+        self.expired = False
+        self.event   = threading.Event()     # set once the slot is settled either way
+        self._lock   = threading.Lock()
+
+    def start(self) -> bool:
+        with self._lock:
+            now = time.perf_counter()
+            if not self.expired and now - self.queued <= self.timeout:
+                self.at = now
+            else:
+                self.expired = True
+        self.event.set()
+        return self.at is not None
+
+    def expire(self) -> bool:
+        """True when the send never started (and now never will)."""
+        with self._lock:
+            if self.at is None:
+                self.expired = True
+            return self.expired
+
+    def not_started(self, name: str) -> ChannelOutcome:
+        return ChannelOutcome(
+            name, ok=False, latency_ms=(time.perf_counter() - self.queued) * 1000,
+            error=f"not started within {self.timeout:g}s (notify pool busy)",
+        )
+
+
 class AlertRouter:
-    def __init__(self) -> None:
-        self._channels: list[Callable[[AlertResult], None]] = [self._log_channel]
+    """
+    Channels are sent concurrently on a small thread pool; each has its own
+    timeout, so one slow webhook no longer holds up the others. HTTP
+    channels share keep-alive connections pooled per host. When more
+    channels are queued than there are workers, a channel's timeout starts
+    with its send; one still queued after its timeout is dropped, not sent.
+    """
+
+    def __init__(
+        self,
+        timeout:     float = 10.0,
+        max_workers: int   = 8,
+        pool:        Optional[HTTPPool] = None,
+        metrics:     Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.timeout   = timeout
+        self.metrics   = metrics or REGISTRY
+        self._http     = pool or HTTPPool()
+        self._ahttp: Optional[AsyncHTTPPool] = None      # created on the first dispatch_async
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notify")
+        self._channels: list[_Channel] = []
 
     # ── Register channels ─────────────────────────────────────────────────────
-    def add_telegram(self, token: str, chat_id: str) -> None:
-        def _send(r: AlertResult) -> None:
-            msg = self._format_message(r)
-            url = f"https://api.telegram.org/bot{token}/sendMessage"
-            self._post_json(url, {"chat_id": chat_id, "text": msg, "parse_mode": "HTML"})
-        self._channels.append(_send)
+    def add_telegram(self, token: str, chat_id: str, timeout: Optional[float] = None) -> None:
+        url = f"https://api.telegram.org/bot{token}/sendMessage"
+
+        def _request(r: AlertResult) -> tuple[str, dict]:
+            return url, {"chat_id": chat_id, "text": self._format_message(r), "parse_mode": "HTML"}
+        self._register_http("telegram", _request, timeout)
         log.info("Telegram channel registered (chat_id=%s)", chat_id)
 
-    def add_slack(self, webhook_url: str) -> None:
-        def _send(r: AlertResult) -> None:
-            self._post_json(webhook_url, {"text": self._format_message(r)})
-        self._channels.append(_send)
+    def add_slack(self, webhook_url: str, timeout: Optional[float] = None) -> None:
+        def _request(r: AlertResult) -> tuple[str, dict]:
+            return webhook_url, {"text": self._format_message(r)}
+        self._register_http("slack", _request, timeout)
         log.info("Slack channel registered")
 
-    def add_discord(self, webhook_url: str) -> None:
-        def _send(r: AlertResult) -> None:
-            self._post_json(webhook_url, {"content": self._format_message(r)})
-        self._channels.append(_send)
+    def add_discord(self, webhook_url: str, timeout: Optional[float] = None) -> None:
+        def _request(r: AlertResult) -> tuple[str, dict]:
+            return webhook_url, {"content": self._format_message(r)}
+        self._register_http("discord", _request, timeout)
         log.info("Discord channel registered")
 
-    def add_custom(self, fn: Callable[[AlertResult], None]) -> None:
-        self._channels.append(fn)
+    def add_custom(
+        self,
+        fn:      Callable[[AlertResult], None],
+        name:    Optional[str]   = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self._register(name or getattr(fn, "__name__", "custom"), fn, timeout)
+
+    def _register_http(
+        self,
+        name:    str,
+        request: Callable[[AlertResult], tuple[str, dict]],
+        timeout: Optional[float],
+    ) -> None:
+        def _send(r: AlertResult) -> int:
+            url, payload = request(r)
+            return self._post_json(url, payload, timeout or self.timeout)
+        self._register(name, _send, timeout, request)
+
+    def _register(
+        self, name: str, fn: Callable, timeout: Optional[float], request: Optional[Callable] = None,
+    ) -> None:
+        taken = {c.name for c in self._channels}
+        label, n = name, 2
+        while label in taken:
+            label, n = f"{name}#{n}", n + 1
+        self._channels.append(_Channel(label, fn, timeout or self.timeout, request))
 
     # ── Dispatch ──────────────────────────────────────────────────────────────
-    def dispatch(self, result: AlertResult) -> None:
+    def dispatch(self, result: AlertResult) -> DispatchReport:
+        t0 = time.perf_counter()
+        self._log_channel(result)
+
+        jobs = []
         for ch in self._channels:
-            try:
-                ch(result)
-            except Exception as exc:
-                log.error("Channel dispatch error: %s", exc)
+            slot = _Slot(ch.timeout)
+            jobs.append((ch, slot, self._executor.submit(self._timed, ch, result, slot)))
+        outcomes = [self._record(ch, self._wait(ch, slot, future)) for ch, slot, future in jobs]
+        return self._report(result, t0, outcomes)
+
+    @staticmethod
+    def _wait(ch: _Channel, slot: _Slot, future: Future) -> ChannelOutcome:
+        slot.event.wait(max(0.0, slot.queued + ch.timeout - time.perf_counter()))
+        if slot.expire():
+            future.cancel()
+            return slot.not_started(ch.name)
+        try:
+            return future.result(timeout=max(0.0, slot.at + ch.timeout - time.perf_counter()))
+        except FutureTimeout:
+            return ChannelOutcome(
+                ch.name, ok=False, latency_ms=(time.perf_counter() - slot.at) * 1000,
+                error=f"timed out after {ch.timeout:g}s",
+            )
+
+    async def dispatch_async(self, result: AlertResult) -> DispatchReport:
+        """``dispatch`` without blocking the event loop on HTTP channels."""
+        t0 = time.perf_counter()
+        self._log_channel(result)
+        if self._ahttp is None:
+            self._ahttp = AsyncHTTPPool()
+        outcomes = await asyncio.gather(*(self._timed_async(ch, result) for ch in self._channels))
+        recorded = [self._record(ch, o) for ch, o in zip(self._channels, outcomes)]
+        return self._report(result, t0, recorded)
+
+    def _record(self, ch: _Channel, outcome: ChannelOutcome) -> ChannelOutcome:
+        if not outcome.ok:
+            log.error("Channel dispatch error (%s): %s", ch.name, outcome.error)
+            self.metrics.inc("notify_errors", channel=ch.name)
+        self.metrics.observe("notify", outcome.latency_ms, channel=ch.name)
+        return outcome
+
+    def _report(
+        self, result: AlertResult, t0: float, outcomes: list[ChannelOutcome],
+    ) -> DispatchReport:
+        total_ms = (time.perf_counter() - t0) * 1000
+        self.metrics.observe("dispatch", total_ms)
+        return DispatchReport(ticker=result.alert.ticker, total_ms=total_ms, outcomes=outcomes)
+
+    @classmethod
+    def _timed(
+        cls, ch: _Channel, result: AlertResult, slot: Optional[_Slot] = None,
+    ) -> ChannelOutcome:
+        if slot is not None and not slot.start():
+            return slot.not_started(ch.name)
+        t0 = time.perf_counter()
+        try:
+            status = ch.send(result)
+        except Exception as exc:
+            return ChannelOutcome(ch.name, False, (time.perf_counter() - t0) * 1000, error=str(exc))
+        return cls._outcome(ch, status, t0)
+
+    async def _timed_async(self, ch: _Channel, result: AlertResult) -> ChannelOutcome:
+        if ch.request is None:
+            return await self._threaded_async(ch, result)
+        t0 = time.perf_counter()
+        try:
+            url, payload = ch.request(result)
+            status = await self._ahttp.post_json(url, payload, timeout=ch.timeout)
+            if status >= 400:
+                log.warning("Notification HTTP %d for %s", status, url)
+        except asyncio.TimeoutError:
+            error = f"timed out after {ch.timeout:g}s"
+            return ChannelOutcome(ch.name, False, (time.perf_counter() - t0) * 1000, error=error)
+        except Exception as exc:
+            error = str(exc) or type(exc).__name__
+            return ChannelOutcome(ch.name, False, (time.perf_counter() - t0) * 1000, error=error)
+        return self._outcome(ch, status, t0)
+
+    async def _threaded_async(self, ch: _Channel, result: AlertResult) -> ChannelOutcome:
+        """A custom callable on the thread pool, timed from its start like in ``dispatch``."""
+        slot    = _Slot(ch.timeout)
+        future  = self._executor.submit(self._timed, ch, result, slot)
+        pending = {asyncio.wrap_future(future)}
+        done, _ = await asyncio.wait(pending, timeout=ch.timeout)
+        if not done:
+            if slot.expire():
+                future.cancel()
+                return slot.not_started(ch.name)
+            remaining = slot.at + ch.timeout - time.perf_counter()
+            done, _   = await asyncio.wait(pending, timeout=max(0.0, remaining))
+        if not done:
+            return ChannelOutcome(
+                ch.name, False, (time.perf_counter() - slot.at) * 1000,
+                error=f"timed out after {ch.timeout:g}s",
+            )
+        return future.result()
+
+    @staticmethod
+    def _outcome(ch: _Channel, status: Optional[int], t0: float) -> ChannelOutcome:
+        ok = not isinstance(status, int) or status < 400
+        return ChannelOutcome(
+            ch.name, ok, (time.perf_counter() - t0) * 1000,
+            status=status if isinstance(status, int) else None,
+            error=None if ok else f"HTTP {status}",
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self._http.close()
+
+    async def aclose(self) -> None:
+        if self._ahttp is not None:
+            await self._ahttp.close()
 
     # ── Formatters ────────────────────────────────────────────────────────────
     @staticmethod
     def _format_message(r: AlertResult) -> str:
         a = r.alert
         c = r.composite
-        emoji = {"STRONG BUY":"🟢","BUY":"🔵","NEUTRAL":"⚪","SELL":"🟠","STRONG SELL":"🔴"}.get(c.rating,"⚪")
+        emoji = {
+            "STRONG BUY": "🟢", "BUY": "🔵", "NEUTRAL": "⚪", "SELL": "🟠", "STRONG SELL": "🔴",
+        }.get(c.rating, "⚪")
         return (
             f"{emoji} <b>Kalshi-Claw Alert</b>\n"
             f"Ticker:  <b>{a.ticker}</b>  ({a.exchange})\n"
@@ -81,14 +330,8 @@ class AlertRouter:
             r.alert.ticker, r.composite.rating, r.composite.score,
         )
 
-    @staticmethod
-    def _post_json(url: str, payload: dict) -> None:
-        data  = json.dumps(payload).encode()
-        req   = urllib.request.Request(
-            url, data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            if resp.status >= 400:
-                log.warning("Notification HTTP %d for %s", resp.status, url)
+    def _post_json(self, url: str, payload: dict, timeout: float) -> int:
+        status = self._http.post_json(url, payload, timeout=timeout)
+        if status >= 400:
+            log.warning("Notification HTTP %d for %s", status, url)
+        return status
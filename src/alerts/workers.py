@@ -0,0 +1,187 @@
+"""
+AlertQueue — asynchronous alert processing on a bounded worker pool.
+
+The webhook validates and enqueues; workers run AlertHandler.handle and
+AlertRouter.dispatch off the request thread, then hand the result to
+``publish`` (e.g. SignalHub.publish) if one is given. Jobs are kept
+(bounded) for status lookups, and queue depth / wait / processing times
+are tracked.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from .handler import AlertHandler, AlertResult
+from .parser  import ParsedAlert
+from .router  import AlertRouter, DispatchReport
+from ..utils.metrics import REGISTRY, MetricsRegistry
+
+log = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    """Raised by AlertQueue.submit when the backlog is at capacity."""
+
+
+@dataclass
+class AlertJob:
+    id:           str
+    alert:        ParsedAlert
+    status:       str                     # queued | processing | done | failed
+    submitted_at: datetime
+    enqueued:     float                   # perf_counter timestamps
+    started:      Optional[float] = None
+    finished:     Optional[float] = None
+    result:       Optional[AlertResult] = None
+    dispatch:     Optional[DispatchReport] = None
+    error:        Optional[str] = None
+
+    @property
+    def wait_ms(self) -> Optional[float]:
+        return (self.started - self.enqueued) * 1000 if self.started else None
+
+    @property
+    def processing_ms(self) -> Optional[float]:
+        return (self.finished - self.started) * 1000 if self.finished and self.started else None
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "alert_id":      self.id,
+            "status":        self.status,
+            "ticker":        self.alert.ticker,
+            "submitted_at":  self.submitted_at.isoformat() + "Z",
+            "wait_ms":       _round(self.wait_ms),
+            "processing_ms": _round(self.processing_ms),
+        }
+        if self.result is not None:
+            out.update({
+                "rating":     self.result.composite.rating,
+                "score":      self.result.composite.score,
+                "latency_ms": self.result.latency_ms,
+            })
+        if self.dispatch is not None:
+            out["notifications"] = self.dispatch.to_dict()["channels"]
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+def _round(x: Optional[float]) -> Optional[float]:
+    return round(x, 2) if x is not None else None
+
+
+class AlertQueue:
+    def __init__(
+        self,
+        handler:  AlertHandler,
+        router:   AlertRouter,
+        workers:  int = 4,
+        max_size: int = 1000,
+        keep:     int = 10_000,      # finished jobs retained for /alerts/<id>
+        metrics:  Optional[MetricsRegistry] = None,
+        publish:  Optional[Callable[[AlertResult], Any]] = None,
+    ) -> None:
+        self._handler  = handler
+        self._publish  = publish
+        self._metrics  = metrics or REGISTRY
+        self._router   = router
+        self._n        = workers
+        self._keep     = keep
+        self._queue: queue.Queue[Optional[AlertJob]] = queue.Queue(maxsize=max_size)
+        self._jobs: OrderedDict[str, AlertJob] = OrderedDict()
+        self._lock     = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._counts   = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    def start(self) -> "AlertQueue":
+        for i in range(self._n - len(self._threads)):
+            t = threading.Thread(target=self._work, name=f"alert-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Let the workers finish the backlog and exit, waiting at most ``timeout`` in total."""
+        deadline = time.monotonic() + timeout
+        for _ in self._threads:
+            try:
+                self._queue.put(None, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:                       # workers are stuck; they are daemons
+                log.warning("Alert queue full on stop; %d jobs not processed", self._queue.qsize())
+                break
+        for t in self._threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+        self._threads.clear()
+
+    # ── Submit / lookup ───────────────────────────────────────────────────────
+    def submit(self, alert: ParsedAlert) -> AlertJob:
+        job = AlertJob(
+            id=uuid.uuid4().hex, alert=alert, status="queued",
+            submitted_at=datetime.utcnow(), enqueued=time.perf_counter(),
+        )
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._counts["rejected"] += 1
+            raise QueueFull(f"alert queue full ({self._queue.maxsize})") from None
+
+        with self._lock:
+            self._counts["submitted"] += 1
+            self._jobs[job.id] = job
+            while len(self._jobs) > self._keep:
+                self._jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id: str) -> Optional[AlertJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "depth":         self._queue.qsize(),
+                "capacity":      self._queue.maxsize,
+                "workers":       len(self._threads),
+                **self._counts,
+                "wait_ms":       self._metrics.summary("queue_wait"),
+                "processing_ms": self._metrics.summary("queue_processing"),
+            }
+
+    # ── Worker loop ───────────────────────────────────────────────────────────
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job.started = time.perf_counter()
+            job.status  = "processing"
+            try:
+                result = self._handler.handle(job.alert)
+                if result is None:
+                    job.status, job.error = "failed", "processing failed"
+                else:
+                    job.dispatch = self._router.dispatch(result)
+                    job.result, job.status = result, "done"
+                    if self._publish is not None:
+                        self._publish(result)
+            except Exception as exc:
+                log.exception("Alert worker error for %s", job.alert.ticker)
+                job.status, job.error = "failed", str(exc)
+            job.finished = time.perf_counter()
+
+            self._metrics.observe("queue_wait", job.wait_ms)
+            self._metrics.observe("queue_processing", job.processing_ms)
+            with self._lock:
+                self._counts["completed" if job.status == "done" else "failed"] += 1
+
@@ -0,0 +1,8 @@
+"""Vectorized backtests of the composite signal."""
+from .engine import LONG_ONLY, LONG_SHORT, Backtester, BacktestResult
+from .runner import load_bars, run_universe, summary
+
+__all__ = [
+    "Backtester", "BacktestResult", "LONG_ONLY", "LONG_SHORT",
+    "load_bars", "run_universe", "summary",
+]
@@ -0,0 +1,203 @@
+"""
+Backtester — turn per-bar composite ratings into positions and P&L.
+Extended with:
+  • Rating → target position table (long-only, or long/short), NEUTRAL holds
+  • Fees and slippage in basis points of traded notional
+  • Equity curve, total / annual return, Sharpe, max drawdown, hit rate,
+    trade count, turnover and exposure
+  • Array operations only: aligned (tickers × bars) matrices in one pass,
+    no Python loop over bars or trades
+
+Signals come from ``CustomSignalEngine.history``. A rating known at the
+close of bar t sets the position held over bar t+1, so there is no
+look-ahead; trades execute at that close.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..indicators.custom import CustomSignalEngine, _RATINGS
+
+# target position per rating; None = keep the current position
+LONG_ONLY: dict[str, Optional[float]] = {
+    "STRONG BUY":  1.0,
+    "BUY":         1.0,
+    "NEUTRAL":     None,
+    "SELL":        0.0,
+    "STRONG SELL": 0.0,
+}
+LONG_SHORT: dict[str, Optional[float]] = {**LONG_ONLY, "SELL": -1.0, "STRONG SELL": -1.0}
+
+_YEAR_SECONDS = 365.25 * 86400
+
+
+@dataclass
+class BacktestResult:
+    ticker:       str
+    bars:         int
+    total_return: float          # fraction, after costs
+    annual_return: float         # NaN without a DatetimeIndex
+    sharpe:       float          # annualised by bars per year (NaN without a DatetimeIndex)
+    max_drawdown: float          # ≤ 0
+    hit_rate:     float          # share of closed-or-open trades with positive return
+    trades:       int
+    turnover:     float          # Σ |Δposition|
+    exposure:     float          # share of bars holding a position
+    equity:       Optional[pd.Series] = None
+    error:        Optional[str] = None    # set when the ticker failed (stats are NaN)
+
+    def to_dict(self) -> dict[str, Any]:
+        d = asdict(self)
+        d.pop("equity")
+        return d
+
+
+class Backtester:
+    def __init__(
+        self,
+        engine:       Optional[CustomSignalEngine] = None,
+        fee_bps:      float = 1.0,
+        slippage_bps: float = 2.0,
+        allow_short:  bool = False,
+        positions:    Optional[Mapping[str, Optional[float]]] = None,
+    ) -> None:
+        self.engine       = engine or CustomSignalEngine()
+        self.fee_bps      = fee_bps
+        self.slippage_bps = slippage_bps
+        self.positions    = dict(positions or (LONG_SHORT if allow_short else LONG_ONLY))
+
+    @property
+    def cost(self) -> float:
+        """Cost per unit of traded notional, as a fraction."""
+        return (self.fee_bps + self.slippage_bps) / 10_000
+
+    def run(
+        self, ohlcv: pd.DataFrame, ticker: str = "", keep_equity: bool = True,
+    ) -> BacktestResult:
+        """Backtest one ticker: ratings from ``engine.history``, then ``run_arrays``."""
+        hist  = self.engine.history(
+            ohlcv["high"], ohlcv["low"], ohlcv["close"], ohlcv.get("volume"),
+        )
+        codes = hist["rating"].cat.codes.to_numpy()
+        return self.run_arrays(
+            ohlcv["close"].to_numpy(dtype=np.float64), codes,
+            index=ohlcv.index, tickers=[ticker], keep_equity=keep_equity,
+        )[0]
+
+    def run_arrays(
+        self,
+        close:       np.ndarray,
+        ratings:     np.ndarray,
+        index:       Optional[pd.Index] = None,
+        tickers:     Optional[list[str]] = None,
+        keep_equity: bool = False,
+    ) -> list[BacktestResult]:
+        """
+        Backtest aligned (tickers × bars) ``close`` prices and rating codes
+        (indexes into ``_RATINGS``, as in ``history()["rating"].cat.codes``).
+        """
+        c = np.array(close, dtype=np.float64, ndmin=2)
+        r = np.array(ratings, dtype=np.int64, ndmin=2)
+        if r.shape != c.shape:
+            raise ValueError(f"ratings shape {r.shape} != close shape {c.shape}")
+        k, n = c.shape
+        tickers = list(tickers) if tickers is not None else [str(i) for i in range(k)]
+
+        pos  = self._targets(r)
+        held = np.zeros_like(pos)
+        held[:, 1:] = pos[:, :-1]                              # held over bar t: set at close t-1
+        prev = np.zeros_like(pos)
+        prev[:, 1:] = pos[:, :-1]
+
+        ret = np.zeros_like(c)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ret[:, 1:] = c[:, 1:] / c[:, :-1] - 1
+        ret = np.nan_to_num(ret, nan=0.0, posinf=0.0, neginf=0.0)
+
+        traded = np.abs(pos - prev)
+        net    = held * ret - traded * self.cost
+        equity = np.cumprod(1 + net, axis=1)
+        peak   = np.maximum.accumulate(equity, axis=1)
+        drawdown = (equity / peak - 1).min(axis=1)
+
+        hits, trades = self._trades(held, pos, prev, ret)
+        years, per_year = self._years(index, n)
+        total  = equity[:, -1] - 1
+        blank  = np.full(k, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            annual = np.where(years > 0, (1 + total) ** (1 / years) - 1, np.nan) if years else blank
+            sd     = net[:, 1:].std(axis=1, ddof=1) if n > 2 else blank
+            sharpe = net[:, 1:].mean(axis=1) / sd * np.sqrt(per_year) if per_year else blank
+            hit_rate = np.where(trades > 0, hits / trades, np.nan)
+
+        results = []
+        for i, ticker in enumerate(tickers):
+            results.append(BacktestResult(
+                ticker        = ticker,
+                bars          = n,
+                total_return  = float(total[i]),
+                annual_return = float(annual[i]),
+                sharpe        = float(sharpe[i]) if np.isfinite(sharpe[i]) else float("nan"),
+                max_drawdown  = float(drawdown[i]),
+                hit_rate      = float(hit_rate[i]),
+                trades        = int(trades[i]),
+                turnover      = float(traded[i].sum()),
+                exposure      = float((held[i] != 0).mean()),
+                equity        = pd.Series(equity[i], index=index) if keep_equity else None,
+            ))
+        return results
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+    def _targets(self, ratings: np.ndarray) -> np.ndarray:
+        """Target position at each close; NaN entries (hold) carry the last target forward."""
+        table  = np.array([
+            np.nan if self.positions.get(r) is None else self.positions[r] for r in _RATINGS
+        ])
+        target = table[ratings]
+        filled = np.where(np.isnan(target), 0, np.arange(target.shape[1])[None, :])
+        np.maximum.accumulate(filled, axis=1, out=filled)
+        target = np.take_along_axis(target, filled, axis=1)
+        return np.nan_to_num(target, nan=0.0)                  # flat until a directional rating
+
+    def _trades(
+        self, held: np.ndarray, pos: np.ndarray, prev: np.ndarray, ret: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (winning trades, trades) per row. A trade is a run of bars holding the
+        same non-zero position; its return includes the entry and exit costs.
+        """
+        k, n = held.shape
+        # closing the old position and opening the new one, both at close t
+        exit_cost  = np.where(pos != prev, np.abs(prev), 0.0) * self.cost
+        entry_cost = np.where(pos != prev, np.abs(pos), 0.0) * self.cost
+        log_ret    = np.log1p(held * ret - exit_cost)
+
+        flat   = held.ravel()
+        start  = np.ones(k * n, dtype=bool)
+        start[1:] = flat[1:] != flat[:-1]
+        start[::n] = True                                      # never run a trade across tickers
+        starts = np.flatnonzero(start)
+        seg_pnl = np.add.reduceat(log_ret.ravel(), starts)
+        # entry cost was paid at the close before the run's first bar
+        before  = starts - 1
+        opened  = (starts % n) != 0
+        seg_pnl[opened] += np.log1p(-entry_cost.ravel()[before[opened]])
+
+        in_trade = flat[starts] != 0
+        row      = starts // n
+        trades   = np.bincount(row[in_trade], minlength=k)
+        wins     = np.bincount(row[in_trade & (seg_pnl > 0)], minlength=k)
+        return wins, trades
+
+    @staticmethod
+    def _years(index: Optional[pd.Index], n: int) -> tuple[float, float]:
+        """(years spanned, bars per year) — zeros without a DatetimeIndex."""
+        if not isinstance(index, pd.DatetimeIndex) or n < 2:
+            return 0.0, 0.0
+        years = (index[-1] - index[0]).total_seconds() / _YEAR_SECONDS
+        return (years, (n - 1) / years) if years > 0 else (0.0, 0.0)
@@ -0,0 +1,348 @@
+"""
+Composite weight / threshold search over cached per-bar component scores.
+
+The five component scores of every bar (``CustomSignalEngine.history``)
+do not depend on the weights or rating thresholds, so they are computed
+once per universe into a ``ComponentSet`` (saved as ``.npz`` and reused).
+A candidate is then a (5,) weight vector plus four rating floors: its
+scores are one matrix product, and ratings → positions → P&L follow the
+Backtester rules with array operations. Candidates are scored in chunks on
+a process pool that receives the component matrix once per worker.
+
+Usage (from the repo root):
+  python -m src.backtest.optimize AAPL MSFT NVDA --interval 1h --candidates 5000
+  python -m src.backtest.optimize AAA BBB --demo --method grid --out profile.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .engine import LONG_ONLY, Backtester
+from .runner import SYNTHETIC_BARS, load_bars
+from ..indicators.custom import CustomSignalEngine, _RATINGS, _THRESHOLDS, _WEIGHTS
+
+log = logging.getLogger(__name__)
+
+COMPONENTS = tuple(_WEIGHTS)                 # column order of ComponentSet.scores
+_CELLS     = 8_000_000                       # bars × candidates per chunk (~64 MB per array)
+
+
+@dataclass
+class ComponentSet:
+    """Per-bar component scores and bar returns of a universe, tickers stacked end to end."""
+    scores:   np.ndarray        # (bars, 5) in COMPONENTS order
+    returns:  np.ndarray        # (bars,) close-to-close return, 0 on each ticker's first bar
+    starts:   np.ndarray        # first row of each ticker
+    tickers:  list[str]
+    per_year: float             # bars per year (0 if unknown)
+    key:      str = ""          # fingerprint of the inputs it was built from
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "wb") as fh:            # savez would append ".npz" to a bare path
+            np.savez_compressed(
+                fh, scores=self.scores, returns=self.returns, starts=self.starts,
+                tickers=np.array(self.tickers), per_year=self.per_year, key=self.key,
+            )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ComponentSet":
+        with np.load(path) as z:
+            return cls(
+                z["scores"], z["returns"], z["starts"], [str(t) for t in z["tickers"]],
+                float(z["per_year"]), str(z["key"]),
+            )
+
+
+@dataclass
+class Candidate:
+    weights:    dict[str, float]
+    thresholds: tuple[float, ...]
+    sharpe:     float
+    total_return: float          # mean over tickers
+
+    def profile(self, **meta: Any) -> dict[str, Any]:
+        """Loadable engine profile (``CustomSignalEngine.from_profile``)."""
+        engine = CustomSignalEngine(weights=self.weights, thresholds=self.thresholds)
+        return engine.to_profile(sharpe=self.sharpe, total_return=self.total_return, **meta)
+
+
+# ── Component matrix ──────────────────────────────────────────────────────────
+def _components_one(engine: CustomSignalEngine, ticker: str, interval: str, store_dir, bars: int):
+    df   = load_bars(ticker, interval, store_dir, bars)
+    hist = engine.history(df["high"], df["low"], df["close"], df.get("volume"))
+    close = df["close"].to_numpy(dtype=np.float64)
+    ret   = np.zeros_like(close)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ret[1:] = close[1:] / close[:-1] - 1
+    years = (df.index[-1] - df.index[0]).total_seconds() / (365.25 * 86400) if len(df) > 1 else 0.0
+    scores = hist[list(COMPONENTS)].to_numpy(dtype=np.float64)
+    return scores, np.nan_to_num(ret, nan=0.0, posinf=0.0, neginf=0.0), years
+
+
+def build_components(
+    tickers:   Iterable[str],
+    interval:  str = "1h",
+    engine:    Optional[CustomSignalEngine] = None,
+    store_dir: Optional[str] = None,
+    bars:      int = SYNTHETIC_BARS,
+    processes: Optional[int] = None,
+    cache:     Optional[str | Path] = None,
+) -> ComponentSet:
+    """
+    Component scores for every bar of every ticker (one ``history`` per
+    ticker, spread over a process pool; tickers without stored bars are
+    skipped). With ``cache``, a saved set for the same inputs is loaded
+    instead, and a fresh one is saved there.
+    """
+    tickers = list(tickers)
+    engine  = engine or CustomSignalEngine()
+    key     = _cache_key(tickers, interval, engine, store_dir, bars)
+    if cache is not None and Path(cache).exists():
+        cached = ComponentSet.load(cache)
+        if cached.key == key:
+            log.info("Loaded component matrix from %s", cache)
+            return cached
+        log.info("Component cache %s is for other inputs — rebuilding", cache)
+
+    processes = processes or os.cpu_count() or 1
+    args      = (interval, store_dir, bars)
+    found: dict[str, tuple] = {}
+    if processes == 1 or len(tickers) == 1:
+        for t in tickers:
+            try:
+                found[t] = _components_one(engine, t, *args)
+            except LookupError as exc:
+                log.warning("Skipping %s: %s", t, exc)
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(tickers))) as pool:
+            futures = {t: pool.submit(_components_one, engine, t, *args) for t in tickers}
+            for t, fut in futures.items():
+                try:
+                    found[t] = fut.result()
+                except LookupError as exc:
+                    log.warning("Skipping %s: %s", t, exc)
+    if not found:
+        raise LookupError(f"no bars for any of {tickers}")
+
+    parts   = list(found.values())
+    lengths = np.array([len(p[1]) for p in parts], dtype=np.int64)
+    years   = sum(p[2] for p in parts)
+    out = ComponentSet(
+        scores   = np.concatenate([p[0] for p in parts]),
+        returns  = np.concatenate([p[1] for p in parts]),
+        starts   = np.concatenate(([0], np.cumsum(lengths)[:-1])),
+        tickers  = list(found),
+        per_year = float((lengths - 1).sum() / years) if years > 0 else 0.0,
+        key      = key,
+    )
+    if cache is not None:
+        out.save(cache)
+    return out
+
+
+def _cache_key(tickers, interval, engine: CustomSignalEngine, store_dir, bars) -> str:
+    # component scores depend on the indicator settings, not on weights/thresholds
+    ind = {n: vars(getattr(engine, n)) for n in COMPONENTS}
+    raw = json.dumps([tickers, interval, store_dir, bars, ind], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+# ── Candidate scoring ─────────────────────────────────────────────────────────
+def evaluate(
+    cs:         ComponentSet,
+    weights:    np.ndarray,
+    thresholds: np.ndarray,
+    cost:       Optional[float] = None,
+    positions:  Optional[Mapping[str, Optional[float]]] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (Sharpe, mean total return) of each candidate row of ``weights`` (m × 5)
+    and ``thresholds`` (m × 4) — the Backtester's rules on every ticker at once.
+    """
+    cost   = Backtester().cost if cost is None else cost
+    table  = _position_table(positions or LONG_ONLY)
+    n      = len(cs.returns)
+    sharpe = np.empty(len(weights))
+    total  = np.empty(len(weights))
+    step   = max(1, _CELLS // max(n, 1))
+    first  = np.zeros(n, dtype=bool)
+    first[cs.starts] = True
+    for lo in range(0, len(weights), step):
+        w, t = weights[lo:lo + step], thresholds[lo:lo + step]
+        # (bars × 5) · (5 × m), accumulated in the engine's order:
+        # scores often sit exactly on a floor
+        score = np.zeros((n, len(w)))
+        term  = np.empty_like(score)
+        for k in range(len(COMPONENTS)):
+            np.multiply(cs.scores[:, k, None], w[None, :, k], out=term)
+            score += term
+        codes = np.zeros(score.shape, dtype=np.int8)             # index into _RATINGS
+        for j in range(t.shape[1]):
+            codes += score < t[None, :, j]
+        pos   = _hold(table[codes], first)
+        prev  = np.zeros_like(pos)
+        prev[1:] = pos[:-1]
+        prev[first] = 0.0                                        # every ticker starts flat
+        net = prev * cs.returns[:, None] - np.abs(pos - prev) * cost
+        mean, sd = net.mean(axis=0), net.std(axis=0, ddof=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sharpe[lo:lo + step] = np.where(sd > 0, mean / sd, 0.0) * np.sqrt(cs.per_year or 1.0)
+        per_ticker = np.add.reduceat(np.log1p(net), cs.starts, axis=0)
+        total[lo:lo + step] = np.expm1(per_ticker).mean(axis=0)
+    return sharpe, total
+
+
+def _position_table(positions: Mapping[str, Optional[float]]) -> np.ndarray:
+    return np.array([np.nan if positions.get(r) is None else positions[r] for r in _RATINGS])
+
+
+def _hold(target: np.ndarray, first: np.ndarray) -> np.ndarray:
+    """Forward-fill NaN (hold) targets down each ticker's rows; flat until a directional rating."""
+    target = target.copy()
+    target[first] = np.nan_to_num(target[first], nan=0.0)
+    idx = np.where(np.isnan(target), 0, np.arange(len(target), dtype=np.int32)[:, None])
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return np.take_along_axis(target, idx, axis=0)
+
+
+# ── Search ────────────────────────────────────────────────────────────────────
+def random_candidates(n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """``n`` weight vectors on the simplex (Dirichlet) and descending floors in (-1, 1)."""
+    rng = np.random.default_rng(seed)
+    weights    = rng.dirichlet(np.ones(len(COMPONENTS)), n)
+    thresholds = -np.sort(-rng.uniform(-0.9, 0.9, (n, len(_THRESHOLDS))), axis=1)
+    return weights, thresholds
+
+
+def grid_candidates(
+    step:   float = 0.1,
+    strong: Sequence[float] = (0.4, 0.5, 0.6, 0.7),
+    weak:   Sequence[float] = (0.1, 0.2, 0.3),
+) -> tuple[np.ndarray, np.ndarray]:
+    """Weights on a simplex grid × symmetric floors (strong, weak, -weak, -strong)."""
+    units = round(1 / step)
+    cells = itertools.product(range(units + 1), repeat=len(COMPONENTS) - 1)
+    grid  = [c for c in cells if sum(c) <= units]
+    w     = np.array([(*c, units - sum(c)) for c in grid], dtype=np.float64) / units
+    t     = np.array([(s, k, -k, -s) for s in strong for k in weak if k < s], dtype=np.float64)
+    return np.repeat(w, len(t), axis=0), np.tile(t, (len(w), 1))
+
+
+_SHARED: dict[str, Any] = {}
+
+
+def _init_worker(cs: ComponentSet, cost: float, positions: Mapping[str, Optional[float]]) -> None:
+    _SHARED.update(cs=cs, cost=cost, positions=positions)
+
+
+def _evaluate_chunk(weights: np.ndarray, thresholds: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return evaluate(_SHARED["cs"], weights, thresholds, _SHARED["cost"], _SHARED["positions"])
+
+
+def search(
+    cs:         ComponentSet,
+    weights:    np.ndarray,
+    thresholds: np.ndarray,
+    backtester: Optional[Backtester] = None,
+    processes:  Optional[int] = None,
+    top:        int = 10,
+    objective:  str = "sharpe",
+) -> list[Candidate]:
+    """Score every candidate (chunks spread over ``processes``); the ``top`` by ``objective``."""
+    if objective not in ("sharpe", "return"):
+        raise ValueError(f"objective must be 'sharpe' or 'return', got {objective!r}")
+    bt        = backtester or Backtester()
+    processes = processes or os.cpu_count() or 1
+    m         = len(weights)
+    chunk     = max(1, min(max(1, _CELLS // max(len(cs.returns), 1)), -(-m // processes)))
+    bounds    = [(lo, min(lo + chunk, m)) for lo in range(0, m, chunk)]
+
+    if processes == 1 or len(bounds) == 1:
+        sharpe, total = evaluate(cs, weights, thresholds, bt.cost, bt.positions)
+    else:
+        chunks = [(weights[a:b], thresholds[a:b]) for a, b in bounds]
+        with ProcessPoolExecutor(
+            processes, initializer=_init_worker, initargs=(cs, bt.cost, bt.positions),
+        ) as pool:
+            parts = list(pool.map(_evaluate_chunk, *zip(*chunks)))
+        sharpe = np.concatenate([p[0] for p in parts])
+        total  = np.concatenate([p[1] for p in parts])
+
+    key   = sharpe if objective == "sharpe" else total
+    order = np.argsort(-np.nan_to_num(key, nan=-np.inf), kind="stable")[:top]
+    return [
+        Candidate(
+            weights      = {k: round(float(v), 6) for k, v in zip(COMPONENTS, weights[i])},
+            thresholds   = tuple(round(float(v), 6) for v in thresholds[i]),
+            sharpe       = float(sharpe[i]),
+            total_return = float(total[i]),
+        )
+        for i in order
+    ]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("tickers",      nargs="+")
+    parser.add_argument("--interval",   default="1h")
+    parser.add_argument("--demo",       action="store_true", help="Use synthetic bars")
+    parser.add_argument("--method",     choices=("random", "grid"), default="random")
+    parser.add_argument("--candidates", type=int, default=2000, help="Random candidates to score")
+    parser.add_argument("--seed",       type=int, default=0)
+    parser.add_argument("--objective",  choices=("sharpe", "return"), default="sharpe")
+    parser.add_argument("--short",      action="store_true", help="Go short on SELL ratings")
+    parser.add_argument("--processes",  type=int, default=0, help="Pool size (0 = CPU count)")
+    parser.add_argument("--top",        type=int, default=5)
+    parser.add_argument("--cache",      type=Path, help="Component matrix .npz cache")
+    parser.add_argument("--out",        type=Path, help="Write the best as an engine profile")
+    args = parser.parse_args(argv)
+
+    from config import cfg
+
+    backtester = Backtester(
+        fee_bps      = cfg.BACKTEST_FEE_BPS,
+        slippage_bps = cfg.BACKTEST_SLIPPAGE_BPS,
+        allow_short  = args.short,
+    )
+    cs = build_components(
+        [t.upper() for t in args.tickers], args.interval,
+        store_dir = None if args.demo else (cfg.BAR_STORE_DIR or None),
+        processes = args.processes or None,
+        cache     = args.cache,
+    )
+    if args.method == "grid":
+        weights, thresholds = grid_candidates()
+    else:
+        weights, thresholds = random_candidates(args.candidates, args.seed)
+    print(f"  {len(cs.returns)} bars × {len(weights)} candidates")
+
+    best = search(
+        cs, weights, thresholds, backtester, args.processes or None, args.top, args.objective,
+    )
+    for c in best:
+        w = " ".join(f"{k}={v:.2f}" for k, v in c.weights.items())
+        print(f"  sharpe {c.sharpe:+.3f}  return {c.total_return:+.2%}  {w}  floors {c.thresholds}")
+    if args.out and best:
+        profile = best[0].profile(
+            tickers=cs.tickers, interval=args.interval, objective=args.objective,
+        )
+        args.out.write_text(json.dumps(profile, indent=2) + "\n")
+        print(f"  profile written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
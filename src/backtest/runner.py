@@ -0,0 +1,114 @@
+"""
+Universe backtests — one ticker per task on a process pool, fully offline.
+
+Bars come from a local BarStore (``BAR_STORE_DIR``, filled by the server or
+``--signal`` runs) or, without one, from deterministic synthetic data. Each
+worker loads its own bars, so only the small per-ticker stats cross the
+process boundary.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from .engine import Backtester, BacktestResult
+from ..utils.bar_store    import BarStore
+from ..utils.data_fetcher import DataFetcher, needs_resample, yf_interval
+from ..utils.resample     import resample_ohlcv
+
+log = logging.getLogger(__name__)
+
+SYNTHETIC_BARS = 24 * 365 * 2           # two years of hourly bars
+
+
+def load_bars(
+    ticker:    str,
+    interval:  str = "1h",
+    store_dir: Optional[str] = None,
+    bars:      int = SYNTHETIC_BARS,
+) -> pd.DataFrame:
+    """
+    Stored OHLCV for ticker/interval (resampled from the stored base bars
+    for intervals yfinance lacks), or synthetic bars without a store.
+    Never downloads.
+    """
+    if not store_dir:
+        return DataFetcher._synthetic_data(ticker, bars)
+    df = BarStore(store_dir).read(ticker, yf_interval(interval))
+    if df is None:
+        raise LookupError(f"no stored bars for {ticker}/{interval} under {store_dir}")
+    return resample_ohlcv(df, interval) if needs_resample(interval) else df
+
+
+def _backtest_one(
+    backtester: Backtester,
+    ticker:     str,
+    interval:   str,
+    store_dir:  Optional[str],
+    bars:       int,
+    keep_equity: bool,
+) -> BacktestResult:
+    return backtester.run(load_bars(ticker, interval, store_dir, bars), ticker, keep_equity)
+
+
+def run_universe(
+    tickers:     Iterable[str],
+    interval:    str = "1h",
+    backtester:  Optional[Backtester] = None,
+    store_dir:   Optional[str] = None,
+    processes:   Optional[int] = None,
+    bars:        int = SYNTHETIC_BARS,
+    keep_equity: bool = False,
+) -> list[BacktestResult]:
+    """
+    Backtest every ticker; ``processes`` = pool size (None = CPU count,
+    1 = in this process). Tickers without stored bars are logged and skipped;
+    any other failure is recorded as that ticker's ``error`` with NaN stats.
+    """
+    tickers    = list(tickers)
+    backtester = backtester or Backtester()
+    processes  = processes or os.cpu_count() or 1
+    args       = (interval, store_dir, bars, keep_equity)
+
+    results: list[BacktestResult] = []
+    if processes == 1 or len(tickers) == 1:
+        for t in tickers:
+            try:
+                results.append(_backtest_one(backtester, t, *args))
+            except LookupError as exc:
+                log.warning("Skipping %s: %s", t, exc)
+            except Exception as exc:             # one bad series must not sink the run
+                results.append(_failed(t, exc))
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(processes, len(tickers))) as pool:
+        futures = {t: pool.submit(_backtest_one, backtester, t, *args) for t in tickers}
+        for t, fut in futures.items():
+            try:
+                results.append(fut.result())
+            except LookupError as exc:
+                log.warning("Skipping %s: %s", t, exc)
+            except Exception as exc:
+                results.append(_failed(t, exc))
+    return results
+
+
+def _failed(ticker: str, exc: Exception) -> BacktestResult:
+    log.warning("Backtest of %s failed: %s", ticker, exc)
+    nan = float("nan")
+    return BacktestResult(
+        ticker=ticker, bars=0, total_return=nan, annual_return=nan, sharpe=nan,
+        max_drawdown=nan, hit_rate=nan, trades=0, turnover=nan, exposure=nan,
+        error=f"{type(exc).__name__}: {exc}",
+    )
+
+
+def summary(results: Iterable[BacktestResult]) -> pd.DataFrame:
+    """One row of stats per ticker."""
+    rows = [r.to_dict() for r in results]
+    return pd.DataFrame(rows).set_index("ticker") if rows else pd.DataFrame()
@@ -3,10 +3,14 @@ from .rsi      import RSIIndicator
 from .macd     import MACDIndicator
 from .bb       import BollingerBands
 from .supertrend import SuperTrend
-from .vwap     import VWAPIndicator
-from .custom   import CustomSignalEngine
+from .vwap     import AnchoredVWAPs, VWAPIndicator
+from .custom   import CustomSignalEngine, StreamingSignalEngine
+from .batch    import BatchSignalEngine
+from .graph    import ComputeGraph
+from .mtf      import ConfluenceEngine, ConfluenceSignal
 
 __all__ = [
     "RSIIndicator", "MACDIndicator", "BollingerBands",
-    "SuperTrend", "VWAPIndicator", "CustomSignalEngine",
+    "SuperTrend", "VWAPIndicator", "CustomSignalEngine", "StreamingSignalEngine",
+    "BatchSignalEngine", "ComputeGraph", "AnchoredVWAPs", "ConfluenceEngine", "ConfluenceSignal",
 ]
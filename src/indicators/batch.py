@@ -0,0 +1,414 @@
+"""
+BatchSignalEngine — composite signals for a whole ticker universe in one pass.
+Extended with:
+  • Aligned (tickers × bars) NumPy inputs — one column-wise pandas pass per indicator
+  • Vectorized classifiers mirroring each indicator's scalar ``_label`` rules
+  • Compact DataFrame output (categorical signals, float components)
+  • ``history``: every bar of one ticker classified in one pass — the same
+    classifiers fed bar t and bar t-1 of each series instead of the last two
+
+Rows shorter than the matrix can be left-padded with NaN; each ticker is
+then evaluated as ``CustomSignalEngine.run`` would on its valid span. Pass
+the bars' shared ``index`` (a DatetimeIndex) when the VWAP resets per
+session — without timestamps there are no sessions, and batch VWAP runs
+cumulatively over the whole matrix.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .rsi        import RSISignal
+from .macd       import MACDSignal
+from .bb         import BBSignal
+from .supertrend import STSignal
+from .vwap       import VWAPIndicator, VWAPSignal
+from .graph      import ComputeGraph, session_keys
+from .kernels    import supertrend_bands_2d
+from .custom     import (
+    CustomSignalEngine, _WEIGHTS, _RATINGS, _THRESHOLDS,
+    _RSI_SCORES, _MACD_SCORES, _BB_SCORES, _ST_SCORES, _VWAP_SCORES,
+)
+
+RSI_LABELS  = tuple(RSISignal)
+MACD_LABELS = tuple(MACDSignal)
+BB_LABELS   = tuple(BBSignal)
+ST_LABELS   = tuple(STSignal)
+VWAP_LABELS = tuple(VWAPSignal)
+
+
+def _code(labels: tuple, member) -> int:
+    return labels.index(member)
+
+
+def _score_table(labels: tuple, scores: dict) -> np.ndarray:
+    return np.array([scores.get(m, 0.0) for m in labels], dtype=np.float64)
+
+
+_RSI_TABLE  = _score_table(RSI_LABELS,  _RSI_SCORES)
+_MACD_TABLE = _score_table(MACD_LABELS, _MACD_SCORES)
+_BB_TABLE   = _score_table(BB_LABELS,   _BB_SCORES)
+_ST_TABLE   = _score_table(ST_LABELS,   _ST_SCORES)
+_VWAP_TABLE = _score_table(VWAP_LABELS, _VWAP_SCORES)
+
+
+# ── Vectorized classifiers (same priority order as the scalar _label rules) ──
+def rsi_labels(rsi: np.ndarray, ob: float, os_: float) -> np.ndarray:
+    return np.select(
+        [rsi >= ob, rsi <= os_],
+        [_code(RSI_LABELS, RSISignal.OVERBOUGHT), _code(RSI_LABELS, RSISignal.OVERSOLD)],
+        _code(RSI_LABELS, RSISignal.NEUTRAL),
+    ).astype(np.int8)
+
+
+def macd_labels(
+    prev_macd: np.ndarray, curr_macd: np.ndarray,
+    prev_sig:  np.ndarray, curr_sig:  np.ndarray,
+    prev_hist: np.ndarray, curr_hist: np.ndarray,
+    has_prev:  np.ndarray,
+) -> np.ndarray:
+    prev_above = prev_macd > prev_sig
+    curr_above = curr_macd > curr_sig
+    prev_pos   = prev_macd > 0
+    curr_pos   = curr_macd > 0
+    c = lambda m: _code(MACD_LABELS, m)
+    return np.select(
+        [
+            ~has_prev,
+            ~prev_above & curr_above,
+            prev_above & ~curr_above,
+            ~prev_pos & curr_pos,
+            prev_pos & ~curr_pos,
+            curr_hist > prev_hist,
+            curr_hist < prev_hist,
+        ],
+        [
+            c(MACDSignal.NEUTRAL),
+            c(MACDSignal.BULLISH_CROSS), c(MACDSignal.BEARISH_CROSS),
+            c(MACDSignal.ZERO_CROSS_UP), c(MACDSignal.ZERO_CROSS_DN),
+            c(MACDSignal.MOMENTUM_UP),   c(MACDSignal.MOMENTUM_DOWN),
+        ],
+        c(MACDSignal.NEUTRAL),
+    ).astype(np.int8)
+
+
+def bb_labels(
+    last_c:  np.ndarray, prev_c:  np.ndarray,
+    last_u:  np.ndarray, last_l:  np.ndarray,
+    last_bw: np.ndarray, prev_bw: np.ndarray,
+    has_prev: np.ndarray,
+    sq_threshold: float,
+) -> np.ndarray:
+    prev_c = np.where(has_prev, prev_c, last_c)
+    c = lambda m: _code(BB_LABELS, m)
+    return np.select(
+        [
+            last_bw < sq_threshold,
+            has_prev & (last_bw > prev_bw * 1.05),
+            (last_c > last_u) & (prev_c <= last_u),
+            (last_c < last_l) & (prev_c >= last_l),
+            last_c >= last_u * 0.995,
+            last_c <= last_l * 1.005,
+        ],
+        [
+            c(BBSignal.SQUEEZE), c(BBSignal.EXPANSION),
+            c(BBSignal.UPPER_BREAK), c(BBSignal.LOWER_BREAK),
+            c(BBSignal.UPPER_TOUCH), c(BBSignal.LOWER_TOUCH),
+        ],
+        c(BBSignal.NEUTRAL),
+    ).astype(np.int8)
+
+
+def st_labels(prev_dir: np.ndarray, curr_dir: np.ndarray) -> np.ndarray:
+    c = lambda m: _code(ST_LABELS, m)
+    return np.select(
+        [(prev_dir == -1) & (curr_dir == 1), (prev_dir == 1) & (curr_dir == -1), curr_dir == 1],
+        [c(STSignal.BUY_SIGNAL), c(STSignal.SELL_SIGNAL), c(STSignal.BULLISH)],
+        c(STSignal.BEARISH),
+    ).astype(np.int8)
+
+
+def vwap_labels(
+    last_c: np.ndarray, prev_c: np.ndarray,
+    last_v: np.ndarray, prev_v: np.ndarray,
+    u1: np.ndarray, l1: np.ndarray, u2: np.ndarray, l2: np.ndarray,
+    has_prev: np.ndarray,
+) -> np.ndarray:
+    c = lambda m: _code(VWAP_LABELS, m)
+    return np.select(
+        [
+            ~has_prev,
+            (prev_c < prev_v) & (last_c >= last_v),
+            (prev_c > prev_v) & (last_c <= last_v),
+            last_c >= u2, last_c <= l2,
+            last_c >= u1, last_c <= l1,
+            last_c >= last_v,
+        ],
+        [
+            c(VWAPSignal.ABOVE_VWAP),
+            c(VWAPSignal.CROSS_UP),  c(VWAPSignal.CROSS_DOWN),
+            c(VWAPSignal.AT_2SD_UP), c(VWAPSignal.AT_2SD_DOWN),
+            c(VWAPSignal.AT_1SD_UP), c(VWAPSignal.AT_1SD_DOWN),
+            c(VWAPSignal.ABOVE_VWAP),
+        ],
+        c(VWAPSignal.BELOW_VWAP),
+    ).astype(np.int8)
+
+
+def composite_scores(
+    components: dict[str, np.ndarray],
+    weights:    Mapping[str, float] = _WEIGHTS,
+) -> np.ndarray:
+    """Weighted sum in the same order (and therefore rounding) as the scalar engine."""
+    total = np.zeros_like(components["rsi"])
+    for k in ("rsi", "macd", "bb", "st", "vwap"):
+        total = total + components[k] * weights[k]
+    return total
+
+
+def rating_labels(score: np.ndarray, thresholds: Sequence[float] = _THRESHOLDS) -> np.ndarray:
+    """Index into ``_RATINGS`` for each score (same thresholds as ``_rating``)."""
+    return np.select(
+        [score >= t for t in thresholds],
+        list(range(len(thresholds))),
+        len(_RATINGS) - 1,
+    ).astype(np.int8)
+
+
+def round_scores(score: np.ndarray, ndigits: int = 4) -> np.ndarray:
+    """Python's round() on every element — composites take few distinct values."""
+    uniq, inv = np.unique(score, return_inverse=True)
+    rounded   = np.array([round(float(x), ndigits) for x in uniq], dtype=np.float64)
+    return rounded[inv].reshape(score.shape)
+
+
+def _categorical(codes: np.ndarray, labels: tuple) -> pd.Categorical:
+    return pd.Categorical.from_codes(codes, categories=[m.value for m in labels])
+
+
+# ── Engine ────────────────────────────────────────────────────────────────────
+class BatchSignalEngine:
+    """
+    Evaluate ``CustomSignalEngine`` over many tickers at once.
+
+    Inputs are aligned (tickers × bars) arrays; the output is one row per
+    ticker with rating, score, per-indicator signals and component scores.
+    """
+
+    def __init__(self, engine: Optional[CustomSignalEngine] = None) -> None:
+        self.engine = engine or CustomSignalEngine()
+
+    def run(
+        self,
+        high:    np.ndarray,
+        low:     np.ndarray,
+        close:   np.ndarray,
+        volume:  Optional[np.ndarray] = None,
+        tickers: Optional[Sequence[str]] = None,
+        index:   Optional[pd.Index] = None,
+    ) -> pd.DataFrame:
+        """
+        Composite of every row. ``index`` labels the bar columns (one
+        timestamp per column, shared by all tickers) so session VWAP resets
+        on the same bars as ``CustomSignalEngine.run``.
+        """
+        c = np.array(close, dtype=np.float64, ndmin=2)
+        h = np.array(high,  dtype=np.float64, ndmin=2)
+        l = np.array(low,   dtype=np.float64, ndmin=2)
+        if h.shape != c.shape or l.shape != c.shape:
+            raise ValueError(f"high/low/close shapes differ: {h.shape} {l.shape} {c.shape}")
+        if c.shape[1] == 0:
+            raise ValueError("need at least one bar")
+        v = None
+        if volume is not None:
+            v = np.array(volume, dtype=np.float64, ndmin=2)
+            if v.shape != c.shape:
+                raise ValueError(f"volume shape {v.shape} != close shape {c.shape}")
+        if index is not None and len(index) != c.shape[1]:
+            raise ValueError(f"index has {len(index)} labels for {c.shape[1]} bars")
+
+        eng = self.engine
+        # pandas works column-wise, so give it (bars × tickers)
+        C, H, L = (pd.DataFrame(a.T, index=index) for a in (c, h, l))
+        V = pd.DataFrame(v.T, index=index) if v is not None else None
+        g = ComputeGraph(high=H, low=L, close=C, volume=V)
+        has_prev = (~np.isnan(c)).sum(axis=1) >= 2
+
+        def last2(frame: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+            arr = frame.to_numpy()
+            return (arr[-2] if len(arr) >= 2 else arr[-1]), arr[-1]
+
+        pc, lc = last2(C)
+
+        # RSI
+        rsi = eng.rsi._from_graph(g).to_numpy()[-1]
+        g.prune([*eng.macd.inputs(), *eng.bb.inputs(), *eng.vwap.inputs()])
+        rsi_codes = rsi_labels(rsi, eng.rsi.ob, eng.rsi.os_)
+
+        # MACD
+        macd, sig, hist = eng.macd._from_graph(g)
+        g.prune([*eng.bb.inputs(), *eng.vwap.inputs()])
+        pm, cm = last2(macd)
+        ps, cs = last2(sig)
+        ph, ch = last2(hist)
+        macd_codes = macd_labels(pm, cm, ps, cs, ph, ch, has_prev)
+
+        # Bollinger Bands
+        _, upper, lower, bw, _ = eng.bb._from_graph(g)
+        g.prune(eng.vwap.inputs())
+        pbw, lbw = last2(bw)
+        bb_codes = bb_labels(
+            lc, pc, upper.to_numpy()[-1], lower.to_numpy()[-1],
+            lbw, pbw, has_prev, eng.bb.sq_threshold,
+        )
+
+        # SuperTrend
+        prev_c = np.concatenate([np.full((c.shape[0], 1), np.nan), c[:, :-1]], axis=1)
+        tr  = np.fmax(h - l, np.fmax(np.abs(h - prev_c), np.abs(l - prev_c)))
+        atr = pd.DataFrame(tr.T).ewm(span=eng.st.period, adjust=False).mean().to_numpy().T
+        hl2 = (h + l) / 2
+        _, direction = supertrend_bands_2d(
+            hl2 + eng.st.multiplier * atr, hl2 - eng.st.multiplier * atr, c,
+        )
+        curr_dir = direction[:, -1]
+        prev_dir = np.where(has_prev, direction[:, -2] if c.shape[1] >= 2 else curr_dir, curr_dir)
+        st_codes = st_labels(prev_dir, curr_dir)
+
+        vwap_codes = None
+        if v is not None:
+            vwap, std = eng.vwap._from_graph(g)
+            pv, lv = last2(vwap)
+            s = std.to_numpy()[-1]
+            vwap_codes = vwap_labels(
+                lc, pc, lv, pv, lv + s, lv - s, lv + 2 * s, lv - 2 * s, has_prev,
+            )
+
+        out = _frame(rsi_codes, macd_codes, bb_codes, st_codes, vwap_codes, c.shape[0], eng)
+        if tickers is not None:
+            out.index = pd.Index(list(tickers), name="ticker")
+        return out
+
+    def history(
+        self,
+        high:   pd.Series,
+        low:    pd.Series,
+        close:  pd.Series,
+        volume: Optional[pd.Series] = None,
+    ) -> pd.DataFrame:
+        """
+        Signal, component scores, score and rating at every bar of one
+        ticker — row t equals ``CustomSignalEngine.run`` on bars [0, t]
+        (every indicator is causal), without the O(n²) replay. Session VWAP
+        included: prefixes in which every bar is still its own session run
+        cumulatively, as ``run`` does on them (see ``session_ids``).
+        """
+        if len(close) == 0:
+            raise ValueError("need at least one bar")
+        if volume is not None and volume.empty:
+            volume = None
+        eng = self.engine
+        g   = ComputeGraph(high=high, low=low, close=close, volume=volume)
+        n   = len(close)
+
+        def pair(series: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+            arr = series.to_numpy(dtype=np.float64)
+            # (bar t-1, bar t); bar 0 is its own prev
+            return np.concatenate((arr[:1], arr[:-1])), arr
+
+        has_prev = np.arange(n) >= 1
+        pc, lc   = pair(g["close"])
+
+        rsi       = eng.rsi._from_graph(g).to_numpy(dtype=np.float64)
+        rsi_codes = rsi_labels(rsi, eng.rsi.ob, eng.rsi.os_)
+        g.prune([*eng.macd.inputs(), *eng.bb.inputs(), *eng.st.inputs(), *eng.vwap.inputs()])
+
+        macd, sig, hist = eng.macd._from_graph(g)
+        g.prune([*eng.bb.inputs(), *eng.st.inputs(), *eng.vwap.inputs()])
+        macd_codes = macd_labels(*pair(macd), *pair(sig), *pair(hist), has_prev)
+
+        _, upper, lower, bw, _ = eng.bb._from_graph(g)
+        g.prune([*eng.st.inputs(), *eng.vwap.inputs()])
+        pbw, lbw = pair(bw)
+        bb_codes = bb_labels(
+            lc, pc, upper.to_numpy(dtype=np.float64), lower.to_numpy(dtype=np.float64),
+            lbw, pbw, has_prev, eng.bb.sq_threshold,
+        )
+
+        prev_dir, curr_dir = pair(eng.st.evaluate(g).direction)
+        g.prune(eng.vwap.inputs())
+        st_codes = st_labels(prev_dir, curr_dir)
+
+        vwap_codes = None
+        if volume is not None:
+            vwap, std = eng.vwap._from_graph(g)
+            pv, lv = pair(vwap)
+            sd     = std.to_numpy(dtype=np.float64)
+            head   = _sessionless_head(eng.vwap, close.index)
+            if head:
+                bars = (s.iloc[:head] for s in (high, low, close, volume))
+                cv, cs = VWAPIndicator(session_reset=False)._vwap_std(*bars)
+                pv, lv, sd = pv.copy(), lv.copy(), sd.copy()
+                pv[:head], lv[:head] = pair(cv)
+                sd[:head] = cs.to_numpy(dtype=np.float64)
+            vwap_codes = vwap_labels(
+                lc, pc, lv, pv, lv + sd, lv - sd, lv + 2 * sd, lv - 2 * sd, has_prev,
+            )
+
+        out = _frame(rsi_codes, macd_codes, bb_codes, st_codes, vwap_codes, n, eng)
+        out.index = close.index
+        return out
+
+
+def _sessionless_head(vwap: VWAPIndicator, index: pd.Index) -> int:
+    """
+    Bars before the first session that holds two of them — every prefix that
+    ends there has no session to reset, so ``run`` takes its VWAP cumulatively.
+    0 when there is no such head (no reset, no timestamps, or VWAP is
+    cumulative over the whole series anyway).
+    """
+    if vwap.session is None or not isinstance(index, pd.DatetimeIndex):
+        return 0
+    keys   = session_keys(index, *vwap._calendar)
+    repeat = np.flatnonzero(keys[1:] == keys[:-1])
+    return int(repeat[0]) + 1 if len(repeat) else 0
+
+
+def _frame(
+    rsi_codes:  np.ndarray,
+    macd_codes: np.ndarray,
+    bb_codes:   np.ndarray,
+    st_codes:   np.ndarray,
+    vwap_codes: Optional[np.ndarray],
+    rows:       int,
+    engine:     CustomSignalEngine,
+) -> pd.DataFrame:
+    components = {
+        "rsi":  _RSI_TABLE[rsi_codes],
+        "macd": _MACD_TABLE[macd_codes],
+        "bb":   _BB_TABLE[bb_codes],
+        "st":   _ST_TABLE[st_codes],
+        "vwap": np.zeros(rows),
+    }
+    if vwap_codes is not None:
+        components["vwap"] = _VWAP_TABLE[vwap_codes]
+        vwap_col = pd.Categorical.from_codes(
+            vwap_codes, categories=[m.value for m in VWAP_LABELS] + ["n/a"],
+        )
+    else:
+        vwap_col = pd.Categorical.from_codes(np.zeros(rows, dtype=np.int8), categories=["n/a"])
+
+    score  = composite_scores(components, engine.weights)
+    rating = rating_labels(score, engine.thresholds)
+    return pd.DataFrame({
+        "rating":      pd.Categorical.from_codes(rating, categories=list(_RATINGS)),
+        "score":       round_scores(score),
+        "rsi_signal":  _categorical(rsi_codes,  RSI_LABELS),
+        "macd_signal": _categorical(macd_codes, MACD_LABELS),
+        "bb_signal":   _categorical(bb_codes,   BB_LABELS),
+        "st_signal":   _categorical(st_codes,   ST_LABELS),
+        "vwap_signal": vwap_col,
+        **components,
+    })
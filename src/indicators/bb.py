@@ -3,13 +3,19 @@ Bollinger Bands — extended with:
   • %B (position within bands)
   • Bandwidth (squeeze detection)
   • Squeeze alerts (low volatility periods)
+  • Streaming state over a fixed-size rolling window
 """
 
 from __future__ import annotations
 
+import math
 import pandas as pd
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
+
+from .graph import ComputeGraph, Key, rstd, sma, warmup_all
 
 
 class BBSignal(str, Enum):
@@ -45,13 +51,12 @@ class BollingerBands:
         self.sq_threshold = sq_threshold
 
     def calculate(self, close: pd.Series) -> BBResult:
-        middle = close.rolling(self.period).mean()
-        std    = close.rolling(self.period).std(ddof=0)
+        return self.evaluate(ComputeGraph(close=close))
 
-        upper  = middle + self.std_dev * std
-        lower  = middle - self.std_dev * std
-        bw     = (upper - lower) / middle
-        pct_b  = (close - lower) / (upper - lower)
+    def evaluate(self, g: ComputeGraph) -> BBResult:
+        """``calculate`` on a shared graph (see CustomSignalEngine)."""
+        close = g["close"]
+        middle, upper, lower, bw, pct_b = self._from_graph(g)
 
         squeeze = bool(float(bw.iloc[-1]) < self.sq_threshold)
         signal  = self._classify(close, upper, lower, bw, squeeze)
@@ -61,6 +66,28 @@ class BollingerBands:
             pct_b=pct_b, bandwidth=bw, signal=signal, squeeze=squeeze,
         )
 
+    def inputs(self) -> tuple[Key, ...]:
+        """Graph nodes: rolling mean and population std of close."""
+        return sma("close", self.period), rstd("close", self.period)
+
+    def lookback(self, tol: float = 1e-6) -> Optional[int]:
+        """Bars of history for the last signal to match full history (windows are exact)."""
+        return warmup_all(self.inputs(), tol) + 2                 # previous + current bar
+
+    def _bands(self, close):
+        """(middle, upper, lower, bandwidth, %B) for a Series or (bars × tickers) DataFrame."""
+        return self._from_graph(ComputeGraph(close=close))
+
+    def _from_graph(self, g: ComputeGraph):
+        close       = g["close"]
+        middle, std = g.get_many(self.inputs())
+
+        upper  = middle + self.std_dev * std
+        lower  = middle - self.std_dev * std
+        bw     = (upper - lower) / middle
+        pct_b  = (close - lower) / (upper - lower)
+        return middle, upper, lower, bw, pct_b
+
     def _classify(
         self,
         close:   pd.Series,
@@ -68,16 +95,34 @@ class BollingerBands:
         lower:   pd.Series,
         bw:      pd.Series,
         squeeze: bool,
+    ) -> BBSignal:
+        return self._label(
+            last_c  = float(close.iloc[-1]),
+            prev_c  = float(close.iloc[-2]) if len(close) >= 2 else None,
+            last_u  = float(upper.iloc[-1]),
+            last_l  = float(lower.iloc[-1]),
+            last_bw = float(bw.iloc[-1]),
+            prev_bw = float(bw.iloc[-2]) if len(bw) >= 2 else None,
+            squeeze = squeeze,
+        )
+
+    @staticmethod
+    def _label(
+        last_c:  float,
+        prev_c:  Optional[float],
+        last_u:  float,
+        last_l:  float,
+        last_bw: float,
+        prev_bw: Optional[float],
+        squeeze: bool,
     ) -> BBSignal:
         if squeeze:
             return BBSignal.SQUEEZE
-        if len(bw) >= 2 and bw.iloc[-1] > bw.iloc[-2] * 1.05:
+        if prev_bw is not None and last_bw > prev_bw * 1.05:
             return BBSignal.EXPANSION
 
-        last_c = float(close.iloc[-1])
-        last_u = float(upper.iloc[-1])
-        last_l = float(lower.iloc[-1])
-        prev_c = float(close.iloc[-2]) if len(close) >= 2 else last_c
+        if prev_c is None:
+            prev_c = last_c
 
         if last_c > last_u and prev_c <= last_u:
             return BBSignal.UPPER_BREAK
@@ -89,3 +134,67 @@ class BollingerBands:
             return BBSignal.LOWER_TOUCH
 
         return BBSignal.NEUTRAL
+
+    # ── Streaming ─────────────────────────────────────────────────────────────
+    def stream(self, close: Optional[pd.Series] = None) -> "BBStream":
+        """Incremental Bollinger state, optionally primed with a close history."""
+        state = BBStream(self)
+        if close is not None:
+            for c in close.to_numpy(dtype=float).tolist():
+                state.update(c)
+        return state
+
+
+class BBStream:
+    """
+    Bar-by-bar Bollinger Bands over a ``period``-sized window.
+
+    Each update recomputes the window's mean and variance directly, two-pass
+    with ``math.fsum`` (O(period), cheap for a 20-bar window), so there are
+    no running sums to drift or cancel at high price levels. pandas' rolling
+    mean/std (used by ``calculate``) agree with these bands to about 1e-12
+    relative, so only a close within that distance of a band or threshold
+    can be labelled differently.
+    """
+
+    def __init__(self, indicator: BollingerBands) -> None:
+        self.indicator  = indicator
+        self._window    = deque(maxlen=indicator.period)
+        self._prev_c    = None
+        self._prev_bw   = None
+        self.upper      = float("nan")
+        self.middle     = float("nan")
+        self.lower      = float("nan")
+        self.pct_b      = float("nan")
+        self.bandwidth  = float("nan")
+        self.squeeze    = False
+        self.signal     = BBSignal.NEUTRAL
+
+    def update(self, close: float) -> BBSignal:
+        close = float(close)
+        ind   = self.indicator
+        n     = ind.period
+        self._window.append(close)
+
+        if len(self._window) == n:
+            middle = math.fsum(self._window) / n
+            std    = math.sqrt(math.fsum((x - middle) ** 2 for x in self._window) / n)
+        else:
+            middle = std = float("nan")
+
+        upper = middle + ind.std_dev * std
+        lower = middle - ind.std_dev * std
+        bw    = (upper - lower) / middle if middle != 0 else float("nan")
+        width = upper - lower
+        pct_b = (close - lower) / width if width != 0 else float("nan")
+
+        squeeze = bool(bw < ind.sq_threshold)
+        self.signal = BollingerBands._label(
+            last_c=close, prev_c=self._prev_c, last_u=upper, last_l=lower,
+            last_bw=bw, prev_bw=self._prev_bw, squeeze=squeeze,
+        )
+
+        self._prev_c, self._prev_bw = close, bw
+        self.upper, self.middle, self.lower = upper, middle, lower
+        self.pct_b, self.bandwidth, self.squeeze = pct_b, bw, squeeze
+        return self.signal
@@ -1,19 +1,44 @@
 """
 CustomSignalEngine — combines all indicators into a unified signal score.
 Outputs a composite rating from -1.0 (strong sell) to +1.0 (strong buy).
+StreamingSignalEngine keeps the same composite up to date bar by bar;
+BatchSignalEngine (batch.py) evaluates a whole universe in one pass, and
+``history`` classifies every bar of one ticker at once for backtests.
+Indicators read their intermediates from a per-run ComputeGraph (graph.py),
+so shared nodes (close, hl2 / typical price, EMAs of equal span …) are
+computed once; ``profile`` reports per-node time and bytes.
+Composite weights and rating thresholds default to the module constants and
+can be overridden per engine or loaded from a JSON profile (``from_profile``),
+e.g. one written by the backtest optimizer.
+With a MetricsRegistry attached, ``run`` times each indicator and the composite.
+With a ``tolerance``, ``run`` only feeds each indicator the tail of history
+it needs for its last values to match full history (see ``lookback``);
+``strict`` re-checks every trimmed result against the full-history one.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
+import numpy as np
 import pandas as pd
+from contextlib import nullcontext
 from dataclasses import dataclass, field
-from typing import Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Sequence
 
 from .rsi       import RSIIndicator, RSISignal
 from .macd      import MACDIndicator, MACDSignal
 from .bb        import BollingerBands, BBSignal
 from .supertrend import SuperTrend, STSignal
-from .vwap      import VWAPIndicator, VWAPSignal
+from .vwap      import VWAPIndicator, VWAPSignal, _stamps
+from .graph     import ComputeGraph, NodeStats
+
+if TYPE_CHECKING:
+    from ..utils.metrics import MetricsRegistry
+
+log = logging.getLogger(__name__)
 
 
 @dataclass
@@ -79,21 +104,93 @@ _VWAP_SCORES = {
 }
 
 
-def _rating(score: float) -> str:
-    if score >= 0.6:  return "STRONG BUY"
-    if score >= 0.2:  return "BUY"
-    if score >= -0.2: return "NEUTRAL"
-    if score >= -0.6: return "SELL"
-    return "STRONG SELL"
+_RATINGS    = ("STRONG BUY", "BUY", "NEUTRAL", "SELL", "STRONG SELL")
+_THRESHOLDS = (0.6, 0.2, -0.2, -0.6)     # lower bound of each rating but the last
+
+
+def _rating(score: float, thresholds: Sequence[float] = _THRESHOLDS) -> str:
+    for label, floor in zip(_RATINGS, thresholds):
+        if score >= floor:
+            return label
+    return _RATINGS[-1]
+
+
+def _composite(
+    rsi:  RSISignal,
+    macd: MACDSignal,
+    bb:   BBSignal,
+    st:   STSignal,
+    vwap: Optional[VWAPSignal],
+    weights:    Mapping[str, float] = _WEIGHTS,
+    thresholds: Sequence[float]     = _THRESHOLDS,
+) -> CompositeSignal:
+    scores = {
+        "rsi":  _RSI_SCORES.get(rsi,   0.0),
+        "macd": _MACD_SCORES.get(macd, 0.0),
+        "bb":   _BB_SCORES.get(bb,     0.0),
+        "st":   _ST_SCORES.get(st,     0.0),
+        "vwap": _VWAP_SCORES.get(vwap, 0.0) if vwap is not None else 0.0,
+    }
+    composite = sum(scores[k] * weights[k] for k in scores)
+
+    return CompositeSignal(
+        score       = round(composite, 4),
+        rating      = _rating(composite, thresholds),
+        rsi_signal  = rsi.value,
+        macd_signal = macd.value,
+        bb_signal   = bb.value,
+        st_signal   = st.value,
+        vwap_signal = vwap.value if vwap is not None else "n/a",
+        components  = scores,
+    )
 
 
 class CustomSignalEngine:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        metrics:   Optional["MetricsRegistry"] = None,
+        tolerance: Optional[float] = None,
+        strict:    bool = False,
+        weights:    Optional[Mapping[str, float]] = None,
+        thresholds: Optional[Sequence[float]] = None,
+    ) -> None:
         self.rsi  = RSIIndicator()
         self.macd = MACDIndicator()
         self.bb   = BollingerBands()
         self.st   = SuperTrend()
         self.vwap = VWAPIndicator()
+        self.metrics   = metrics      # opt-in: per-indicator stage timings
+        self.tolerance = tolerance    # None = always use the full history
+        self.strict    = strict
+        self.mismatches = 0           # strict-mode disagreements (full result was returned)
+        self.weights    = {**_WEIGHTS, **(weights or {})}
+        self.thresholds = tuple(thresholds) if thresholds is not None else _THRESHOLDS
+        floors = list(self.thresholds)
+        if len(floors) != len(_THRESHOLDS) or floors != sorted(floors, reverse=True):
+            raise ValueError(
+                f"thresholds must be {len(_THRESHOLDS)} descending floors, got {self.thresholds}"
+            )
+
+    # ── Profiles ──────────────────────────────────────────────────────────────
+    @classmethod
+    def from_profile(cls, path: str | Path, **kwargs: Any) -> "CustomSignalEngine":
+        """Engine with the weights / thresholds of a JSON profile (see ``to_profile``)."""
+        data = json.loads(Path(path).read_text())
+        return cls(weights=data.get("weights"), thresholds=data.get("thresholds"), **kwargs)
+
+    def fingerprint(self) -> str:
+        """Short hash of everything ``run``'s result depends on besides the bars."""
+        params = {n: vars(getattr(self, n)) for n in _WEIGHTS}
+        raw    = json.dumps([params, self.weights, self.thresholds, self.tolerance, self.strict],
+                            sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    def to_profile(self, **meta: Any) -> dict[str, Any]:
+        """JSON-friendly weights and rating thresholds, plus any ``meta`` (e.g. search results)."""
+        out: dict[str, Any] = {"weights": dict(self.weights), "thresholds": list(self.thresholds)}
+        if meta:
+            out["meta"] = meta
+        return out
 
     def run(
         self,
@@ -102,35 +199,175 @@ class CustomSignalEngine:
         close:  pd.Series,
         volume: Optional[pd.Series] = None,
     ) -> CompositeSignal:
-        rsi_r  = self.rsi.calculate(close)
-        macd_r = self.macd.calculate(close)
-        bb_r   = self.bb.calculate(close)
-        st_r   = self.st.calculate(high, low, close)
-
-        scores = {
-            "rsi":  _RSI_SCORES.get(rsi_r.signal,   0.0),
-            "macd": _MACD_SCORES.get(macd_r.event,  0.0),
-            "bb":   _BB_SCORES.get(bb_r.signal,     0.0),
-            "st":   _ST_SCORES.get(st_r.signal,     0.0),
-        }
-
-        if volume is not None and not volume.empty:
-            vwap_r = self.vwap.calculate(high, low, close, volume)
-            scores["vwap"] = _VWAP_SCORES.get(vwap_r.signal, 0.0)
-            vwap_sig = vwap_r.signal.value
-        else:
-            scores["vwap"] = 0.0
-            vwap_sig = "n/a"
-
-        composite = sum(scores[k] * _WEIGHTS[k] for k in scores)
-
-        return CompositeSignal(
-            score       = round(composite, 4),
-            rating      = _rating(composite),
-            rsi_signal  = rsi_r.signal.value,
-            macd_signal = macd_r.event.value,
-            bb_signal   = bb_r.signal.value,
-            st_signal   = st_r.signal.value,
-            vwap_signal = vwap_sig,
-            components  = scores,
-        )
+        full = self._graph(high, low, close, volume)
+        if self.tolerance is None:
+            return self._evaluate(full)
+
+        names     = self._names(full)
+        lookbacks = {n: b for n, b in self._lookbacks(close.index).items() if n in names}
+        whole     = {n for n, b in lookbacks.items() if b is None}
+        bars      = max((b for b in lookbacks.values() if b is not None), default=len(close))
+        if len(close) <= bars:
+            return self._evaluate(full)
+        tail   = self._graph(high.iloc[-bars:], low.iloc[-bars:], close.iloc[-bars:],
+                             volume.iloc[-bars:] if volume is not None else None)
+        signal = self._evaluate(tail, full, whole)
+        if self.strict:
+            reference = self._evaluate(self._graph(high, low, close, volume))
+            if reference != signal:
+                self.mismatches += 1
+                log.warning(
+                    "Trimmed history (%d of %d bars, tol=%g) disagrees with full history: %s vs %s",
+                    bars, len(close), self.tolerance, signal, reference,
+                )
+                return reference
+        return signal
+
+    def lookback(self, volume: bool = True, index: Optional[pd.Index] = None) -> Optional[int]:
+        """
+        Bars of history ``run`` needs at the current ``tolerance`` (default
+        1e-6). ``None`` if an included indicator needs all of it — e.g.
+        cumulative VWAP, or session VWAP without the bars' ``index`` to find
+        the session open; ``volume=False`` excludes VWAP.
+        """
+        bars = [b for n, b in self._lookbacks(index).items() if volume or n != "vwap"]
+        return None if any(b is None for b in bars) else max(bars)
+
+    def _lookbacks(self, index: Optional[pd.Index] = None) -> dict[str, Optional[int]]:
+        tol = self.tolerance or 1e-6
+        out = {n: getattr(self, n).lookback(tol) for n in _WEIGHTS}
+        out["vwap"] = self.vwap.lookback(tol, index)
+        return out
+
+    def profile(
+        self,
+        high:   pd.Series,
+        low:    pd.Series,
+        close:  pd.Series,
+        volume: Optional[pd.Series] = None,
+    ) -> tuple[CompositeSignal, list[NodeStats]]:
+        """``run`` plus per-node timing / bytes / reuse of the intermediate graph."""
+        g = self._graph(high, low, close, volume)
+        return self._evaluate(g), g.profile()
+
+    @staticmethod
+    def _graph(high, low, close, volume) -> ComputeGraph:
+        if volume is not None and volume.empty:
+            volume = None
+        return ComputeGraph(high=high, low=low, close=close, volume=volume)
+
+    @staticmethod
+    def _names(g: ComputeGraph) -> list[str]:
+        return [n for n in _WEIGHTS if n != "vwap" or "volume" in g]
+
+    def _evaluate(
+        self,
+        g:     ComputeGraph,
+        full:  Optional[ComputeGraph] = None,
+        whole: frozenset[str] | set[str] = frozenset(),
+    ) -> CompositeSignal:
+        """Evaluate every indicator on ``g`` — those named in ``whole`` on ``full`` instead."""
+        names   = self._names(g)
+        timer   = self.metrics.timer if self.metrics is not None else None
+        results = {}
+        for i, name in enumerate(names):
+            indicator = getattr(self, name)
+            with timer(name) if timer else nullcontext():
+                results[name] = indicator.evaluate(full if name in whole else g)
+            # drop intermediates the remaining indicators don't share
+            g.prune(k for later in names[i + 1:] for k in getattr(self, later).inputs())
+
+        vwap = results["vwap"].signal if "vwap" in results else None
+        with timer("composite") if timer else nullcontext():
+            return _composite(
+                results["rsi"].signal, results["macd"].event, results["bb"].signal,
+                results["st"].signal, vwap, self.weights, self.thresholds,
+            )
+
+    def run_batch(
+        self,
+        high:    np.ndarray,
+        low:     np.ndarray,
+        close:   np.ndarray,
+        volume:  Optional[np.ndarray] = None,
+        tickers: Optional[Sequence[str]] = None,
+        index:   Optional[pd.Index] = None,
+    ) -> pd.DataFrame:
+        """Vectorized ``run`` over aligned (tickers × bars) matrices — see BatchSignalEngine."""
+        from .batch import BatchSignalEngine
+        return BatchSignalEngine(self).run(high, low, close, volume, tickers, index)
+
+    def history(
+        self,
+        high:   pd.Series,
+        low:    pd.Series,
+        close:  pd.Series,
+        volume: Optional[pd.Series] = None,
+    ) -> pd.DataFrame:
+        """Per-bar signals, components, score and rating (``run`` at every bar); see batch.py."""
+        from .batch import BatchSignalEngine
+        return BatchSignalEngine(self).history(high, low, close, volume)
+
+    def stream(
+        self,
+        high:   Optional[pd.Series] = None,
+        low:    Optional[pd.Series] = None,
+        close:  Optional[pd.Series] = None,
+        volume: Optional[pd.Series] = None,
+    ) -> "StreamingSignalEngine":
+        """Incremental engine sharing this engine's indicator settings, optionally primed."""
+        return StreamingSignalEngine(self, high, low, close, volume)
+
+
+class StreamingSignalEngine:
+    """
+    Composite signal kept current one bar at a time.
+
+    Prime it once with a ticker's history, then feed each closed bar to
+    ``update`` — every indicator advances in O(1) instead of re-running
+    pandas over the whole series.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[CustomSignalEngine] = None,
+        high:   Optional[pd.Series] = None,
+        low:    Optional[pd.Series] = None,
+        close:  Optional[pd.Series] = None,
+        volume: Optional[pd.Series] = None,
+    ) -> None:
+        engine    = engine or CustomSignalEngine()
+        self.weights    = engine.weights
+        self.thresholds = engine.thresholds
+        self.rsi  = engine.rsi.stream()
+        self.macd = engine.macd.stream()
+        self.bb   = engine.bb.stream()
+        self.st   = engine.st.stream()
+        self.vwap = engine.vwap.stream()
+        self.last: Optional[CompositeSignal] = None
+
+        if close is not None:
+            frame = pd.DataFrame({"high": high, "low": low, "close": close})
+            if volume is not None and not volume.empty:
+                frame["volume"] = volume
+            for ts, bar in zip(_stamps(frame), frame.to_dict("records")):
+                self.update(bar, ts)
+
+    def update(self, bar: Mapping[str, Any], ts: Any = None) -> CompositeSignal:
+        """
+        Advance every indicator by one closed bar (high/low/close[/volume]);
+        ``ts`` — the bar's open time — drives the VWAP session reset.
+        """
+        high, low, close = bar["high"], bar["low"], bar["close"]
+        volume = bar.get("volume")
+
+        rsi  = self.rsi.update(close)
+        macd = self.macd.update(close)
+        bb   = self.bb.update(close)
+        st   = self.st.update(high, low, close)
+        vwap = None
+        if volume is not None:
+            vwap = self.vwap.update(high, low, close, volume, ts)
+
+        self.last = _composite(rsi, macd, bb, st, vwap, self.weights, self.thresholds)
+        return self.last
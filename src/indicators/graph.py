@@ -0,0 +1,276 @@
+"""
+ComputeGraph — shared intermediates for one engine run.
+
+Indicators declare the nodes they need (delta, EMA(n), Wilder(n), true
+range, rolling mean/std(n), typical price …) as hashable keys built with the
+helpers below; the graph evaluates each node once, memoizes it, and records
+per-node timing and allocated bytes. ``prune`` frees nodes no remaining
+consumer needs, so sharing does not raise peak memory. ``warmup`` gives the
+history a node needs for its last value to match the full-history value.
+``session_cumsum`` restarts its running sum at each trading session (day,
+week or any pandas frequency, in the exchange's timezone), keyed on the
+DatetimeIndex. Nodes work on a Series or, column-wise, on a (bars × tickers)
+DataFrame.
+
+    g = ComputeGraph(high=h, low=l, close=c)
+    g[ema("close", 12)]                 # computed
+    g[sub(ema("close", 12), ema("close", 26))]   # reuses ema(close,12)
+
+Each node uses exactly the pandas expression the indicators used before, so
+results are bit-identical to computing them standalone.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+Key = Union[str, tuple]          # "close" (an input) or ("ema", src, span)
+INPUTS = ("high", "low", "close", "volume")
+_HL_SUM = ("hl_sum", "high", "low")      # shared by hl2 (SuperTrend) and typical price (VWAP)
+
+
+# ── Node constructors ─────────────────────────────────────────────────────────
+def delta(src: Key = "close") -> Key:           return ("delta", src)
+def shift(src: Key = "close", n: int = 1) -> Key: return ("shift", src, n)
+def gain(src: Key = "close") -> Key:            return ("gain", delta(src))
+def loss(src: Key = "close") -> Key:            return ("loss", delta(src))
+def ema(src: Key, span: int) -> Key:            return ("ema", src, span)
+def wilder(src: Key, period: int) -> Key:       return ("wilder", src, period)
+def sma(src: Key, period: int) -> Key:          return ("sma", src, period)
+def rstd(src: Key, period: int) -> Key:         return ("rstd", src, period)
+def sub(a: Key, b: Key) -> Key:                 return ("sub", a, b)
+def cumsum(src: Key) -> Key:                    return ("cumsum", src)
+def sessions(freq: str, tz: str | None = None, start: str | None = None) -> Key:
+    return ("session", "close", freq, tz, start)
+def session_cumsum(src: Key, freq: str, tz: str | None = None, start: str | None = None) -> Key:
+    return ("scumsum", src, sessions(freq, tz, start))
+def hl2() -> Key:                               return ("hl2", _HL_SUM)
+def typical_price() -> Key:                     return ("tp", _HL_SUM, "close")
+def true_range() -> Key:                        return ("tr", "high", "low", shift("close"))
+
+
+def _tr(high, low, prev_close):
+    # NaN-skipping max, like pd.concat([...], axis=1).max(axis=1), but also column-wise
+    return np.fmax(high - low, np.fmax((high - prev_close).abs(), (low - prev_close).abs()))
+
+
+def session_keys(
+    index: pd.DatetimeIndex,
+    freq:  str,
+    tz:    str | None = None,
+    start: str | None = None,
+) -> np.ndarray:
+    """
+    Integer session key of every timestamp: ``freq`` periods ("D", "W", "M",
+    "4h" …) of exchange-local wall-clock time. A tz-aware index is converted
+    to ``tz`` (default: keep its own zone — yfinance already returns exchange
+    time), a naive one is taken as local. ``start`` ("18:00") moves the
+    session open from midnight.
+    """
+    local = index
+    if tz is not None and local.tz is not None:
+        local = local.tz_convert(tz)
+    if local.tz is not None:
+        local = local.tz_localize(None)
+    if start:
+        local = local - _clock(start)
+    try:
+        return local.floor(freq).asi8
+    except ValueError:                          # calendar frequencies ("W", "M") don't floor
+        return local.to_period(freq).asi8
+
+
+def session_ids(
+    index: Any,
+    freq:  str,
+    tz:    str | None = None,
+    start: str | None = None,
+) -> np.ndarray | None:
+    """
+    Session number (0, 1, 2 …) of every bar (see ``session_keys``). ``None``
+    when there is nothing to reset — no DatetimeIndex, or every bar is its
+    own session (bars at or above the session length), in which case sums
+    run over the whole history.
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return None
+    keys = session_keys(index, freq, tz, start)
+    new  = np.empty(len(keys), dtype=bool)
+    new[0]  = True
+    new[1:] = keys[1:] != keys[:-1]
+    if new.all():
+        return None
+    return np.cumsum(new) - 1
+
+
+def session_span(freq: str) -> pd.Timedelta:
+    """Longest session of ``freq`` ("D" → 1 day, "M" → 31 days, "4h" → 4 hours)."""
+    periods = pd.period_range("2000-01-01", periods=12, freq=freq)
+    return max(periods.end_time - periods.start_time).ceil("s")
+
+
+def segmented_cumsum(values: Any, ids: np.ndarray | None) -> Any:
+    """Running sum that restarts at each session (plain cumsum when ``ids`` is None)."""
+    if ids is None:
+        return values.cumsum()
+    return values.groupby(ids).cumsum()
+
+
+def _clock(hhmm: str) -> pd.Timedelta:
+    hours, _, minutes = hhmm.partition(":")
+    return pd.Timedelta(hours=int(hours), minutes=int(minutes or 0))
+
+
+# kind -> (number of node arguments, fn(*node_values, *params))
+_OPS: dict[str, tuple[int, Callable[..., Any]]] = {
+    "delta":  (1, lambda s: s.diff()),
+    "shift":  (1, lambda s, n: s.shift(n)),
+    "gain":   (1, lambda d: d.clip(lower=0)),
+    "loss":   (1, lambda d: (-d).clip(lower=0)),
+    "ema":    (1, lambda s, span: s.ewm(span=span, adjust=False).mean()),
+    "wilder": (1, lambda s, n: s.ewm(alpha=1 / n, min_periods=n, adjust=False).mean()),
+    "sma":    (1, lambda s, n: s.rolling(n).mean()),
+    "rstd":   (1, lambda s, n: s.rolling(n).std(ddof=0)),
+    "sub":    (2, lambda a, b: a - b),
+    "cumsum": (1, lambda s: s.cumsum()),
+    "session": (1, lambda s, freq, tz, start: session_ids(s.index, freq, tz, start)),
+    "scumsum": (2, segmented_cumsum),
+    "hl_sum": (2, lambda h, l: h + l),
+    "hl2":    (1, lambda hs: hs / 2),
+    "tp":     (2, lambda hs, c: (hs + c) / 3),
+    "tr":     (3, _tr),
+}
+
+
+def node_name(key: Key) -> str:
+    """Readable label: ("ema", "close", 12) -> "ema(close,12)"."""
+    if isinstance(key, str):
+        return key
+    args = (node_name(a) if isinstance(a, (str, tuple)) else str(a) for a in key[1:])
+    return f"{key[0]}(" + ",".join(args) + ")"
+
+
+def warmup(key: Key, tol: float) -> int | None:
+    """
+    Bars of history a node needs *before* its last value for that value to
+    be within ``tol`` of the full-history result (relative to the scale of
+    the node's input). ``None`` means the node depends on all history.
+
+    Recursive EMAs (adjust=False) forget their starting point as (1-α)^k, so
+    k = log(tol) / log(1-α); windows need n-1 bars; deltas/shifts need n.
+    Session sums depend on where the session began, which only the data
+    knows, so they report ``None`` too (see VWAPIndicator.lookback).
+    """
+    if isinstance(key, str):
+        return 0
+    kind, (n_nodes, _) = key[0], _OPS[key[0]]
+    deps = [warmup(a, tol) for a in key[1:1 + n_nodes]]
+    if kind in ("cumsum", "scumsum") or any(d is None for d in deps):
+        return None
+    base   = max(deps, default=0)
+    params = key[1 + n_nodes:]
+    if kind == "delta":
+        return base + 1
+    if kind == "shift":
+        return base + params[0]
+    if kind in ("sma", "rstd"):
+        return base + params[0] - 1
+    if kind == "ema":
+        return base + _decay_bars(2 / (params[0] + 1), tol)
+    if kind == "wilder":
+        return base + max(params[0] - 1, _decay_bars(1 / params[0], tol))
+    return base
+
+
+def warmup_all(keys: Iterable[Key], tol: float) -> int | None:
+    """Largest ``warmup`` over ``keys`` (None if any needs all history)."""
+    bars = [warmup(k, tol) for k in keys]
+    return None if any(b is None for b in bars) else max(bars, default=0)
+
+
+def _decay_bars(alpha: float, tol: float) -> int:
+    if alpha >= 1:
+        return 0
+    return math.ceil(math.log(tol) / math.log(1 - alpha))
+
+
+@dataclass
+class NodeStats:
+    node:   str
+    ms:     float      # time spent in this node's own operation
+    nbytes: int        # size of the node's output
+    hits:   int        # times it was served from the graph after being computed
+
+
+class ComputeGraph:
+    """Memoized DAG of intermediates over one set of inputs. Not thread-safe; build one per run."""
+
+    def __init__(self, **inputs: Any) -> None:
+        unknown = set(inputs) - set(INPUTS)
+        if unknown:
+            raise ValueError(f"unknown graph inputs: {sorted(unknown)}")
+        self._values: dict[Key, Any] = {k: v for k, v in inputs.items() if v is not None}
+        self._stats:  dict[Key, NodeStats] = {}
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._values
+
+    def __getitem__(self, key: Key) -> Any:
+        if key in self._values:
+            if key in self._stats:
+                self._stats[key].hits += 1
+            return self._values[key]
+        if isinstance(key, str):
+            raise KeyError(f"graph input {key!r} was not provided")
+        n_nodes, fn = _OPS[key[0]]
+        args = tuple(self[a] for a in key[1:1 + n_nodes]) + key[1 + n_nodes:]
+
+        t0  = time.perf_counter()
+        out = fn(*args)
+        ms  = (time.perf_counter() - t0) * 1000
+        self._values[key] = out
+        self._stats[key]  = NodeStats(node_name(key), ms, _nbytes(out), 0)
+        return out
+
+    def get_many(self, keys: Iterable[Key]) -> list[Any]:
+        return [self[k] for k in keys]
+
+    def prune(self, keep: Iterable[Key]) -> None:
+        """Free computed nodes that neither ``keep`` nor its dependencies need (inputs stay)."""
+        needed: set[Key] = set()
+        for key in keep:
+            _ancestors(key, needed)
+        for key in [k for k in self._values if k in self._stats and k not in needed]:
+            del self._values[key]
+
+    def profile(self) -> list[NodeStats]:
+        """Per-node stats in evaluation order (dependencies first)."""
+        return list(self._stats.values())
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(s.nbytes for s in self._stats.values())
+
+
+def _ancestors(key: Key, out: set[Key]) -> None:
+    # a key embeds its dependencies, so the DAG is the nesting of the tuples
+    if key in out:
+        return
+    out.add(key)
+    if isinstance(key, tuple):
+        for arg in key[1:]:
+            if isinstance(arg, (str, tuple)):
+                _ancestors(arg, out)
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        # memory_usage() walks every column; node frames are a single float64 block
+        return int(value.size * value.dtypes.iloc[0].itemsize) if value.size else 0
+    return int(getattr(value, "nbytes", 0))
@@ -0,0 +1,199 @@
+"""
+Array kernels — tight loops for the recursive parts of the indicators.
+Extended with:
+  • Optional numba JIT backend (used automatically when installed)
+  • Pure-Python fallback over contiguous float64 buffers
+  • Identical results on both backends (selection only, no arithmetic)
+  • 2-D (tickers × bars) SuperTrend for universe-wide batches
+  • Scalar EWM state that reproduces pandas' adjust=False recurrence
+"""
+
+from __future__ import annotations
+
+import math
+import os
+
+import numpy as np
+
+try:                                    # optional dependency — pip install numba
+    import numba as _numba
+except ImportError:                     # pragma: no cover - depends on environment
+    _numba = None
+
+JIT_AVAILABLE = _numba is not None and os.getenv("TV_DISABLE_JIT", "").lower() != "true"
+
+
+# ── SuperTrend ────────────────────────────────────────────────────────────────
+def _supertrend_loop(upper, lower, close, st, direction):
+    """
+    Band smoothing + direction state machine, in place.
+
+    Written against plain indexable sequences so the very same source runs
+    under numba (ndarrays) and in the fallback (Python lists of floats).
+    """
+    n = len(close)
+    for i in range(1, n):
+        if not (upper[i] < upper[i - 1] or close[i - 1] > upper[i - 1]):
+            upper[i] = upper[i - 1]
+        if not (lower[i] > lower[i - 1] or close[i - 1] < lower[i - 1]):
+            lower[i] = lower[i - 1]
+
+    if n == 0:
+        return
+    direction[0] = 1.0
+    st[0]        = lower[0]
+    for i in range(1, n):
+        if st[i - 1] == upper[i - 1]:
+            direction[i] = -1.0 if close[i] <= upper[i] else 1.0
+        else:
+            direction[i] = 1.0 if close[i] >= lower[i] else -1.0
+        st[i] = lower[i] if direction[i] == 1.0 else upper[i]
+
+
+_supertrend_jit = _numba.njit(cache=True, nogil=True)(_supertrend_loop) if _numba else None
+
+
+def supertrend_bands(
+    upper:   np.ndarray,
+    lower:   np.ndarray,
+    close:   np.ndarray,
+    use_jit: bool | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Smooth the basic SuperTrend bands and derive line + direction.
+
+    Returns (upper, lower, supertrend, direction) as new float64 arrays;
+    the inputs are not modified.
+    """
+    if use_jit is None:
+        use_jit = JIT_AVAILABLE
+    if use_jit and _supertrend_jit is None:
+        raise RuntimeError("numba is not installed — JIT backend unavailable")
+
+    n = len(close)
+    if use_jit:
+        u  = np.array(upper, dtype=np.float64, order="C")
+        lo = np.array(lower, dtype=np.float64, order="C")
+        c  = np.ascontiguousarray(close, dtype=np.float64)
+        st = np.empty(n, dtype=np.float64)
+        d  = np.empty(n, dtype=np.float64)
+        _supertrend_jit(u, lo, c, st, d)
+        return u, lo, st, d
+
+    # Python floats index ~5x faster than NumPy scalars in an interpreted loop
+    u  = np.asarray(upper, dtype=np.float64).tolist()
+    lo = np.asarray(lower, dtype=np.float64).tolist()
+    c  = np.asarray(close, dtype=np.float64).tolist()
+    st = [0.0] * n
+    d  = [0.0] * n
+    _supertrend_loop(u, lo, c, st, d)
+    return (
+        np.array(u,  dtype=np.float64), np.array(lo, dtype=np.float64),
+        np.array(st, dtype=np.float64), np.array(d,  dtype=np.float64),
+    )
+
+
+def supertrend_bands_2d(
+    upper:   np.ndarray,
+    lower:   np.ndarray,
+    close:   np.ndarray,
+    use_jit: bool | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    SuperTrend line + direction for a (tickers × bars) matrix.
+
+    Leading NaN bars (left-padding for shorter histories) are skipped per
+    row, so every row matches ``supertrend_bands`` on its own valid span.
+    """
+    if use_jit is None:
+        use_jit = JIT_AVAILABLE
+    u  = np.array(upper, dtype=np.float64, order="C", ndmin=2)
+    lo = np.array(lower, dtype=np.float64, order="C", ndmin=2)
+    c  = np.array(close, dtype=np.float64, order="C", ndmin=2)
+    st = np.full(c.shape, np.nan)
+    d  = np.full(c.shape, np.nan)
+    if c.shape[1] == 0:
+        return st, d
+
+    valid = ~(np.isnan(c) | np.isnan(u))
+    start = np.where(valid.any(axis=1), valid.argmax(axis=1), c.shape[1])
+
+    if use_jit:
+        for row, s0 in enumerate(start.tolist()):
+            if s0 < c.shape[1]:
+                _, _, st[row, s0:], d[row, s0:] = supertrend_bands(
+                    u[row, s0:], lo[row, s0:], c[row, s0:], use_jit=True,
+                )
+        return st, d
+
+    # Step through bars, vectorized across tickers (columns of the transpose)
+    u, lo, c = u.T.copy(), lo.T.copy(), c.T
+    st, d    = st.T.copy(), d.T.copy()
+    first    = start == 0
+    d[0]     = np.where(first, 1.0, np.nan)
+    st[0]    = np.where(first, lo[0], np.nan)
+    for i in range(1, c.shape[0]):
+        first = start == i
+        live  = start < i
+        keep_u = live & ~((u[i] < u[i - 1]) | (c[i - 1] > u[i - 1]))
+        keep_l = live & ~((lo[i] > lo[i - 1]) | (c[i - 1] < lo[i - 1]))
+        u[i]  = np.where(keep_u, u[i - 1],  u[i])
+        lo[i] = np.where(keep_l, lo[i - 1], lo[i])
+
+        was_upper = st[i - 1] == u[i - 1]
+        step = np.where(
+            was_upper,
+            np.where(c[i] <= u[i], -1.0, 1.0),
+            np.where(c[i] >= lo[i], 1.0, -1.0),
+        )
+        d[i]  = np.where(first, 1.0, np.where(live, step, np.nan))
+        st[i] = np.where(d[i] == 1.0, lo[i], np.where(d[i] == -1.0, u[i], np.nan))
+    return st.T.copy(), d.T.copy()
+
+
+# ── Exponential moving average (scalar state) ────────────────────────────────
+class EWMState:
+    """
+    O(1) twin of ``Series.ewm(com=..., adjust=False).mean()``.
+
+    Mirrors pandas' recurrence step for step (including its rounding and the
+    com == 1 special case), so a stream fed bar by bar lands on exactly the
+    same floats as the batch calculation.
+    """
+
+    __slots__ = ("_alpha", "_factor", "_com_one", "_min_periods", "_old_wt", "value", "nobs")
+
+    def __init__(self, com: float, min_periods: int = 0) -> None:
+        self._alpha       = 1.0 / (1.0 + com)
+        self._factor      = 1.0 - self._alpha
+        self._com_one     = com == 1
+        self._min_periods = max(min_periods, 1)
+        self._old_wt      = 1.0
+        self.value        = float("nan")
+        self.nobs         = 0
+
+    @classmethod
+    def from_span(cls, span: float, min_periods: int = 0) -> "EWMState":
+        return cls((span - 1) / 2.0, min_periods)
+
+    @classmethod
+    def from_alpha(cls, alpha: float, min_periods: int = 0) -> "EWMState":
+        return cls(1.0 / alpha - 1.0, min_periods)
+
+    def update(self, x: float) -> float:
+        is_obs = not math.isnan(x)
+        self.nobs += is_obs
+        if not math.isnan(self.value):
+            self._old_wt *= self._factor
+            new_wt = 1.0 - self._old_wt if self._com_one else self._alpha
+            if is_obs:
+                if self.value != x:
+                    self.value = (self._old_wt * self.value + new_wt * x) / (self._old_wt + new_wt)
+                self._old_wt = 1.0
+        elif is_obs:
+            self.value = x
+        return self.current
+
+    @property
+    def current(self) -> float:
+        return self.value if self.nobs >= self._min_periods else float("nan")
@@ -4,6 +4,7 @@ Extended with:
   • Signal line crossover detection
   • Histogram momentum scoring
   • Zero-line cross alerts
+  • Streaming state with O(1) per-bar updates
 """
 
 from __future__ import annotations
@@ -11,6 +12,10 @@ from __future__ import annotations
 import pandas as pd
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
+
+from .graph   import ComputeGraph, Key, ema, sub, warmup_all
+from .kernels import EWMState
 
 
 class MACDSignal(str, Enum):
@@ -45,11 +50,11 @@ class MACDIndicator:
         self.signal = signal
 
     def calculate(self, close: pd.Series) -> MACDResult:
-        ema_fast = close.ewm(span=self.fast,   adjust=False).mean()
-        ema_slow = close.ewm(span=self.slow,   adjust=False).mean()
-        macd     = ema_fast - ema_slow
-        sig      = macd.ewm(span=self.signal,  adjust=False).mean()
-        hist     = macd - sig
+        return self.evaluate(ComputeGraph(close=close))
+
+    def evaluate(self, g: ComputeGraph) -> MACDResult:
+        """``calculate`` on a shared graph (see CustomSignalEngine)."""
+        macd, sig, hist = self._from_graph(g)
 
         event = self._classify(macd, sig, hist)
         return MACDResult(
@@ -61,32 +66,101 @@ class MACDIndicator:
             last_hist = float(hist.iloc[-1]),
         )
 
+    def inputs(self) -> tuple[Key, ...]:
+        """Graph nodes: MACD line (EMA fast − EMA slow) and its signal EMA."""
+        line = sub(ema("close", self.fast), ema("close", self.slow))
+        return line, ema(line, self.signal)
+
+    def lookback(self, tol: float = 1e-6) -> Optional[int]:
+        """Bars of history for the last signal to match full history within ``tol``."""
+        return warmup_all(self.inputs(), tol) + 2                 # previous + current bar
+
+    def _lines(self, close):
+        """(macd, signal, histogram) for a Series or a (bars × tickers) DataFrame."""
+        return self._from_graph(ComputeGraph(close=close))
+
+    def _from_graph(self, g: ComputeGraph):
+        macd, sig = g.get_many(self.inputs())
+        return macd, sig, macd - sig
+
     def _classify(
         self, macd: pd.Series, sig: pd.Series, hist: pd.Series
     ) -> MACDSignal:
         if len(macd) < 2:
             return MACDSignal.NEUTRAL
 
+        return self._label(
+            float(macd.iloc[-2]), float(macd.iloc[-1]),
+            float(sig.iloc[-2]),  float(sig.iloc[-1]),
+            float(hist.iloc[-2]), float(hist.iloc[-1]),
+        )
+
+    @staticmethod
+    def _label(
+        prev_macd: float, curr_macd: float,
+        prev_sig:  float, curr_sig:  float,
+        prev_hist: float, curr_hist: float,
+    ) -> MACDSignal:
         # Signal line cross
-        prev_above = macd.iloc[-2] > sig.iloc[-2]
-        curr_above = macd.iloc[-1] > sig.iloc[-1]
+        prev_above = prev_macd > prev_sig
+        curr_above = curr_macd > curr_sig
         if not prev_above and curr_above:
             return MACDSignal.BULLISH_CROSS
         if prev_above and not curr_above:
             return MACDSignal.BEARISH_CROSS
 
         # Zero-line cross
-        prev_pos = macd.iloc[-2] > 0
-        curr_pos = macd.iloc[-1] > 0
+        prev_pos = prev_macd > 0
+        curr_pos = curr_macd > 0
         if not prev_pos and curr_pos:
             return MACDSignal.ZERO_CROSS_UP
         if prev_pos and not curr_pos:
             return MACDSignal.ZERO_CROSS_DN
 
         # Histogram momentum
-        if hist.iloc[-1] > hist.iloc[-2]:
+        if curr_hist > prev_hist:
             return MACDSignal.MOMENTUM_UP
-        if hist.iloc[-1] < hist.iloc[-2]:
+        if curr_hist < prev_hist:
             return MACDSignal.MOMENTUM_DOWN
 
         return MACDSignal.NEUTRAL
+
+    # ── Streaming ─────────────────────────────────────────────────────────────
+    def stream(self, close: Optional[pd.Series] = None) -> "MACDStream":
+        """Incremental MACD state, optionally primed with a close history."""
+        state = MACDStream(self)
+        if close is not None:
+            for c in close.to_numpy(dtype=float).tolist():
+                state.update(c)
+        return state
+
+
+class MACDStream:
+    """Bar-by-bar MACD: three EMA accumulators plus the previous bar's values."""
+
+    def __init__(self, indicator: MACDIndicator) -> None:
+        self.indicator = indicator
+        self._fast     = EWMState.from_span(indicator.fast)
+        self._slow     = EWMState.from_span(indicator.slow)
+        self._sig      = EWMState.from_span(indicator.signal)
+        self._prev     = None
+        self.last_macd = float("nan")
+        self.last_sig  = float("nan")
+        self.last_hist = float("nan")
+        self.event     = MACDSignal.NEUTRAL
+
+    def update(self, close: float) -> MACDSignal:
+        close = float(close)
+        macd  = self._fast.update(close) - self._slow.update(close)
+        sig   = self._sig.update(macd)
+        hist  = macd - sig
+
+        if self._prev is None:
+            self.event = MACDSignal.NEUTRAL
+        else:
+            pm, ps, ph = self._prev
+            self.event = MACDIndicator._label(pm, macd, ps, sig, ph, hist)
+
+        self._prev = (macd, sig, hist)
+        self.last_macd, self.last_sig, self.last_hist = macd, sig, hist
+        return self.event
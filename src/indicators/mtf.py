@@ -0,0 +1,139 @@
+"""
+ConfluenceEngine — multi-timeframe composite from one base download.
+
+The base interval (e.g. 1h) is fetched once; every higher timeframe (4h,
+D …) is resampled from it in memory (``src.utils.resample``), so all
+timeframes share the same bars and bar boundaries. ``CustomSignalEngine``
+runs on each timeframe — on a thread pool when there are several — and
+the per-timeframe scores are combined with timeframe weights into one
+score, rated with the engine's thresholds.
+
+    mtf = ConfluenceEngine(timeframes={"1h": 0.25, "4h": 0.35, "D": 0.4}, fetcher=fetcher)
+    sig = mtf.signal("AAPL")       # one 1h download → 1h, 4h and D signals
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Mapping, Optional
+
+import pandas as pd
+
+from .custom import CompositeSignal, CustomSignalEngine, _rating
+from ..utils.resample import ResampleCache, interval_seconds, resample_ohlcv
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TIMEFRAMES = {"1h": 0.25, "4h": 0.35, "D": 0.40}
+
+
+@dataclass
+class ConfluenceSignal:
+    score:   float                 # weighted mean of the timeframe scores, -1.0 to +1.0
+    rating:  str
+    base:    str
+    frames:  dict[str, CompositeSignal] = field(default_factory=dict)
+    weights: dict[str, float]          = field(default_factory=dict)
+
+    @property
+    def aligned(self) -> bool:
+        """Every timeframe points the same way as the composite."""
+        return all(f.score * self.score > 0 for f in self.frames.values())
+
+
+def parse_timeframes(spec: str) -> dict[str, float]:
+    """ "1h:0.25,4h:0.35,D" → {"1h": 0.25, "4h": 0.35, "D": 1.0} (missing weight = 1)."""
+    out: dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        tf, _, weight = part.partition(":")
+        out[tf.strip()] = float(weight) if weight else 1.0
+    return out
+
+
+class ConfluenceEngine:
+    def __init__(
+        self,
+        timeframes:  Optional[Mapping[str, float]] = None,
+        base:        str = "1h",
+        engine:      Optional[CustomSignalEngine] = None,
+        fetcher:     Any = None,
+        cache:       Optional[ResampleCache] = None,
+        max_workers: Optional[int] = None,
+        timezone:    Optional[str] = None,
+        session_start: Optional[str] = None,
+    ) -> None:
+        self.timeframes = dict(timeframes or DEFAULT_TIMEFRAMES)
+        self.base       = base
+        self.engine     = engine or CustomSignalEngine()
+        self.fetcher    = fetcher
+        self.cache      = cache if cache is not None else ResampleCache()
+        self.max_workers = max_workers or len(self.timeframes)
+        self.timezone   = timezone
+        self.session_start = session_start
+
+        step = interval_seconds(base)
+        finer = [tf for tf in self.timeframes if interval_seconds(tf) < step]
+        if finer:
+            raise ValueError(f"timeframes {finer} are finer than the base interval {base!r}")
+        if not self.timeframes or sum(self.timeframes.values()) <= 0:
+            raise ValueError("need at least one timeframe with a positive weight")
+
+    def lookback(self, volume: bool = True) -> Optional[int]:
+        """
+        Base bars the engine's lookback needs on the coarsest timeframe
+        (``None`` = full history) — counted as if the market never closed,
+        which over-asks for equities, the safe direction. ``volume=False``
+        excludes VWAP, as in ``CustomSignalEngine.lookback``.
+        """
+        bars = self.engine.lookback(volume)
+        if bars is None:
+            return None
+        ratio = max(interval_seconds(tf) for tf in self.timeframes) / interval_seconds(self.base)
+        return math.ceil(bars * ratio)
+
+    def frames(self, base: pd.DataFrame, key: Hashable = None) -> dict[str, pd.DataFrame]:
+        """OHLCV per timeframe; resamples are cached under ``key`` (e.g. the ticker)."""
+        step = interval_seconds(self.base)
+        out  = {}
+        for tf in self.timeframes:
+            if interval_seconds(tf) == step:
+                out[tf] = base
+            elif key is None:
+                out[tf] = resample_ohlcv(base, tf, self.timezone, self.session_start)
+            else:
+                out[tf] = self.cache.get(
+                    (key, self.base), base, tf, self.timezone, self.session_start,
+                )
+        return out
+
+    def run(self, base: pd.DataFrame, key: Hashable = None) -> ConfluenceSignal:
+        """Signal on every timeframe of ``base`` bars, combined by timeframe weight."""
+        frames = self.frames(base, key)
+        if self.max_workers > 1 and len(frames) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(frames))) as pool:
+                futures = {tf: pool.submit(self._run_one, df) for tf, df in frames.items()}
+                signals = {tf: fut.result() for tf, fut in futures.items()}
+        else:
+            signals = {tf: self._run_one(df) for tf, df in frames.items()}
+
+        total = sum(self.timeframes.values())
+        score = sum(signals[tf].score * w for tf, w in self.timeframes.items()) / total
+        return ConfluenceSignal(
+            score   = round(score, 4),
+            rating  = _rating(score, self.engine.thresholds),
+            base    = self.base,
+            frames  = signals,
+            weights = dict(self.timeframes),
+        )
+
+    def signal(self, ticker: str) -> ConfluenceSignal:
+        """One base download through ``fetcher``, then ``run``."""
+        if self.fetcher is None:
+            raise ValueError("ConfluenceEngine.signal needs a fetcher")
+        return self.run(self.fetcher.get(ticker, self.base), key=ticker)
+
+    def _run_one(self, df: pd.DataFrame) -> CompositeSignal:
+        return self.engine.run(df["high"], df["low"], df["close"], df.get("volume"))
@@ -4,14 +4,21 @@ Extends TradingView's built-in RSI with:
   • Multi-timeframe (MTF) aggregation
   • Divergence detection
   • Overbought / oversold signal labelling
+  • Streaming state with O(1) per-bar updates
 """
 
 from __future__ import annotations
 
+import math
 import numpy as np
 import pandas as pd
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
+from typing import Optional
+
+from .graph   import ComputeGraph, Key, gain, loss, warmup_all, wilder
+from .kernels import EWMState
 
 
 class RSISignal(str, Enum):
@@ -56,26 +63,41 @@ class RSIIndicator:
 
     # ── Core calculation ──────────────────────────────────────────────────────
     def calculate(self, close: pd.Series) -> RSIResult:
-        delta = close.diff()
-        gain  = delta.clip(lower=0)
-        loss  = (-delta).clip(lower=0)
-
-        # Wilder EMA
-        avg_gain = gain.ewm(alpha=1 / self.period, min_periods=self.period, adjust=False).mean()
-        avg_loss = loss.ewm(alpha=1 / self.period, min_periods=self.period, adjust=False).mean()
-
-        rs  = avg_gain / avg_loss.replace(0, np.nan)
-        rsi = 100 - (100 / (1 + rs))
+        return self.evaluate(ComputeGraph(close=close))
 
+    def evaluate(self, g: ComputeGraph) -> RSIResult:
+        """``calculate`` on a shared graph (see CustomSignalEngine)."""
+        close  = g["close"]
+        rsi    = self._from_graph(g)
         last   = float(rsi.iloc[-1])
         signal = self._classify(rsi, close)
         div    = self._detect_divergence(rsi, close)
 
         return RSIResult(values=rsi, signal=signal, last=last, divergence=div)
 
+    def inputs(self) -> tuple[Key, ...]:
+        """Graph nodes: Wilder-smoothed gains and losses."""
+        return wilder(gain("close"), self.period), wilder(loss("close"), self.period)
+
+    def lookback(self, tol: float = 1e-6) -> Optional[int]:
+        """Bars of history for the last signal to match full history within ``tol``."""
+        n = self.div_lookback
+        return max(warmup_all(self.inputs(), tol) + n, 2 * n)     # RSI at -n for divergence
+
+    def _values(self, close):
+        """RSI for a Series, or column-wise for a (bars × tickers) DataFrame."""
+        return self._from_graph(ComputeGraph(close=close))
+
+    def _from_graph(self, g: ComputeGraph):
+        avg_gain, avg_loss = g.get_many(self.inputs())
+        rs = avg_gain / avg_loss.replace(0, np.nan)
+        return 100 - (100 / (1 + rs))
+
     # ── Signal classification ─────────────────────────────────────────────────
     def _classify(self, rsi: pd.Series, _close: pd.Series) -> RSISignal:
-        last = float(rsi.iloc[-1])
+        return self._label(float(rsi.iloc[-1]))
+
+    def _label(self, last: float) -> RSISignal:
         if last >= self.ob:
             return RSISignal.OVERBOUGHT
         if last <= self.os_:
@@ -97,3 +119,61 @@ class RSIIndicator:
     def mtf(self, frames: dict[str, pd.Series]) -> dict[str, RSIResult]:
         """Run RSI on multiple timeframes. frames = {'1h': series, '4h': series, ...}"""
         return {tf: self.calculate(s) for tf, s in frames.items()}
+
+    # ── Streaming ─────────────────────────────────────────────────────────────
+    def stream(self, close: Optional[pd.Series] = None) -> "RSIStream":
+        """Incremental RSI state, optionally primed with a close history."""
+        state = RSIStream(self)
+        if close is not None:
+            for c in close.to_numpy(dtype=float).tolist():
+                state.update(c)
+        return state
+
+
+class RSIStream:
+    """
+    Bar-by-bar RSI with the same Wilder accumulators as ``calculate``.
+
+    ``update(close)`` is O(1) and returns the signal for the new bar;
+    ``last`` / ``divergence`` reflect the bar just added.
+    """
+
+    def __init__(self, indicator: RSIIndicator) -> None:
+        self.indicator   = indicator
+        self._avg_gain   = EWMState.from_alpha(1 / indicator.period, min_periods=indicator.period)
+        self._avg_loss   = EWMState.from_alpha(1 / indicator.period, min_periods=indicator.period)
+        self._prev_close = float("nan")
+        self._rsi_hist   = deque(maxlen=indicator.div_lookback)
+        self._close_hist = deque(maxlen=indicator.div_lookback)
+        self.bars        = 0
+        self.last        = float("nan")
+        self.signal      = RSISignal.NEUTRAL
+        self.divergence  = False
+
+    def update(self, close: float) -> RSISignal:
+        close = float(close)
+        delta = close - self._prev_close
+        gain  = delta if math.isnan(delta) else max(delta, 0.0)
+        loss  = delta if math.isnan(delta) else max(-delta, 0.0)
+        avg_gain = self._avg_gain.update(gain)
+        avg_loss = self._avg_loss.update(loss)
+
+        rs = avg_gain / avg_loss if avg_loss != 0 else float("nan")
+        self.last = 100 - (100 / (1 + rs))
+
+        self._prev_close = close
+        self._rsi_hist.append(self.last)
+        self._close_hist.append(close)
+        self.bars += 1
+
+        self.signal     = self.indicator._label(self.last)
+        self.divergence = self._divergence()
+        return self.signal
+
+    def _divergence(self) -> bool:
+        n = self.indicator.div_lookback
+        if self.bars < n * 2:
+            return False
+        c_now, c_then = self._close_hist[-1], self._close_hist[0]
+        r_now, r_then = self._rsi_hist[-1],   self._rsi_hist[0]
+        return (c_now > c_then and r_now < r_then) or (c_now < c_then and r_now > r_then)
@@ -4,6 +4,7 @@ Extended with:
   • Direction flip detection
   • Trend strength scoring
   • Support / resistance level tracking
+  • Streaming state with O(1) per-bar updates
 """
 
 from __future__ import annotations
@@ -12,6 +13,10 @@ import numpy as np
 import pandas as pd
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
+
+from .graph   import ComputeGraph, Key, ema, hl2, true_range, warmup_all
+from .kernels import EWMState, supertrend_bands
 
 
 class STSignal(str, Enum):
@@ -32,54 +37,32 @@ class STResult:
 
 
 class SuperTrend:
-    def __init__(self, period: int = 10, multiplier: float = 3.0) -> None:
+    def __init__(self, period: int = 10, multiplier: float = 3.0, settle: int = 10) -> None:
         self.period     = period
         self.multiplier = multiplier
+        self.settle     = settle        # periods of band history kept when trimming (see lookback)
 
     def calculate(
         self, high: pd.Series, low: pd.Series, close: pd.Series
     ) -> STResult:
-        hl2  = (high + low) / 2
-        atr  = self._atr(high, low, close)
-
-        upper_band = hl2 + self.multiplier * atr
-        lower_band = hl2 - self.multiplier * atr
-
-        # Smooth bands
-        for i in range(1, len(upper_band)):
-            upper_band.iloc[i] = (
-                upper_band.iloc[i]
-                if upper_band.iloc[i] < upper_band.iloc[i - 1]
-                or close.iloc[i - 1] > upper_band.iloc[i - 1]
-                else upper_band.iloc[i - 1]
-            )
-            lower_band.iloc[i] = (
-                lower_band.iloc[i]
-                if lower_band.iloc[i] > lower_band.iloc[i - 1]
-                or close.iloc[i - 1] < lower_band.iloc[i - 1]
-                else lower_band.iloc[i - 1]
-            )
-
-        direction = pd.Series(index=close.index, dtype=float)
-        st        = pd.Series(index=close.index, dtype=float)
-
-        for i in range(len(close)):
-            if i == 0:
-                direction.iloc[i] = 1
-                st.iloc[i]        = lower_band.iloc[i]
-                continue
-            prev_st   = st.iloc[i - 1]
-            prev_dir  = direction.iloc[i - 1]
-            curr_close = close.iloc[i]
-
-            if prev_st == upper_band.iloc[i - 1]:
-                direction.iloc[i] = -1 if curr_close <= upper_band.iloc[i] else 1
-            else:
-                direction.iloc[i] = 1  if curr_close >= lower_band.iloc[i] else -1
+        return self.evaluate(ComputeGraph(high=high, low=low, close=close))
+
+    def evaluate(self, g: ComputeGraph) -> STResult:
+        """``calculate`` on a shared graph (see CustomSignalEngine)."""
+        close    = g["close"]
+        mid, atr = g.get_many(self.inputs())
 
-            st.iloc[i] = (
-                lower_band.iloc[i] if direction.iloc[i] == 1 else upper_band.iloc[i]
-            )
+        upper_band = mid + self.multiplier * atr
+        lower_band = mid - self.multiplier * atr
+
+        # Smooth bands + direction on contiguous float64 buffers
+        _, _, st_arr, dir_arr = supertrend_bands(
+            upper_band.to_numpy(dtype=np.float64),
+            lower_band.to_numpy(dtype=np.float64),
+            close.to_numpy(dtype=np.float64),
+        )
+        direction = pd.Series(dir_arr, index=close.index)
+        st        = pd.Series(st_arr,  index=close.index)
 
         curr_dir  = int(direction.iloc[-1])
         prev_dir  = int(direction.iloc[-2]) if len(direction) >= 2 else curr_dir
@@ -87,15 +70,7 @@ class SuperTrend:
         last_st   = float(st.iloc[-1])
         last_c    = float(close.iloc[-1])
 
-        if prev_dir == -1 and curr_dir == 1:
-            signal = STSignal.BUY_SIGNAL
-        elif prev_dir == 1 and curr_dir == -1:
-            signal = STSignal.SELL_SIGNAL
-        elif curr_dir == 1:
-            signal = STSignal.BULLISH
-        else:
-            signal = STSignal.BEARISH
-
+        signal   = self._label(prev_dir, curr_dir)
         strength = min(1.0, abs(last_c - last_st) / (last_atr + 1e-9))
 
         return STResult(
@@ -107,10 +82,112 @@ class SuperTrend:
             strength   = strength,
         )
 
+    def inputs(self) -> tuple[Key, ...]:
+        """Graph nodes: hl2 and ATR (EMA of true range)."""
+        return hl2(), ema(true_range(), self.period)
+
+    def lookback(self, tol: float = 1e-6) -> Optional[int]:
+        """
+        Bars of history for the last signal to match full history within ``tol``.
+
+        The ATR converges geometrically, but the band ratchet is path-dependent
+        and has no strict bound; ``settle`` periods after ATR convergence is a
+        heuristic that holds in practice — verify with the engine's strict mode.
+        """
+        return warmup_all(self.inputs(), tol) + self.settle * self.period + 2
+
     def _atr(self, high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
-        tr = pd.concat([
-            high - low,
-            (high - close.shift()).abs(),
-            (low  - close.shift()).abs(),
-        ], axis=1).max(axis=1)
-        return tr.ewm(span=self.period, adjust=False).mean()
+        return ComputeGraph(high=high, low=low, close=close)[ema(true_range(), self.period)]
+
+    @staticmethod
+    def _label(prev_dir: int, curr_dir: int) -> STSignal:
+        if prev_dir == -1 and curr_dir == 1:
+            return STSignal.BUY_SIGNAL
+        if prev_dir == 1 and curr_dir == -1:
+            return STSignal.SELL_SIGNAL
+        if curr_dir == 1:
+            return STSignal.BULLISH
+        return STSignal.BEARISH
+
+    # ── Streaming ─────────────────────────────────────────────────────────────
+    def stream(
+        self,
+        high:  Optional[pd.Series] = None,
+        low:   Optional[pd.Series] = None,
+        close: Optional[pd.Series] = None,
+    ) -> "STStream":
+        """Incremental SuperTrend state, optionally primed with an HLC history."""
+        state = STStream(self)
+        if close is not None:
+            for h, l, c in zip(
+                high.to_numpy(dtype=float).tolist(),
+                low.to_numpy(dtype=float).tolist(),
+                close.to_numpy(dtype=float).tolist(),
+            ):
+                state.update(h, l, c)
+        return state
+
+
+class STStream:
+    """
+    Bar-by-bar SuperTrend: ATR accumulator plus the smoothed band state.
+
+    Reproduces ``SuperTrend.calculate`` exactly — same ATR recurrence, same
+    band smoothing and direction rules.
+    """
+
+    def __init__(self, indicator: SuperTrend) -> None:
+        self.indicator  = indicator
+        self._atr       = EWMState.from_span(indicator.period)
+        self._prev_c    = None
+        self._upper     = float("nan")
+        self._lower     = float("nan")
+        self.supertrend = float("nan")
+        self.direction  = 0
+        self.atr        = float("nan")
+        self.strength   = 0.0
+        self.signal     = STSignal.BULLISH
+
+    def update(self, high: float, low: float, close: float) -> STSignal:
+        high, low, close = float(high), float(low), float(close)
+        mult = self.indicator.multiplier
+        prev_c = self._prev_c
+
+        if prev_c is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - prev_c), abs(low - prev_c))
+        atr = self._atr.update(tr)
+
+        hl2   = (high + low) / 2
+        upper = hl2 + mult * atr
+        lower = hl2 - mult * atr
+
+        if prev_c is None:
+            curr_dir = prev_dir = 1
+            st = lower
+        else:
+            if not (upper < self._upper or prev_c > self._upper):
+                upper = self._upper
+            if not (lower > self._lower or prev_c < self._lower):
+                lower = self._lower
+            prev_dir = self.direction
+            if self.supertrend == self._upper:
+                curr_dir = -1 if close <= upper else 1
+            else:
+                curr_dir = 1 if close >= lower else -1
+            st = lower if curr_dir == 1 else upper
+
+        self._prev_c, self._upper, self._lower = close, upper, lower
+        self.supertrend, self.direction, self.atr = st, curr_dir, atr
+        self.strength = min(1.0, abs(close - st) / (atr + 1e-9))
+        self.signal   = SuperTrend._label(prev_dir, curr_dir)
+        return self.signal
+
+    @property
+    def support(self) -> float:
+        return self.supertrend if self.direction == 1 else float("nan")
+
+    @property
+    def resistance(self) -> float:
+        return self.supertrend if self.direction == -1 else float("nan")
@@ -2,16 +2,32 @@
 VWAP — Volume Weighted Average Price
 Extended with:
   • Standard deviation bands (1σ, 2σ, 3σ)
-  • Anchored VWAP (from any custom start date)
-  • Session-aware reset (daily / weekly)
+  • Anchored VWAP (from any custom start date); ``anchored_many`` computes
+    dozens of anchors from one set of prefix sums, anchors resolved by
+    timestamp with a binary search
+  • Session-aware reset (daily / weekly / any pandas frequency) in the
+    exchange timezone, via segmented cumulative sums — no loop over sessions
+  • Streaming state with O(1) per-bar updates
 """
 
 from __future__ import annotations
 
+import math
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
 from enum import Enum
+from typing import Any, Optional, Sequence, Union
+
+from .graph import (
+    ComputeGraph, Key, cumsum, segmented_cumsum, session_cumsum, session_ids,
+    session_keys, session_span, sessions, typical_price, warmup_all,
+)
+
+Anchor = Union[int, str, pd.Timestamp, np.datetime64, Any]      # bar position or timestamp
+
+# session_reset aliases; anything else is passed to pandas as a frequency ("4h", "W-FRI", "M")
+_SESSIONS = {True: "D", "daily": "D", "weekly": "W", "monthly": "M"}
 
 
 class VWAPSignal(str, Enum):
@@ -34,11 +50,59 @@ class VWAPResult:
     lower_2:  pd.Series    # VWAP - 2σ
     signal:   VWAPSignal
     last:     float
+    upper_3:  Optional[pd.Series] = None    # VWAP + 3σ (bands=3)
+    lower_3:  Optional[pd.Series] = None    # VWAP - 3σ
+
+
+@dataclass
+class AnchoredVWAPs:
+    """One row per anchor, one column per bar; NaN before each anchor."""
+    vwap:    np.ndarray    # (anchors × bars)
+    std:     np.ndarray    # (anchors × bars) volume-weighted σ about each VWAP
+    anchors: np.ndarray    # bar position of each anchor
+    index:   pd.Index
+
+    def upper(self, k: float = 1) -> np.ndarray:
+        return self.vwap + k * self.std
+
+    def lower(self, k: float = 1) -> np.ndarray:
+        return self.vwap - k * self.std
+
+    @property
+    def last(self) -> np.ndarray:
+        return self.vwap[:, -1]
 
 
 class VWAPIndicator:
-    def __init__(self, session_reset: bool = True) -> None:
+    def __init__(
+        self,
+        session_reset: bool | str = True,          # True/"daily", "weekly", "monthly", freq; False
+        timezone:      Optional[str] = None,       # exchange tz; None keeps the index's own
+        session_start: Optional[str] = None,       # local session open ("18:00"); None = midnight
+        bands:         int = 2,                    # 3 also emits the 3σ bands
+    ) -> None:
         self.session_reset = session_reset
+        self.timezone      = timezone
+        self.session_start = session_start
+        self.bands         = bands
+
+    @property
+    def session(self) -> Optional[str]:
+        """pandas frequency of the session reset, or None for cumulative VWAP."""
+        reset = self.session_reset
+        if not reset:
+            return None
+        return _SESSIONS.get(reset.lower() if isinstance(reset, str) else reset, reset)
+
+    @property
+    def session_span(self) -> Optional[pd.Timedelta]:
+        """Wall-clock length of the longest session, or None for cumulative VWAP."""
+        return session_span(self.session) if self.session is not None else None
+
+    @property
+    def _calendar(self) -> tuple[Optional[str], Optional[str], Optional[str]]:
+        """(session freq, timezone, session start) — the arguments of every session helper."""
+        return self.session, self.timezone, self.session_start
 
     def calculate(
         self,
@@ -47,14 +111,12 @@ class VWAPIndicator:
         close:  pd.Series,
         volume: pd.Series,
     ) -> VWAPResult:
-        tp       = (high + low + close) / 3
-        cum_vol  = volume.cumsum()
-        cum_tpv  = (tp * volume).cumsum()
-        vwap     = cum_tpv / cum_vol
+        return self.evaluate(ComputeGraph(high=high, low=low, close=close, volume=volume))
 
-        # Rolling deviation from VWAP
-        squared_diff = ((tp - vwap) ** 2 * volume).cumsum() / cum_vol
-        std = np.sqrt(squared_diff)
+    def evaluate(self, g: ComputeGraph) -> VWAPResult:
+        """``calculate`` on a shared graph (see CustomSignalEngine)."""
+        close     = g["close"]
+        vwap, std = self._from_graph(g)
 
         upper_1 = vwap + 1 * std
         lower_1 = vwap - 1 * std
@@ -63,22 +125,107 @@ class VWAPIndicator:
 
         signal = self._classify(close, vwap, upper_1, lower_1, upper_2, lower_2)
 
-        return VWAPResult(
+        result = VWAPResult(
             vwap=vwap, upper_1=upper_1, lower_1=lower_1,
             upper_2=upper_2, lower_2=lower_2,
             signal=signal, last=float(vwap.iloc[-1]),
         )
+        if self.bands >= 3:
+            result.upper_3 = vwap + 3 * std
+            result.lower_3 = vwap - 3 * std
+        return result
+
+    def inputs(self) -> tuple[Key, ...]:
+        """Graph nodes: typical price and (session) cumulative volume."""
+        if self.session is None:
+            return typical_price(), cumsum("volume")
+        return typical_price(), session_cumsum("volume", *self._calendar)
+
+    def lookback(self, tol: float = 1e-6, index: Optional[pd.Index] = None) -> Optional[int]:
+        """
+        Cumulative VWAP depends on all history — ``None``. With a session
+        reset the answer depends on the data: given the bars' ``index``, the
+        bars since the session of the second-to-last bar opened (the signal
+        compares the last two bars). Without an index, ``session_span`` bounds
+        it in wall-clock time instead.
+        """
+        if self.session is None or index is None:
+            return warmup_all(self.inputs(), tol)
+        ids = session_ids(index, *self._calendar)
+        if ids is None:
+            return None
+        start = int(np.searchsorted(ids, ids[-2]))
+        # the tail must itself contain a multi-bar session, or it would not reset
+        same  = np.flatnonzero(ids[start + 1:] == ids[start:-1])
+        if not len(same):
+            start = int(np.searchsorted(ids, ids[np.flatnonzero(ids[1:] == ids[:-1])[-1]]))
+        return len(ids) - start
+
+    def _vwap_std(self, high, low, close, volume):
+        """Cumulative VWAP and its σ for Series or (bars × tickers) DataFrames."""
+        return self._from_graph(ComputeGraph(high=high, low=low, close=close, volume=volume))
+
+    def _from_graph(self, g: ComputeGraph):
+        volume       = g["volume"]
+        tp, cum_vol  = g.get_many(self.inputs())
+        ids          = g[sessions(*self._calendar)] if self.session else None
+        cum_tpv      = segmented_cumsum(tp * volume, ids)
+        vwap         = cum_tpv / cum_vol
+
+        # Rolling deviation from VWAP
+        squared_diff = segmented_cumsum((tp - vwap) ** 2 * volume, ids) / cum_vol
+        return vwap, np.sqrt(squared_diff)
+
+    def session_key(self, ts: Any) -> Optional[int]:
+        """Session of one timestamp (for streaming); None without a reset."""
+        if self.session is None or ts is None:
+            return None
+        return int(session_keys(pd.DatetimeIndex([ts]), *self._calendar)[0])
 
     def anchored(
         self,
         high: pd.Series, low: pd.Series,
         close: pd.Series, volume: pd.Series,
-        anchor_idx: int = 0,
+        anchor_idx: Anchor = 0,
     ) -> VWAPResult:
-        return self.calculate(
-            high.iloc[anchor_idx:], low.iloc[anchor_idx:],
-            close.iloc[anchor_idx:], volume.iloc[anchor_idx:],
-        )
+        """VWAP accumulated from one anchor (bar position or timestamp) — never session-reset."""
+        i = int(resolve_anchors(close.index, [anchor_idx])[0])
+        cumulative = VWAPIndicator(session_reset=False, bands=self.bands)
+        return cumulative.calculate(high.iloc[i:], low.iloc[i:], close.iloc[i:], volume.iloc[i:])
+
+    def anchored_many(
+        self,
+        high: pd.Series, low: pd.Series,
+        close: pd.Series, volume: pd.Series,
+        anchors: Sequence[Anchor],
+    ) -> AnchoredVWAPs:
+        """
+        Every anchored VWAP and its σ from one pass of prefix sums of volume,
+        price·volume and price²·volume: for anchor a and bar t the window sums
+        are P[t] - P[a-1], so k anchors cost O(n + k·n) instead of k full
+        recalculations. σ is the volume-weighted deviation about the current
+        VWAP (√(Σv·tp²/Σv − vwap²), as TradingView draws anchored bands).
+        """
+        pos = resolve_anchors(close.index, anchors)
+        tp  = ((high + low + close) / 3).to_numpy(dtype=float)
+        v   = volume.to_numpy(dtype=float)
+        # centre prices: keeps E[x²] − E[x]² well-conditioned
+        tp0 = float(np.nanmean(tp)) if len(tp) else 0.0
+        x   = tp - tp0
+
+        def prefix(a: np.ndarray) -> np.ndarray:
+            return np.concatenate(([0.0], np.cumsum(a)))
+
+        pv, pxv, px2v = prefix(v), prefix(x * v), prefix(x * x * v)
+        start = pos[:, None]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vol   = pv[None, 1:]   - pv[start]
+            mean  = (pxv[None, 1:]  - pxv[start])  / vol
+            var   = (px2v[None, 1:] - px2v[start]) / vol - mean * mean
+        before = np.arange(len(tp))[None, :] < start
+        vwap = np.where(before, np.nan, mean + tp0)
+        std  = np.where(before, np.nan, np.sqrt(np.clip(var, 0.0, None)))
+        return AnchoredVWAPs(vwap=vwap, std=std, anchors=pos, index=close.index)
 
     def _classify(
         self, close, vwap, u1, l1, u2, l2
@@ -86,25 +233,160 @@ class VWAPIndicator:
         if len(close) < 2:
             return VWAPSignal.ABOVE_VWAP
 
-        last_c  = float(close.iloc[-1])
-        prev_c  = float(close.iloc[-2])
-        last_v  = float(vwap.iloc[-1])
-        prev_v  = float(vwap.iloc[-2])
-        last_u1 = float(u1.iloc[-1])
-        last_l1 = float(l1.iloc[-1])
-        last_u2 = float(u2.iloc[-1])
-        last_l2 = float(l2.iloc[-1])
+        return self._label(
+            last_c = float(close.iloc[-1]), prev_c = float(close.iloc[-2]),
+            last_v = float(vwap.iloc[-1]),  prev_v = float(vwap.iloc[-2]),
+            u1 = float(u1.iloc[-1]), l1 = float(l1.iloc[-1]),
+            u2 = float(u2.iloc[-1]), l2 = float(l2.iloc[-1]),
+        )
 
+    @staticmethod
+    def _label(
+        last_c: float, prev_c: float,
+        last_v: float, prev_v: float,
+        u1: float, l1: float, u2: float, l2: float,
+    ) -> VWAPSignal:
         if prev_c < prev_v and last_c >= last_v:
             return VWAPSignal.CROSS_UP
         if prev_c > prev_v and last_c <= last_v:
             return VWAPSignal.CROSS_DOWN
-        if last_c >= last_u2:
+        if last_c >= u2:
             return VWAPSignal.AT_2SD_UP
-        if last_c <= last_l2:
+        if last_c <= l2:
             return VWAPSignal.AT_2SD_DOWN
-        if last_c >= last_u1:
+        if last_c >= u1:
             return VWAPSignal.AT_1SD_UP
-        if last_c <= last_l1:
+        if last_c <= l1:
             return VWAPSignal.AT_1SD_DOWN
         return VWAPSignal.ABOVE_VWAP if last_c >= last_v else VWAPSignal.BELOW_VWAP
+
+    # ── Streaming ─────────────────────────────────────────────────────────────
+    def stream(
+        self,
+        high:   Optional[pd.Series] = None,
+        low:    Optional[pd.Series] = None,
+        close:  Optional[pd.Series] = None,
+        volume: Optional[pd.Series] = None,
+    ) -> "VWAPStream":
+        """Incremental VWAP state, optionally primed with HLCV history (dated by its index)."""
+        state = VWAPStream(self)
+        if close is not None:
+            stamps = _stamps(close)
+            for h, l, c, v, ts in zip(
+                high.to_numpy(dtype=float).tolist(),
+                low.to_numpy(dtype=float).tolist(),
+                close.to_numpy(dtype=float).tolist(),
+                volume.to_numpy(dtype=float).tolist(),
+                stamps,
+            ):
+                state.update(h, l, c, v, ts)
+        return state
+
+
+def resolve_anchors(index: pd.Index, anchors: Sequence[Anchor]) -> np.ndarray:
+    """
+    Bar positions of ``anchors``: ints are positions (negative from the end),
+    anything else a timestamp, mapped to the first bar at or after it with
+    one binary search over the (sorted) DatetimeIndex.
+    """
+    n   = len(index)
+    out = np.empty(len(anchors), dtype=np.int64)
+    is_pos = np.array(
+        [isinstance(a, (int, np.integer)) and not isinstance(a, bool) for a in anchors], dtype=bool,
+    )
+    if is_pos.any():
+        p = np.array([a for a, ok in zip(anchors, is_pos) if ok], dtype=np.int64)
+        out[is_pos] = np.where(p < 0, p + n, p)
+    if (~is_pos).any():
+        if not isinstance(index, pd.DatetimeIndex):
+            raise ValueError("timestamp anchors need a DatetimeIndex")
+        stamps = pd.DatetimeIndex([a for a, ok in zip(anchors, is_pos) if not ok])
+        if index.tz is not None and stamps.tz is None:
+            stamps = stamps.tz_localize(index.tz)
+        elif index.tz is None and stamps.tz is not None:
+            stamps = stamps.tz_localize(None)
+        out[~is_pos] = index.searchsorted(stamps, side="left")
+    bad = (out < 0) | (out >= n)
+    if bad.any():
+        raise ValueError(f"anchors outside the {n} bars: {[a for a, b in zip(anchors, bad) if b]}")
+    return out
+
+
+def _stamps(series: pd.Series | pd.DataFrame) -> Sequence[Any]:
+    """Open time of every bar for streaming updates — None each without a DatetimeIndex."""
+    index = series.index
+    return index if isinstance(index, pd.DatetimeIndex) else [None] * len(index)
+
+
+class VWAPStream:
+    """
+    Bar-by-bar VWAP: running volume, price·volume and deviation sums.
+
+    With a session reset the sums restart whenever a bar's timestamp opens a
+    new session. Like ``calculate``, a history in which every bar is its own
+    session (daily bars, daily reset) accumulates over all bars instead, so
+    whole-history sums are kept until a session holds two bars; from that bar
+    on the output matches a batch ``calculate`` over the same prefix.
+    """
+
+    def __init__(self, indicator: VWAPIndicator) -> None:
+        self.indicator = indicator
+        self._cum      = [0.0, 0.0, 0.0]      # volume, price·volume, squared deviation·volume
+        self._sess     = [0.0, 0.0, 0.0]      # the same, since the session opened
+        self._session  = None
+        self._multi    = False                # a session has held more than one bar
+        self._prev     = None
+        self.bars      = 0
+        self.vwap      = float("nan")
+        self.std       = float("nan")
+        self.signal    = VWAPSignal.ABOVE_VWAP
+
+    def update(
+        self,
+        high: float, low: float, close: float, volume: float,
+        ts: Any = None,
+    ) -> VWAPSignal:
+        close, volume = float(close), float(volume)
+        tp = (float(high) + float(low) + close) / 3
+
+        key   = self.indicator.session_key(ts)
+        split = False
+        if key is not None:
+            if key != self._session:
+                self._session = key
+                self._sess    = [0.0, 0.0, 0.0]
+            elif self.bars:
+                split       = not self._multi
+                self._multi = True
+        sess_v, std = self._advance(self._sess, tp, volume)
+        vwap        = sess_v
+        if not self._multi:
+            vwap, std = self._advance(self._cum, tp, volume)
+        self.bars += 1
+
+        if self._prev is None:
+            self.signal = VWAPSignal.ABOVE_VWAP
+        else:
+            # On the bar that first shares a session, batch segments the whole
+            # prefix, so the previous VWAP is that bar's own session value.
+            prev_c, prev_v, prev_sess = self._prev
+            if split:
+                prev_v = prev_sess
+            self.signal = VWAPIndicator._label(
+                last_c=close, prev_c=prev_c, last_v=vwap, prev_v=prev_v,
+                u1=vwap + std, l1=vwap - std, u2=vwap + 2 * std, l2=vwap - 2 * std,
+            )
+
+        self._prev = (close, vwap, sess_v)
+        self.vwap, self.std = vwap, std
+        return self.signal
+
+    @staticmethod
+    def _advance(sums: list[float], tp: float, volume: float) -> tuple[float, float]:
+        sums[0] += volume
+        sums[1] += tp * volume
+        vwap = sums[1] / sums[0] if sums[0] else float("nan")
+        dev  = tp - vwap
+        sums[2] += dev * dev * volume
+        std  = math.sqrt(sums[2] / sums[0]) if sums[0] else float("nan")
+        return vwap, std
@@ -0,0 +1,4 @@
+"""Watchlist scans — ranked composite signals for many tickers."""
+from .scanner import ScanReport, ScanRow, read_watchlist, scan
+
+__all__ = ["ScanReport", "ScanRow", "read_watchlist", "scan"]
@@ -0,0 +1,251 @@
+"""
+Watchlist scanner — composite signals for many tickers, ranked by score.
+
+Fetching is I/O-bound: live scans pull bars through one shared DataFetcher
+(cache, bar store, single-flight) on a bounded thread pool and hand each
+frame to the compute pool as soon as it arrives. The indicator work is
+CPU-bound and runs on a process pool. Offline sources — deterministic
+synthetic bars or a local BarStore — are read inside the workers, so only
+the small result rows cross the process boundary.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed,
+)
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from ..backtest.runner import load_bars
+from ..indicators.custom import CustomSignalEngine
+from ..utils.data_fetcher import DataFetcher
+
+log = logging.getLogger(__name__)
+
+SOURCES = ("live", "store", "synthetic")
+
+
+@dataclass
+class ScanRow:
+    ticker:      str
+    rating:      str = ""
+    score:       float = float("nan")
+    rsi_signal:  str = ""
+    macd_signal: str = ""
+    bb_signal:   str = ""
+    st_signal:   str = ""
+    vwap_signal: str = ""
+    bars:        int = 0
+    last_bar:    str = ""           # ISO timestamp of the newest bar
+    error:       str = ""
+
+
+@dataclass
+class ScanReport:
+    interval:  str
+    rows:      list[ScanRow]        # best score first; failed tickers last
+    wall_s:    float
+    fetch_s:   float                # summed over tickers (threads or workers)
+    compute_s: float                # summed over tickers (workers)
+    processes: int
+    source:    str = "live"
+
+    @property
+    def ok(self) -> list[ScanRow]:
+        return [r for r in self.rows if not r.error]
+
+    def table(self) -> pd.DataFrame:
+        if not self.rows:
+            return pd.DataFrame()
+        return pd.DataFrame([asdict(r) for r in self.rows]).set_index("ticker")
+
+    def throughput(self) -> dict[str, float]:
+        """Tickers / bars per second of wall time, and per busy second of each stage."""
+        n    = len(self.rows)
+        bars = sum(r.bars for r in self.rows)
+
+        def rate(count: int, secs: float) -> float:
+            return count / secs if secs > 0 else float("nan")
+
+        return {
+            "tickers_per_s":         rate(n, self.wall_s),
+            "bars_per_s":            rate(bars, self.wall_s),
+            "fetch_tickers_per_s":   rate(n, self.fetch_s),
+            "compute_tickers_per_s": rate(n, self.compute_s),
+        }
+
+    def write(self, path: str | Path) -> None:
+        """Sorted table as CSV, or JSON (records) for a ``.json`` path."""
+        path  = Path(path)
+        table = self.table().reset_index()
+        if path.suffix.lower() == ".json":
+            path.write_text(table.to_json(orient="records", indent=2) + "\n")
+        else:
+            table.to_csv(path, index=False)
+
+
+def read_watchlist(path: str | Path) -> list[str]:
+    """Tickers from a text file: whitespace/comma separated, ``#`` comments, duplicates dropped."""
+    seen: dict[str, None] = {}
+    for line in Path(path).read_text().splitlines():
+        for ticker in line.split("#", 1)[0].replace(",", " ").split():
+            seen.setdefault(ticker.upper(), None)
+    return list(seen)
+
+
+# ── Worker side ───────────────────────────────────────────────────────────────
+_ENGINE: Optional[CustomSignalEngine] = None
+
+
+def _init_worker(engine: CustomSignalEngine) -> None:
+    global _ENGINE
+    _ENGINE = engine
+
+
+def _evaluate(ticker: str, df: pd.DataFrame) -> ScanRow:
+    sig  = _ENGINE.run(df["high"], df["low"], df["close"], df.get("volume"))
+    last = df.index[-1]
+    return ScanRow(
+        ticker      = ticker,
+        rating      = sig.rating,
+        score       = sig.score,
+        rsi_signal  = sig.rsi_signal,
+        macd_signal = sig.macd_signal,
+        bb_signal   = sig.bb_signal,
+        st_signal   = sig.st_signal,
+        vwap_signal = sig.vwap_signal,
+        bars        = len(df),
+        last_bar    = last.isoformat() if isinstance(last, pd.Timestamp) else str(last),
+    )
+
+
+def _scan_frame(ticker: str, df: pd.DataFrame) -> tuple[ScanRow, float]:
+    t0 = time.perf_counter()
+    try:
+        row = _evaluate(ticker, df)
+    except Exception as exc:                     # one bad series must not sink the scan
+        row = ScanRow(ticker, error=f"{type(exc).__name__}: {exc}")
+    return row, time.perf_counter() - t0
+
+
+def _scan_offline(
+    ticker: str, interval: str, store_dir: Optional[str], bars: int,
+) -> tuple[ScanRow, float, float]:
+    t0 = time.perf_counter()
+    try:
+        df = load_bars(ticker, interval, store_dir, bars)
+    except LookupError as exc:
+        return ScanRow(ticker, error=str(exc)), time.perf_counter() - t0, 0.0
+    loaded = time.perf_counter()
+    row, compute_s = _scan_frame(ticker, df)
+    return row, loaded - t0, compute_s
+
+
+# ── Driver ────────────────────────────────────────────────────────────────────
+def scan(
+    tickers:       Iterable[str],
+    interval:      str = "1h",
+    engine:        Optional[CustomSignalEngine] = None,
+    source:        str = "live",
+    fetcher:       Optional[DataFetcher] = None,
+    store_dir:     Optional[str] = None,
+    processes:     Optional[int] = None,
+    fetch_workers: int = 8,
+    bars:          int = 500,
+) -> ScanReport:
+    """
+    Composite signal for every ticker, best score first. ``source`` is
+    "live" (``fetcher``, at most ``fetch_workers`` downloads in flight),
+    "store" (``store_dir`` only, never downloads) or "synthetic" (``bars``
+    bars per ticker). ``processes`` = compute pool size (None = CPU count,
+    1 = in this process). A live fetcher should be built with
+    ``fallback_synthetic=False`` (the default one is) so a failed download
+    becomes an error row instead of a rating from random bars.
+    """
+    if source not in SOURCES:
+        raise ValueError(f"source must be one of {SOURCES}, got {source!r}")
+    if source == "store" and not store_dir:
+        raise ValueError("source='store' needs a store_dir")
+    tickers   = list(dict.fromkeys(tickers))
+    engine    = engine or CustomSignalEngine()
+    processes = processes or os.cpu_count() or 1
+
+    t0 = time.perf_counter()
+    if processes == 1:
+        _init_worker(engine)
+        pool: Executor = ThreadPoolExecutor(max_workers=1)      # same code path, no process hop
+    else:
+        pool = ProcessPoolExecutor(
+            max_workers=processes, initializer=_init_worker, initargs=(engine,),
+        )
+    with pool:
+        if source == "live":
+            rows, fetch_s, compute_s = _scan_live(
+                pool, tickers, interval, fetcher or DataFetcher(fallback_synthetic=False),
+                fetch_workers,
+            )
+        else:
+            rows, fetch_s, compute_s = _scan_stored(
+                pool, tickers, interval, store_dir if source == "store" else None, bars,
+            )
+    wall_s = time.perf_counter() - t0
+
+    # errors last, then by score (NaN last), then by ticker
+    rows.sort(key=lambda r: (
+        bool(r.error), -r.score if r.score == r.score else float("inf"), r.ticker,
+    ))
+    for r in rows:
+        if r.error:
+            log.warning("Scan skipped %s: %s", r.ticker, r.error)
+    return ScanReport(interval, rows, wall_s, fetch_s, compute_s, processes, source)
+
+
+def _scan_stored(
+    pool: Executor, tickers: list[str], interval: str, store_dir: Optional[str], bars: int,
+) -> tuple[list[ScanRow], float, float]:
+    futures = [pool.submit(_scan_offline, t, interval, store_dir, bars) for t in tickers]
+    rows, fetch_s, compute_s = [], 0.0, 0.0
+    for fut in as_completed(futures):
+        row, f, c = fut.result()
+        rows.append(row)
+        fetch_s   += f
+        compute_s += c
+    return rows, fetch_s, compute_s
+
+
+def _scan_live(
+    pool: Executor, tickers: list[str], interval: str, fetcher: DataFetcher, fetch_workers: int,
+) -> tuple[list[ScanRow], float, float]:
+    def fetch(ticker: str) -> tuple[Optional[pd.DataFrame], float, str]:
+        t0 = time.perf_counter()
+        try:
+            return fetcher.get(ticker, interval), time.perf_counter() - t0, ""
+        except Exception as exc:
+            return None, time.perf_counter() - t0, f"{type(exc).__name__}: {exc}"
+
+    rows: list[ScanRow] = []
+    computing: list[Future] = []
+    fetch_s = 0.0
+    with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as io:
+        fetches = {io.submit(fetch, t): t for t in tickers}
+        for fut in as_completed(fetches):           # compute starts while slower fetches run
+            df, secs, error = fut.result()
+            fetch_s += secs
+            if df is None or df.empty:
+                rows.append(ScanRow(fetches[fut], error=error or "no bars"))
+            else:
+                computing.append(pool.submit(_scan_frame, fetches[fut], df))
+
+    compute_s = 0.0
+    for fut in computing:
+        row, secs = fut.result()
+        rows.append(row)
+        compute_s += secs
+    return rows, fetch_s, compute_s
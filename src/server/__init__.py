@@ -1,4 +1,6 @@
 """Flask webhook server for TradingView alerts."""
 from .app import create_app
+from .asgi import AsgiApp, create_asgi_app, serve
+from .context import ServerContext
 
-__all__ = ["create_app"]
+__all__ = ["AsgiApp", "ServerContext", "create_app", "create_asgi_app", "serve"]
@@ -1,35 +1,94 @@
 """
 Flask webhook server.
 Receives TradingView alert POST requests and processes them through
-the indicator engine and notification router.
+the indicator engine and notification router — inline, or (async mode)
+on a bounded worker pool with 202 + /alerts/<id> status lookups.
+Per-stage latency histograms are served at /metrics (Prometheus text)
+and, together with queue / cache / single-flight stats, at /stats (JSON).
+/mtf/<ticker> combines several timeframes resampled from one download.
+POST /signals answers many tickers × intervals in one request, streaming
+one NDJSON line per pair as it completes.
+/stream pushes every processed alert to Server-Sent Events subscribers
+(filtered by ticker / rating) through a SignalHub.
+/webhook and /signal share a SignalCache: a series whose last bar has not
+changed is answered from the previous composite.
+Engine, fetcher and caches live in one ServerContext built at startup
+(``ServerContext.from_config``) and shared by every request.
 """
 
 from __future__ import annotations
 
+import json
 import logging
 import os
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
 from flask import Flask, Response, jsonify, request
 
 from ..alerts.parser  import AlertParser
 from ..alerts.handler import AlertHandler
+from ..alerts.hub     import HubFull, SignalHub
 from ..alerts.router  import AlertRouter
+from ..alerts.workers import AlertQueue, QueueFull
+from ..indicators     import ConfluenceEngine, CustomSignalEngine
+from ..utils.cache   import SignalCache
 from ..utils.data_fetcher import DataFetcher
+from ..utils.metrics import MetricsRegistry
+from .context        import ServerContext, signal_payload
 
 log = logging.getLogger(__name__)
 
 
 def create_app(
-    fetcher: Optional[DataFetcher] = None,
-    router:  Optional[AlertRouter] = None,
+    fetcher:    Optional[DataFetcher] = None,
+    router:     Optional[AlertRouter] = None,
+    async_mode: bool = False,
+    workers:    int  = 4,
+    queue_size: int  = 1000,
+    metrics:    Optional[MetricsRegistry] = None,
+    engine:     Optional[CustomSignalEngine] = None,
+    confluence: Optional[ConfluenceEngine] = None,
+    signals:    Optional[SignalCache] = None,
+    context:    Optional[ServerContext] = None,
+    batch_workers: int = 8,
+    batch_max:     int = 500,
+    hub:           Optional[SignalHub] = None,
+    stream_heartbeat: float = 15.0,
 ) -> Flask:
+    """
+    ``context`` carries the shared engine / fetcher / caches; without one it
+    is assembled from the individual arguments (library defaults for the rest).
+    ``batch_workers`` bounds the concurrent fetches of one POST /signals,
+    ``batch_max`` the (ticker, interval) pairs it may ask for.
+    Processed alerts are published to ``hub`` for /stream subscribers.
+    """
     app = Flask(__name__)
 
+    ctx     = context or ServerContext.build(engine, fetcher, signals, confluence, metrics)
+    metrics = ctx.metrics
     parser  = AlertParser()
-    handler = AlertHandler(fetcher)
-    _router = router or AlertRouter()
+    handler = AlertHandler(ctx.fetcher, metrics=metrics, engine=ctx.engine, signals=ctx.signals)
+    _router = router or AlertRouter(metrics=metrics)
+    hub     = hub or SignalHub()
+    jobs    = AlertQueue(
+        handler, _router,
+        workers  = workers,
+        max_size = queue_size,
+        metrics  = metrics,
+        publish  = hub.publish,
+    ).start() if async_mode else None
+    app.extensions["alert_queue"] = jobs
+    app.extensions["metrics"]     = metrics
+    app.extensions["context"]     = ctx
+    app.extensions["hub"]         = hub
+
+    metrics.register("fetcher", ctx.fetcher.stats)
+    metrics.register("signal_cache", ctx.signals.stats)
+    metrics.register("resample", ctx.confluence.cache.stats)
+    metrics.register("stream", hub.stats)
+    if jobs is not None:
+        metrics.register("queue", jobs.stats)
 
     # ── Health check ──────────────────────────────────────────────────────────
     @app.get("/")
@@ -55,15 +114,30 @@ def create_app(
         body = request.get_data()
         log.debug("Incoming alert body: %r", body[:500])
 
-        alert = parser.parse(body)
+        with metrics.timer("parse"):
+            alert = parser.parse(body)
         if not alert.valid:
             return jsonify({"error": alert.error}), 400
 
+        if jobs is not None:
+            try:
+                job = jobs.submit(alert)
+            except QueueFull as exc:
+                log.warning("Rejecting alert for %s: %s", alert.ticker, exc)
+                return jsonify({"error": "queue full"}), 503
+            return jsonify({
+                "status":     "queued",
+                "ticker":     alert.ticker,
+                "alert_id":   job.id,
+                "status_url": f"/alerts/{job.id}",
+            }), 202
+
         result = handler.handle(alert)
         if result is None:
             return jsonify({"error": "processing failed"}), 500
 
         _router.dispatch(result)
+        hub.publish(result)
 
         return jsonify({
             "status":    "ok",
@@ -73,34 +147,136 @@ def create_app(
             "latency_ms": result.latency_ms,
         })
 
+    # ── Async alert status ────────────────────────────────────────────────────
+    @app.get("/alerts/<alert_id>")
+    def alert_status(alert_id: str) -> Response:
+        job = jobs.get(alert_id) if jobs is not None else None
+        if job is None:
+            return jsonify({"error": "unknown alert id"}), 404
+        return jsonify(job.to_dict())
+
+    @app.get("/queue")
+    def queue_stats() -> Response:
+        if jobs is None:
+            return jsonify({"async": False})
+        return jsonify({"async": True, **jobs.stats()})
+
+    # ── Metrics ───────────────────────────────────────────────────────────────
+    @app.get("/metrics")
+    def prometheus_metrics() -> Response:
+        return Response(metrics.prometheus(), mimetype="text/plain; version=0.0.4")
+
+    @app.get("/stats")
+    def stats() -> Response:
+        return jsonify(metrics.snapshot())
+
     # ── Signal endpoint (direct query) ────────────────────────────────────────
     @app.get("/signal/<ticker>")
     def signal(ticker: str) -> Response:
         interval = request.args.get("interval", "1h")
-        from ..indicators import CustomSignalEngine
-        from ..utils.data_fetcher import DataFetcher
+        try:
+            result = ctx.signal(ticker.upper(), interval)
+            return jsonify(signal_payload(ticker.upper(), interval, result))
+        except Exception as exc:
+            log.error("Signal query failed: %s", exc)
+            return jsonify({"error": str(exc)}), 500
+
+    @app.post("/signals")
+    def signals_batch() -> Response:
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            return jsonify({"error": "expected a JSON object"}), 400
+        tickers   = body.get("tickers")
+        intervals = body.get("intervals") or [body.get("interval") or "1h"]
+        if isinstance(intervals, str):
+            intervals = [intervals]
+        if not _strings(tickers):
+            return jsonify({"error": "'tickers' must be a non-empty list of strings"}), 400
+        if not _strings(intervals):
+            error = "'intervals' must be a string or a non-empty list of strings"
+            return jsonify({"error": error}), 400
 
+        # normalized once: the same keys reach the caches, the resampler and the payload
+        tickers   = [t.strip().upper() for t in tickers]
+        intervals = [i.strip() for i in intervals]
+        pairs = list(dict.fromkeys((t, i) for t in tickers for i in intervals))
+        if len(pairs) > batch_max:
+            error = f"{len(pairs)} ticker/interval pairs, at most {batch_max} allowed"
+            return jsonify({"error": error}), 413
+
+        def rows():
+            with metrics.timer("batch"):
+                for item in ctx.batch(pairs, batch_workers):
+                    if item.error:
+                        metrics.inc("batch_errors")
+                        row = {
+                            "ticker": item.ticker, "interval": item.interval, "error": item.error,
+                        }
+                    else:
+                        row = signal_payload(item.ticker, item.interval, item.signal)
+                    row["latency_ms"] = round(item.latency_ms, 2)
+                    yield json.dumps(row) + "\n"
+
+        return Response(
+            rows(), mimetype="application/x-ndjson", headers={"X-Accel-Buffering": "no"},
+        )
+
+    # ── Live signal stream (Server-Sent Events) ───────────────────────────────
+    @app.get("/stream")
+    def stream() -> Response:
         try:
-            ohlcv  = (fetcher or DataFetcher()).get(ticker.upper(), interval)
-            engine = CustomSignalEngine()
-            result = engine.run(
-                high=ohlcv["high"], low=ohlcv["low"],
-                close=ohlcv["close"], volume=ohlcv.get("volume"),
+            sub = hub.subscribe(
+                tickers = _csv(request.args.get("tickers") or request.args.get("ticker")),
+                ratings = _csv(request.args.get("ratings") or request.args.get("rating")),
             )
+        except HubFull as exc:
+            return jsonify({"error": str(exc)}), 503
+
+        def events():
+            try:
+                yield b"retry: 3000\n\n"
+                dropped = 0
+                while True:
+                    event = sub.get(timeout=stream_heartbeat)
+                    if sub.dropped != dropped:           # tell the client it missed some
+                        missed = json.dumps({"count": sub.dropped - dropped})
+                        yield f"event: dropped\ndata: {missed}\n\n".encode()
+                        dropped = sub.dropped
+                    yield event.frame if event is not None else b": keep-alive\n\n"
+            finally:
+                sub.close()
+
+        return Response(events(), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @app.get("/mtf/<ticker>")
+    def mtf_signal(ticker: str) -> Response:
+        try:
+            result = ctx.confluence.signal(ticker.upper())
             return jsonify({
-                "ticker":      ticker.upper(),
-                "interval":    interval,
-                "rating":      result.rating,
-                "score":       result.score,
-                "rsi_signal":  result.rsi_signal,
-                "macd_signal": result.macd_signal,
-                "bb_signal":   result.bb_signal,
-                "st_signal":   result.st_signal,
-                "vwap_signal": result.vwap_signal,
-                "components":  result.components,
+                "ticker":  ticker.upper(),
+                "base":    result.base,
+                "rating":  result.rating,
+                "score":   result.score,
+                "aligned": result.aligned,
+                "timeframes": {
+                    tf: {"rating": sig.rating, "score": sig.score, "weight": result.weights[tf]}
+                    for tf, sig in result.frames.items()
+                },
             })
         except Exception as exc:
-            log.error("Signal query failed: %s", exc)
+            log.error("MTF query failed: %s", exc)
             return jsonify({"error": str(exc)}), 500
 
     return app
+
+
+def _strings(value: Any) -> bool:
+    """A non-empty JSON list of non-blank strings."""
+    if not isinstance(value, list) or not value:
+        return False
+    return all(isinstance(x, str) and x.strip() for x in value)
+
+
+def _csv(value: Optional[str]) -> Optional[list[str]]:
+    return [v.strip() for v in value.split(",") if v.strip()] if value else None
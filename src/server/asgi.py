@@ -0,0 +1,399 @@
+"""
+Asyncio server mode — /health, /webhook and /signal as an ASGI app.
+
+The Flask app holds a thread for every in-flight request, including the
+time spent waiting on yfinance and on notification webhooks. Here each
+request is a coroutine on one event loop:
+  • fetches run on a bounded I/O thread pool (yfinance has no async API);
+    cached bars come straight back, and concurrent misses for one series
+    share a download through the fetcher's single-flight
+  • the composite runs on a CPU executor, so the loop never computes
+  • notifications go out over AsyncHTTPPool (``AlertRouter.dispatch_async``)
+    — a slow Slack or Telegram call is a suspended coroutine, not a thread
+
+The app shares ServerContext, AlertRouter and MetricsRegistry with the Flask
+app, so both modes answer the same payloads. Run it under any ASGI server
+(``uvicorn``) or the small HTTP/1.1 server below (``serve``), which needs
+nothing beyond the standard library. It takes Content-Length bodies only:
+chunked or malformed framing is a 400, bodies over ``max_body`` a 413, and a
+client that stalls mid-request (or idles on keep-alive) for ``read_timeout``
+is disconnected.
+
+    app = create_asgi_app(context=ServerContext.from_config(cfg), router=router)
+    serve(app, "0.0.0.0", 5000)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import parse_qs, unquote
+
+from ..alerts.handler import AlertHandler
+from ..alerts.parser  import AlertParser
+from ..alerts.router  import AlertRouter
+from ..indicators     import CustomSignalEngine
+from ..utils.cache    import SignalCache
+from ..utils.data_fetcher import DataFetcher
+from ..utils.metrics  import MetricsRegistry
+from .context         import ServerContext, signal_payload
+
+log = logging.getLogger(__name__)
+
+Scope   = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send    = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class AsgiApp:
+    def __init__(
+        self,
+        context:     ServerContext,
+        router:      AlertRouter,
+        io_workers:  int = 32,
+        cpu_workers: Optional[int] = None,
+    ) -> None:
+        self.context = context
+        self.metrics = context.metrics
+        self.router  = router
+        self.parser  = AlertParser()
+        self.handler = AlertHandler(
+            context.fetcher, metrics=self.metrics, engine=context.engine, signals=context.signals,
+        )
+        self.io  = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="fetch")
+        self.cpu = ThreadPoolExecutor(
+            max_workers=cpu_workers or os.cpu_count() or 1, thread_name_prefix="compute",
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        method, path = scope["method"], scope["path"]
+        segments = _segments(scope)
+        if method == "GET" and path in ("/", "/health"):
+            status, payload = 200, self.health()
+        elif method == "POST" and path in ("/webhook", "/alert"):
+            status, payload = await self.webhook(scope, await _read_body(receive))
+        elif method == "GET" and len(segments) == 2 and segments[0] == "signal" and segments[1]:
+            query = parse_qs(scope.get("query_string", b"").decode())
+            interval = query.get("interval", ["1h"])[0]
+            status, payload = await self.signal(segments[1], interval)
+        elif method == "GET" and path == "/stats":
+            status, payload = 200, self.metrics.snapshot()
+        elif method == "GET" and path == "/metrics":
+            body = self.metrics.prometheus().encode()
+            await _respond(send, 200, body, b"text/plain; version=0.0.4")
+            return
+        else:
+            status, payload = 404, {"error": "not found"}
+        await _respond(send, status, json.dumps(payload).encode())
+
+    # ── Routes ────────────────────────────────────────────────────────────────
+    @staticmethod
+    def health() -> dict[str, Any]:
+        return {
+            "status":  "ok",
+            "service": "trading-view-indicator-extension",
+            "mode":    "asgi",
+            "time":    datetime.utcnow().isoformat() + "Z",
+        }
+
+    async def webhook(self, scope: Scope, body: bytes) -> tuple[int, dict[str, Any]]:
+        secret = os.getenv("WEBHOOK_SECRET", "")
+        if secret and _header(scope, b"x-webhook-secret") != secret:
+            log.warning("Unauthorized webhook call from %s", (scope.get("client") or ("?",))[0])
+            return 401, {"error": "unauthorized"}
+
+        with self.metrics.timer("parse"):
+            alert = self.parser.parse(body)
+        if not alert.valid:
+            return 400, {"error": alert.error}
+
+        result = await self.handler.handle_async(alert, self.io, self.cpu)
+        if result is None:
+            return 500, {"error": "processing failed"}
+
+        await self.router.dispatch_async(result)
+        return 200, {
+            "status":     "ok",
+            "ticker":     alert.ticker,
+            "rating":     result.composite.rating,
+            "score":      result.composite.score,
+            "latency_ms": result.latency_ms,
+        }
+
+    async def signal(self, ticker: str, interval: str) -> tuple[int, dict[str, Any]]:
+        ticker = ticker.upper()
+        loop   = asyncio.get_running_loop()
+        try:
+            ohlcv  = await loop.run_in_executor(self.io, self.context.ohlcv, ticker, interval)
+            result = await loop.run_in_executor(
+                self.cpu, self.context.signal, ticker, interval, ohlcv,
+            )
+        except Exception as exc:
+            log.error("Signal query failed: %s", exc)
+            return 500, {"error": str(exc)}
+        return 200, signal_payload(ticker, interval, result)
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def aclose(self) -> None:
+        await self.router.aclose()
+        self.io.shutdown(wait=False, cancel_futures=True)
+        self.cpu.shutdown(wait=False, cancel_futures=True)
+
+
+def create_asgi_app(
+    fetcher:     Optional[DataFetcher] = None,
+    router:      Optional[AlertRouter] = None,
+    metrics:     Optional[MetricsRegistry] = None,
+    engine:      Optional[CustomSignalEngine] = None,
+    signals:     Optional[SignalCache] = None,
+    context:     Optional[ServerContext] = None,
+    io_workers:  int = 32,
+    cpu_workers: Optional[int] = None,
+) -> AsgiApp:
+    """
+    Same wiring as ``create_app``: ``context`` (or the individual arguments)
+    supplies the shared engine / fetcher / caches. ``io_workers`` bounds the
+    concurrent blocking fetches, ``cpu_workers`` the concurrent composites.
+    """
+    ctx = context or ServerContext.build(engine, fetcher, signals, None, metrics)
+    ctx.metrics.register("fetcher", ctx.fetcher.stats)
+    ctx.metrics.register("signal_cache", ctx.signals.stats)
+    return AsgiApp(ctx, router or AlertRouter(metrics=ctx.metrics), io_workers, cpu_workers)
+
+
+# ── ASGI plumbing ─────────────────────────────────────────────────────────────
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+def _segments(scope: Scope) -> list[str]:
+    """
+    Path segments, split on the raw path and unquoted one by one so an
+    encoded "/" (``BRK%2FB``) stays inside its segment.
+    """
+    raw  = scope.get("raw_path")
+    path = raw.decode("latin-1") if raw else scope["path"]
+    return [unquote(s) for s in path[1:].split("/")]
+
+
+async def _respond(
+    send: Send, status: int, body: bytes, content_type: bytes = b"application/json",
+) -> None:
+    await send({
+        "type":    "http.response.start",
+        "status":  status,
+        "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _header(scope: Scope, name: bytes) -> str:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return ""
+
+
+# ── Built-in HTTP/1.1 server ──────────────────────────────────────────────────
+_MAX_HEAD = 64 * 1024
+
+
+def serve(
+    app:          Callable,
+    host:         str = "0.0.0.0",
+    port:         int = 5000,
+    backlog:      int = 4096,
+    read_timeout: float = 10.0,
+    max_body:     int = 1 << 20,
+) -> None:
+    """Run ``app`` until interrupted (keep-alive, Content-Length request bodies)."""
+    try:
+        asyncio.run(serve_async(
+            app, host, port, backlog, read_timeout=read_timeout, max_body=max_body,
+        ))
+    except KeyboardInterrupt:
+        pass
+
+
+async def serve_async(
+    app:          Callable,
+    host:         str,
+    port:         int,
+    backlog:      int = 4096,
+    started:      Optional[asyncio.Future] = None,
+    read_timeout: float = 10.0,
+    max_body:     int = 1 << 20,
+) -> None:
+    """``serve`` inside a running loop; ``started`` gets the bound (host, port) once listening."""
+    handle = functools.partial(_connection, app, read_timeout=read_timeout, max_body=max_body)
+    server = await asyncio.start_server(handle, host, port, backlog=backlog, limit=_MAX_HEAD)
+    try:
+        async with server:
+            if started is not None:
+                started.set_result(server.sockets[0].getsockname()[:2])
+            await server.serve_forever()
+    finally:
+        if isinstance(app, AsgiApp):
+            await app.aclose()
+
+
+class _BadRequest(Exception):
+    def __init__(self, status: int, error: str) -> None:
+        super().__init__(error)
+        self.status = status
+
+
+async def _connection(
+    app:          Callable,
+    reader:       asyncio.StreamReader,
+    writer:       asyncio.StreamWriter,
+    read_timeout: float = 10.0,
+    max_body:     int = 1 << 20,
+) -> None:
+    peer, sock = writer.get_extra_info("peername"), writer.get_extra_info("sockname")
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), read_timeout)
+                method, target, version, headers = _parse_head(head)
+                length = _content_length(headers, max_body)
+                body   = await asyncio.wait_for(reader.readexactly(length), read_timeout)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                return                                    # closed, idle or stalled mid-request
+            except asyncio.LimitOverrunError:
+                await _reject(writer, 431, "request head too large")
+                return
+            except _BadRequest as exc:
+                await _reject(writer, exc.status, str(exc))
+                return
+            fields = dict(headers)
+            keep   = (fields.get(b"connection", b"").lower() != b"close") if version == "HTTP/1.1" \
+                else fields.get(b"connection", b"").lower() == b"keep-alive"
+
+            path, _, query = target.partition("?")
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": version[5:],
+                "method": method, "scheme": "http", "root_path": "",
+                "path": unquote(path), "raw_path": path.encode("latin-1"),
+                "query_string": query.encode("latin-1"),
+                "headers": headers, "client": peer[:2] if peer else None,
+                "server": sock[:2] if sock else None,
+            }
+            await _run(app, scope, body, writer, keep)
+            if not keep:
+                return
+    except Exception:
+        log.exception("ASGI connection from %s failed", peer)
+    finally:
+        writer.close()
+
+
+def _parse_head(head: bytes) -> tuple[str, str, str, list[tuple[bytes, bytes]]]:
+    request_line, *lines = head[:-4].decode("latin-1").split("\r\n")
+    parts = request_line.split(" ")
+    if len(parts) != 3 or parts[2] not in ("HTTP/1.0", "HTTP/1.1") or not parts[1].startswith("/"):
+        raise _BadRequest(400, "malformed request line")
+    headers = []
+    for line in lines:
+        name, colon, value = line.partition(":")
+        if not colon or not name or name != name.strip():
+            raise _BadRequest(400, "malformed header")
+        headers.append((name.lower().encode("latin-1"), value.strip().encode("latin-1")))
+    return parts[0], parts[1], parts[2], headers
+
+
+def _content_length(headers: list[tuple[bytes, bytes]], max_body: int) -> int:
+    if any(name == b"transfer-encoding" for name, _ in headers):
+        raise _BadRequest(400, "chunked request bodies are not supported; send Content-Length")
+    values = {value for name, value in headers if name == b"content-length"}
+    if not values:
+        return 0
+    if len(values) > 1 or not next(iter(values)).isdigit():
+        raise _BadRequest(400, "invalid Content-Length")
+    length = int(next(iter(values)))
+    if length > max_body:
+        raise _BadRequest(413, f"request body over {max_body} bytes")
+    return length
+
+
+async def _reject(writer: asyncio.StreamWriter, status: int, error: str) -> None:
+    body = json.dumps({"error": error}).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\ncontent-type: application/json\r\n"
+        f"content-length: {len(body)}\r\nconnection: close\r\n\r\n".encode() + body
+    )
+    try:
+        await asyncio.wait_for(writer.drain(), 1.0)
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+
+
+async def _run(
+    app: Callable, scope: Scope, body: bytes, writer: asyncio.StreamWriter, keep: bool,
+) -> None:
+    delivered = False
+
+    async def receive() -> dict[str, Any]:
+        nonlocal delivered
+        if delivered:
+            return {"type": "http.disconnect"}
+        delivered = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    chunked = False
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal chunked
+        if message["type"] == "http.response.start":
+            status  = message["status"]
+            headers = list(message.get("headers", ()))
+            chunked = not any(k.lower() == b"content-length" for k, _ in headers)
+            if chunked:
+                headers.append((b"transfer-encoding", b"chunked"))
+            headers.append((b"connection", b"keep-alive" if keep else b"close"))
+            lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}".encode()]
+            lines += [k + b": " + v for k, v in headers]
+            writer.write(b"\r\n".join(lines) + b"\r\n\r\n")
+        elif message["type"] == "http.response.body":
+            data = message.get("body", b"")
+            if chunked:
+                if data:
+                    writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+                if not message.get("more_body"):
+                    writer.write(b"0\r\n\r\n")
+            else:
+                writer.write(data)
+            await writer.drain()
+
+    await app(scope, receive, send)
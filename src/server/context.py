@@ -0,0 +1,230 @@
+"""
+ServerContext — the long-lived objects every request shares.
+
+One engine, one fetcher (bar cache, bar store, single-flight), one
+SignalCache and one ConfluenceEngine are built when the app starts and
+reused by /webhook, /signal and /mtf, so a request pays for fetching and
+indicator math only — never for constructing engines or cold caches.
+``CustomSignalEngine.run`` keeps no per-call state and the caches lock
+internally, so the context is safe to share across request threads.
+
+    ctx = ServerContext.from_config(cfg)        # engine profile, VWAP session, cache sizes …
+    app = create_app(context=ctx, router=router)
+
+``batch`` serves many (ticker, interval) pairs at once: fetches and
+composites run on a bounded thread pool and results are yielded in
+completion order, so callers can stream the fast ones first.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional
+
+import pandas as pd
+
+from ..alerts.handler import compute_signal
+from ..indicators     import ConfluenceEngine, CustomSignalEngine, VWAPIndicator
+from ..indicators.custom import CompositeSignal
+from ..indicators.mtf import parse_timeframes
+from ..utils.bar_store import BarStore
+from ..utils.cache    import BarCache, SignalCache
+from ..utils.data_fetcher import DataFetcher, interval_seconds
+from ..utils.metrics  import REGISTRY, MetricsRegistry
+
+
+@dataclass
+class ServerContext:
+    engine:     CustomSignalEngine
+    fetcher:    DataFetcher
+    signals:    SignalCache
+    confluence: ConfluenceEngine
+    metrics:    MetricsRegistry
+
+    @classmethod
+    def build(
+        cls,
+        engine:     Optional[CustomSignalEngine] = None,
+        fetcher:    Optional[DataFetcher] = None,
+        signals:    Optional[SignalCache] = None,
+        confluence: Optional[ConfluenceEngine] = None,
+        metrics:    Optional[MetricsRegistry] = None,
+    ) -> "ServerContext":
+        """Fill whatever was not injected with library defaults."""
+        metrics = metrics or REGISTRY
+        if engine is None and confluence is not None:
+            engine = confluence.engine
+        elif engine is None:                 # stage timings only on an engine built here
+            engine = CustomSignalEngine(metrics=metrics)
+        fetcher = fetcher or DataFetcher(metrics=metrics)
+        if confluence is None:
+            confluence = ConfluenceEngine(engine=engine, fetcher=fetcher)
+        elif confluence.fetcher is None:
+            confluence.fetcher = fetcher
+        return cls(
+            engine     = engine,
+            fetcher    = fetcher,
+            signals    = signals if signals is not None else SignalCache(),
+            confluence = confluence,
+            metrics    = metrics,
+        )
+
+    @classmethod
+    def from_config(cls, cfg: Any, metrics: Optional[MetricsRegistry] = None) -> "ServerContext":
+        """Everything configured from a ``Config`` (see config.py / .env)."""
+        metrics    = metrics or REGISTRY
+        engine     = engine_from_config(cfg, metrics)
+        confluence = confluence_from_config(cfg, engine)
+        fetcher    = fetcher_from_config(cfg, engine, confluence, metrics)
+        return cls.build(
+            engine     = engine,
+            fetcher    = fetcher,
+            signals    = SignalCache(cfg.SIGNAL_CACHE_ENTRIES),
+            confluence = confluence,
+            metrics    = metrics,
+        )
+
+    def ohlcv(self, ticker: str, interval: str) -> pd.DataFrame:
+        return self.fetcher.get(ticker, interval)
+
+    def signal(
+        self, ticker: str, interval: str, ohlcv: Optional[pd.DataFrame] = None,
+    ) -> CompositeSignal:
+        """Composite for ``ticker`` — fetched unless ``ohlcv`` is given, cached on the last bar."""
+        if ohlcv is None:
+            ohlcv = self.ohlcv(ticker, interval)
+        return compute_signal(self.engine, ohlcv, self.signals, ticker, interval)
+
+    def batch(
+        self, pairs: Iterable[tuple[str, str]], max_workers: int = 8,
+    ) -> Iterator[BatchItem]:
+        """
+        ``signal`` for every (ticker, interval) pair, at most ``max_workers``
+        in flight, yielded as each finishes. A failed pair yields an item
+        with ``error`` set. Closing the iterator early drops pairs not yet
+        started.
+        """
+        pairs = list(dict.fromkeys(pairs))
+        if not pairs:
+            return
+
+        def run(ticker: str, interval: str) -> BatchItem:
+            t0 = time.perf_counter()
+            try:
+                result, error = self.signal(ticker, interval), ""
+            except Exception as exc:                 # one bad symbol must not sink the batch
+                result, error = None, f"{type(exc).__name__}: {exc}"
+            return BatchItem(ticker, interval, result, error, (time.perf_counter() - t0) * 1000)
+
+        workers = max(1, min(max_workers, len(pairs)))
+        pool    = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+        try:
+            for fut in as_completed([pool.submit(run, t, i) for t, i in pairs]):
+                yield fut.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass
+class BatchItem:
+    ticker:     str
+    interval:   str
+    signal:     Optional[CompositeSignal]
+    error:      str = ""
+    latency_ms: float = 0.0
+
+
+def signal_payload(ticker: str, interval: str, result: CompositeSignal) -> dict[str, Any]:
+    """JSON body of /signal (and of each /signals row) — shared by the Flask and ASGI apps."""
+    return {
+        "ticker":      ticker,
+        "interval":    interval,
+        "rating":      result.rating,
+        "score":       result.score,
+        "rsi_signal":  result.rsi_signal,
+        "macd_signal": result.macd_signal,
+        "bb_signal":   result.bb_signal,
+        "st_signal":   result.st_signal,
+        "vwap_signal": result.vwap_signal,
+        "components":  result.components,
+    }
+
+
+# ── Builders from Config ──────────────────────────────────────────────────────
+def engine_from_config(cfg: Any, metrics: Optional[MetricsRegistry] = None) -> CustomSignalEngine:
+    kwargs = dict(tolerance=cfg.WARMUP_TOLERANCE, strict=cfg.WARMUP_STRICT, metrics=metrics)
+    if cfg.ENGINE_PROFILE:
+        engine = CustomSignalEngine.from_profile(cfg.ENGINE_PROFILE, **kwargs)
+    else:
+        engine = CustomSignalEngine(**kwargs)
+    session = cfg.VWAP_SESSION
+    engine.vwap = VWAPIndicator(
+        session_reset = False if session.lower() in ("", "none", "false") else session,
+        timezone      = cfg.EXCHANGE_TZ or None,
+        session_start = cfg.VWAP_SESSION_START or None,
+    )
+    return engine
+
+
+def confluence_from_config(
+    cfg: Any, engine: CustomSignalEngine, fetcher: Optional[DataFetcher] = None,
+) -> ConfluenceEngine:
+    return ConfluenceEngine(
+        timeframes    = parse_timeframes(cfg.MTF_TIMEFRAMES),
+        base          = cfg.MTF_BASE,
+        engine        = engine,
+        fetcher       = fetcher,
+        timezone      = cfg.EXCHANGE_TZ or None,
+        session_start = cfg.VWAP_SESSION_START or None,
+    )
+
+
+def fetcher_from_config(
+    cfg:        Any,
+    engine:     Optional[CustomSignalEngine] = None,
+    confluence: Optional[ConfluenceEngine] = None,
+    metrics:    Optional[MetricsRegistry] = None,
+    fallback_synthetic: bool = True,
+) -> DataFetcher:
+    cache = BarCache(
+        max_entries = cfg.CACHE_MAX_ENTRIES,
+        max_bytes   = cfg.CACHE_MAX_MB * 1024 * 1024,
+    )
+    store = BarStore(cfg.BAR_STORE_DIR) if cfg.BAR_STORE_DIR else None
+    bars, session = _history_window(engine, confluence)
+    return DataFetcher(
+        use_synthetic = cfg.USE_SYNTHETIC,
+        cache         = cache,
+        use_cache     = cfg.CACHE_ENABLED,
+        store         = store,
+        metrics       = metrics,
+        # with trimming on, download only what the engine will use (None = full period)
+        history_bars  = bars,
+        history_session = session,
+        timezone      = cfg.EXCHANGE_TZ or None,
+        session_start = cfg.VWAP_SESSION_START or None,
+        fallback_synthetic = fallback_synthetic,
+    )
+
+
+def _history_window(
+    engine: Optional[CustomSignalEngine], confluence: Optional[ConfluenceEngine],
+) -> tuple[Optional[int], Optional[pd.Timedelta]]:
+    """
+    History a download must cover: (bars, session length of a session VWAP),
+    None bars = all. Session VWAP has no bar count of its own — it reads back
+    to a session open — so the fetcher widens the window by sessions instead.
+    """
+    if engine is None or not engine.tolerance:
+        return None, None
+    # the coarsest MTF timeframe is resampled from the same download
+    source = confluence if confluence is not None else engine
+    span   = engine.vwap.session_span
+    if span is None:                           # cumulative VWAP needs every bar
+        return source.lookback(), None
+    coarsest = max(map(interval_seconds, confluence.timeframes)) if confluence is not None else 0
+    if coarsest >= span.total_seconds():       # one bar per session: VWAP runs over all of them
+        return None, None
+    return source.lookback(volume=False), span
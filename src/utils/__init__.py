@@ -1,5 +1,13 @@
 """Utility modules."""
+from .bar_store    import BarStore
+from .cache        import BarCache, SignalCache
 from .data_fetcher import DataFetcher
 from .logger      import setup_logging
+from .metrics      import REGISTRY, MetricsRegistry
+from .resample     import ResampleCache, resample_ohlcv
+from .singleflight import SingleFlight
 
-__all__ = ["DataFetcher", "setup_logging"]
+__all__ = [
+    "BarCache", "BarStore", "DataFetcher", "MetricsRegistry", "REGISTRY", "ResampleCache",
+    "SignalCache", "SingleFlight", "resample_ohlcv", "setup_logging",
+]
@@ -0,0 +1,171 @@
+"""
+BarStore — persistent on-disk OHLCV history, one columnar directory per series.
+Extended with:
+  • Raw little-endian column files (ts.i8, open.f8 … volume.f8), grown in place
+  • Tail overwrite on append, so a re-fetched in-progress bar replaces the stale one
+  • meta.json is marked pending (atomically) before any column is touched and
+    replaced with the new row count after; a series left pending or shorter
+    than its row count by a crashed write is treated as missing (re-fetched)
+
+Layout:  <root>/<interval>/<TICKER>/{meta.json, ts.i8, open.f8, …}
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+_TS     = "ts.i8"
+
+
+class BarStore:
+    """Local OHLCV store keyed on (ticker, interval). Safe across threads, not processes."""
+
+    def __init__(self, root: str | os.PathLike) -> None:
+        self.root   = Path(root)
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    # ── Read ──────────────────────────────────────────────────────────────────
+    def read(self, ticker: str, interval: str) -> Optional[pd.DataFrame]:
+        path = self._dir(ticker, interval)
+        meta = self._valid(path)
+        if meta is None:
+            return None
+        rows = meta["rows"]
+        ts   = np.fromfile(path / _TS, dtype="<i8", count=rows)
+        idx  = pd.DatetimeIndex(ts.astype("datetime64[ns]")).tz_localize("UTC")
+        if meta.get("tz"):
+            idx = idx.tz_convert(meta["tz"])
+        data = {c: np.fromfile(path / f"{c}.f8", dtype="<f8", count=rows) for c in COLUMNS}
+        return pd.DataFrame(data, index=idx)
+
+    def last_timestamp(self, ticker: str, interval: str) -> Optional[pd.Timestamp]:
+        path = self._dir(ticker, interval)
+        meta = self._valid(path)
+        if meta is None:
+            return None
+        with open(path / _TS, "rb") as fh:
+            fh.seek((meta["rows"] - 1) * 8)
+            last = int(np.frombuffer(fh.read(8), dtype="<i8")[0])
+        ts = pd.Timestamp(last, unit="ns", tz="UTC")
+        return ts.tz_convert(meta["tz"]) if meta.get("tz") else ts
+
+    def rows(self, ticker: str, interval: str) -> int:
+        meta = self._valid(self._dir(ticker, interval))
+        return meta["rows"] if meta else 0
+
+    # ── Write ─────────────────────────────────────────────────────────────────
+    def write(self, ticker: str, interval: str, df: pd.DataFrame) -> None:
+        """Replace the stored series with ``df``."""
+        with self._lock(ticker, interval):
+            path = self._dir(ticker, interval)
+            path.mkdir(parents=True, exist_ok=True)
+            self._commit(path, 0, df)
+
+    def append(self, ticker: str, interval: str, df: pd.DataFrame) -> int:
+        """
+        Append bars newer than what is stored; stored bars at or after the
+        first new timestamp are overwritten. Returns the number of rows written.
+        """
+        if df.empty:
+            return 0
+        df = df.sort_index()
+        with self._lock(ticker, interval):
+            path = self._dir(ticker, interval)
+            meta = self._valid(path)
+            if meta is None:
+                path.mkdir(parents=True, exist_ok=True)
+                self._commit(path, 0, df)
+                return len(df)
+
+            stored = np.fromfile(path / _TS, dtype="<i8", count=meta["rows"])
+            keep   = int(np.searchsorted(stored, self._ns(df.index)[0], side="left"))
+            self._commit(path, keep, df)
+            return len(df)
+
+    def delete(self, ticker: str, interval: str) -> None:
+        with self._lock(ticker, interval):
+            path = self._dir(ticker, interval)
+            if path.exists():
+                for f in path.iterdir():
+                    f.unlink()
+                path.rmdir()
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+    def _commit(self, path: Path, keep: int, df: pd.DataFrame) -> None:
+        """Write ``df`` over rows [keep, …) of every column, then publish the new row count."""
+        self._publish(path, {**(self._meta(path) or {"rows": 0, "tz": None}), "pending": True})
+        columns = {_TS: self._ns(df.index).astype("<i8")}
+        columns.update({f"{c}.f8": df[c].to_numpy(dtype="<f8") for c in COLUMNS})
+        for name, values in columns.items():
+            with open(path / name, "r+b" if keep else "wb") as fh:
+                fh.seek(keep * 8)
+                fh.write(values.tobytes())
+                fh.truncate()
+
+        tz   = getattr(df.index, "tz", None)
+        self._publish(path, {"rows": keep + len(df), "tz": str(tz) if tz is not None else None})
+
+    @staticmethod
+    def _publish(path: Path, meta: dict) -> None:
+        tmp = path / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, path / "meta.json")
+
+    @staticmethod
+    def _ns(index: pd.Index) -> np.ndarray:
+        idx = pd.DatetimeIndex(index)
+        if idx.tz is not None:
+            idx = idx.tz_convert("UTC").tz_localize(None)
+        return idx.as_unit("ns").asi8
+
+    def _valid(self, path: Path) -> Optional[dict]:
+        """Metadata of a non-empty series whose last write completed, else None."""
+        meta = self._meta(path)
+        if meta is None or meta["rows"] == 0:
+            return None
+        if meta.get("pending"):
+            log.warning("Bar store %s was left mid-write — ignoring", path)
+            return None
+        if not self._complete(path, meta["rows"]):
+            log.warning("Bar store %s is shorter than its metadata — ignoring", path)
+            return None
+        return meta
+
+    @staticmethod
+    def _complete(path: Path, rows: int) -> bool:
+        names = (_TS, *(f"{c}.f8" for c in COLUMNS))
+        try:
+            return all((path / n).stat().st_size >= rows * 8 for n in names)
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _meta(path: Path) -> Optional[dict]:
+        try:
+            return json.loads((path / "meta.json").read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            log.warning("Unreadable bar store metadata in %s: %s", path, exc)
+            return None
+
+    def _dir(self, ticker: str, interval: str) -> Path:
+        safe = lambda s: re.sub(r"[^A-Za-z0-9._^=-]", "_", s)
+        return self.root / safe(interval) / safe(ticker.upper())
+
+    def _lock(self, ticker: str, interval: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault((ticker.upper(), interval), threading.Lock())
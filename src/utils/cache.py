@@ -0,0 +1,182 @@
+"""
+BarCache — bounded in-memory OHLCV cache for DataFetcher.
+Extended with:
+  • Per-entry expiry aligned to the next bar close of the series' interval
+  • LRU eviction by entry count and approximate byte size
+  • Hit / miss / eviction / expiration counters
+  • SignalCache — computed signals per (ticker, interval, engine), valid
+    until the series' last bar changes
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+import pandas as pd
+
+from .singleflight import SingleFlight
+
+
+@dataclass
+class _Entry:
+    frame:      pd.DataFrame
+    nbytes:     int
+    expires_at: float
+
+
+class BarCache:
+    """
+    Thread-safe LRU of DataFrames keyed on (ticker, interval).
+
+    Cached frames are shared between callers — treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int   = 512,
+        max_bytes:   int   = 256 * 1024 * 1024,
+        clock:       Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self._clock      = clock
+        self._lock       = threading.Lock()
+        self._data: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._bytes      = 0
+        self.hits        = 0
+        self.misses      = 0
+        self.evictions   = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if self._clock() >= entry.expires_at:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry.frame
+
+    def put(self, key: Hashable, frame: pd.DataFrame, expires_at: float) -> None:
+        nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+        if self.max_entries <= 0 or nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = _Entry(frame, nbytes, expires_at)
+            self._bytes += nbytes
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries":     len(self._data),
+                "bytes":       self._bytes,
+                "hits":        self.hits,
+                "misses":      self.misses,
+                "evictions":   self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio":   round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._data.pop(key)
+        self._bytes -= entry.nbytes
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SignalCache:
+    """
+    Thread-safe LRU of computed results keyed on (ticker, interval, engine
+    fingerprint); each entry remembers the last bar it was computed from
+    and is recomputed only when that bar changes — a new bar, or a live bar
+    whose close / volume moved. Concurrent misses for one key compute once.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._lock       = threading.Lock()
+        self._data: OrderedDict[Hashable, tuple[Hashable, Any]] = OrderedDict()
+        self._flight     = SingleFlight()
+        self.hits        = 0
+        self.misses      = 0
+        self.evictions   = 0
+
+    @staticmethod
+    def last_bar(ohlcv: pd.DataFrame) -> Hashable:
+        """Identity of the newest bar: (timestamp, close, volume, number of bars)."""
+        if ohlcv.empty:
+            return None
+        row = ohlcv.iloc[-1]
+        return ohlcv.index[-1], float(row["close"]), float(row.get("volume", 0.0)), len(ohlcv)
+
+    def get_or_compute(
+        self,
+        key:     Hashable,
+        ohlcv:   pd.DataFrame,
+        compute: Callable[[], Any],
+    ) -> Any:
+        bar = self.last_bar(ohlcv)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] == bar:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        result = self._flight.do((key, bar), compute)
+        if self.max_entries <= 0:
+            return result
+        with self._lock:
+            self._data[key] = (bar, result)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries":   len(self._data),
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
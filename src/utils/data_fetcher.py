@@ -1,21 +1,48 @@
 """
 DataFetcher — fetch OHLCV data for indicator calculations.
 Primary source: yfinance (Yahoo Finance — free, no API key needed).
-Fallback: synthetic random-walk data for testing/demo.
+Fallback: synthetic random-walk data for testing/demo (never cached, so the
+next request retries yfinance); with ``fallback_synthetic=False`` a failed
+download raises instead, for callers that must not mistake it for real bars.
+Fetched series are cached in memory until the next bar close (see BarCache)
+and, optionally, persisted to a local BarStore so later fetches only pull
+bars newer than the last stored timestamp. Concurrent requests for the same
+(ticker, interval) share a single in-flight download (see SingleFlight).
+Bar closes are counted from the last bar's open, so session-anchored bars
+(hourly bars opening at 09:30) expire at :30, not on the UTC hour.
+With ``history_bars`` set (the engine's warmup lookback), downloads request
+only a calendar window covering that many bars instead of the full period.
+``history_session`` (a session VWAP's session length) widens it by two
+sessions, and intervals at or above that length, where every bar is its own
+session and VWAP runs over the whole series, still get the full period.
+Every ``get`` is timed into the ``fetch`` stage, labelled cache="hit"/"miss".
+Intervals yfinance does not serve (2h, 3h, 4h, 12h, 2D …) are resampled in
+memory from the coarsest native bar size that divides them; the resampled
+frame is re-aggregated only from its last (partial) bar when the base series
+grows, and expires with the base bar so that partial bar stays current.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Optional
-from functools import lru_cache
+import math
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
 
 import numpy as np
 import pandas as pd
 
+from .bar_store import BarStore
+from .cache     import BarCache
+from .metrics   import REGISTRY, MetricsRegistry
+from .resample  import ResampleCache, interval_seconds, parse_interval
+from .singleflight import SingleFlight
+
 log = logging.getLogger(__name__)
 
-# Map TradingView intervals to yfinance periods/intervals
+# Map TradingView intervals yfinance serves natively to yfinance periods/intervals
 _TV_TO_YF = {
     "1":    ("7d",   "1m"),
     "5":    ("60d",  "5m"),
@@ -23,54 +50,245 @@ _TV_TO_YF = {
     "30":   ("60d",  "30m"),
     "60":   ("730d", "60m"),
     "1h":   ("730d", "60m"),
-    "2h":   ("730d", "2h"),
-    "4h":   ("730d", "4h"),  # yfinance doesn't support 4h — we resample
     "D":    ("5y",   "1d"),
     "1D":   ("5y",   "1d"),
     "W":    ("10y",  "1wk"),
     "1W":   ("10y",  "1wk"),
 }
 
+# Native bar sizes other intervals are resampled from, by unit (coarsest first):
+# (TradingView form, yfinance period, yfinance interval)
+_RESAMPLE_BASES = {
+    "intraday": (("60", "730d", "60m"), ("30", "60d", "30m"), ("15", "60d", "15m"),
+                 ("5", "60d", "5m"), ("1", "7d", "1m")),
+    "D": (("1D", "5y", "1d"),),
+    "W": (("1W", "10y", "1wk"),),
+    "M": (("1M", "max", "1mo"),),
+}
+
+
+def yf_source(tv_interval: str) -> tuple[str, str, str]:
+    """
+    (yfinance period, yfinance interval, base TradingView interval) that
+    serve ``tv_interval``. The base equals ``tv_interval`` when yfinance
+    has it natively; otherwise it is the coarsest native size dividing it
+    (4h → 60m, 45 → 15m, 2D → 1d) and the bars must be resampled.
+    """
+    if tv_interval in _TV_TO_YF:
+        period, interval = _TV_TO_YF[tv_interval]
+        return period, interval, tv_interval
+    count, unit = parse_interval(tv_interval)
+    if unit in ("D", "W", "M"):
+        base, period, interval = _RESAMPLE_BASES[unit][0]
+        return (period, interval, tv_interval if count == 1 else base)
+    step = interval_seconds(tv_interval)
+    for base, period, interval in _RESAMPLE_BASES["intraday"]:
+        if step % interval_seconds(base) == 0:
+            return period, interval, tv_interval if step == interval_seconds(base) else base
+    return _TV_TO_YF["D"] + ("D",)
+
+
+def yf_interval(tv_interval: str) -> str:
+    """yfinance interval (and BarStore key) that serves a TradingView interval."""
+    return yf_source(tv_interval)[1]
+
+
+def needs_resample(tv_interval: str) -> bool:
+    """True when ``tv_interval`` is built from a finer native bar size."""
+    return interval_seconds(yf_source(tv_interval)[2]) != interval_seconds(tv_interval)
+
+
+_WEEK_OFFSET  = 4 * 86400    # the Unix epoch is a Thursday; weekly bars open on Monday
+
+
+def next_bar_close(tv_interval: str, now: float, anchor: Optional[float] = None) -> float:
+    """
+    Unix time at which the bar containing ``now`` closes. ``anchor`` is the
+    open of any bar of the series (e.g. the last one) — bars are laid out
+    from it, so a 09:30 session's hourly bars close at :30. Without it bars
+    are aligned to the Unix epoch (weekly bars to Monday).
+    """
+    step = interval_seconds(tv_interval)
+    if anchor is not None:
+        return anchor + ((now - anchor) // step + 1) * step
+    offset = _WEEK_OFFSET if step % (7 * 86400) == 0 else 0
+    return ((now - offset) // step + 1) * step + offset
+
+
+_PERIOD_DAYS = {"d": 1, "mo": 31, "y": 366}
+
+
+def history_days(tv_interval: str, bars: int) -> int:
+    """
+    Calendar days that cover ``bars`` bars, assuming an equities calendar
+    (6.5 trading hours, 5 days a week) plus a margin for holidays —
+    generous for 24/7 markets, which is the safe direction.
+    """
+    step = interval_seconds(tv_interval)
+    if step < 86400:
+        days = bars * step / (6.5 * 3600) * 7 / 5
+    elif step < 7 * 86400:
+        days = bars * step / 86400 * 7 / 5
+    else:
+        days = bars * step / 86400
+    return math.ceil(days * 1.1) + 3
+
+
+def _period_days(period: str) -> int:
+    m = re.fullmatch(r"(\d+)(d|mo|y)", period)
+    return int(m.group(1)) * _PERIOD_DAYS[m.group(2)] if m else 10**6
+
 
 class DataFetcher:
-    def __init__(self, use_synthetic: bool = False) -> None:
+    def __init__(
+        self,
+        use_synthetic: bool = False,
+        cache:         Optional[BarCache] = None,
+        use_cache:     bool = True,
+        store:         Optional[BarStore] = None,
+        metrics:       Optional[MetricsRegistry] = None,
+        history_bars:  Optional[int] = None,
+        timezone:      Optional[str] = None,
+        session_start: Optional[str] = None,
+        fallback_synthetic: bool = True,
+        history_session: Optional[pd.Timedelta] = None,
+    ) -> None:
         self._synthetic = use_synthetic
+        self.fallback_synthetic = fallback_synthetic   # False = a failed download raises
+        self.cache      = (cache if cache is not None else BarCache()) if use_cache else None
+        self.store      = store
+        self.history_bars = history_bars      # None = full default period per interval
+        self.history_session = history_session    # session VWAP's session length (None = none)
+        self.metrics    = metrics or REGISTRY
+        self._flight    = SingleFlight()
+        self.resampler  = ResampleCache()
+        # resampled bars use the exchange wall clock (None = the data's own) and,
+        # intraday, restart at ``session_start`` each day ("09:30")
+        self.timezone   = timezone
+        self.session_start = session_start
 
     def get(self, ticker: str, interval: str = "1h") -> pd.DataFrame:
-        if self._synthetic:
-            return self._synthetic_data(ticker, 200)
+        """OHLCV for ticker/interval; served from cache until the current bar closes."""
+        key = (ticker, interval)
+        with self.metrics.timer("fetch", cache="miss") as labels:
+            if self.cache is not None:
+                df = self.cache.get(key)
+                if df is not None:
+                    labels["cache"] = "hit"
+                    return df
+            return self._flight.do(key, lambda: self._load(ticker, interval))
 
+    def cache_stats(self) -> dict[str, float]:
+        return self.cache.stats() if self.cache is not None else {}
+
+    def stats(self) -> dict[str, dict]:
+        """Cache and request-coalescing counters (``singleflight.shared`` = fetches saved)."""
+        return {
+            "cache":        self.cache_stats(),
+            "singleflight": self._flight.stats(),
+            "resample":     self.resampler.stats(),
+        }
+
+    def _load(self, ticker: str, interval: str) -> pd.DataFrame:
         try:
-            return self._yfinance(ticker, interval)
+            df = self._fetch(ticker, interval)
         except Exception as exc:
-            log.warning("yfinance failed for %s/%s: %s — using synthetic data", ticker, interval, exc)
+            if not self.fallback_synthetic:
+                raise
+            # served for this call only — caching it would pass fake bars off as real
+            # until the next bar close; the next get retries yfinance
+            log.warning(
+                "yfinance failed for %s/%s: %s — using synthetic data", ticker, interval, exc,
+            )
+            return self._synthetic_data(ticker, 200)
+        if self.cache is not None:
+            # a resampled series changes with every base bar (its last bar is partial)
+            refresh = yf_source(interval)[2] if not self._synthetic else interval
+            expires = next_bar_close(refresh, time.time(), self._bar_anchor(df))
+            self.cache.put((ticker, interval), df, expires_at=expires)
+        return df
+
+    def _bar_anchor(self, df: pd.DataFrame) -> Optional[float]:
+        """Open of the last bar as Unix time (a naive index is read in ``timezone``)."""
+        if df.empty or not isinstance(df.index, pd.DatetimeIndex):
+            return None
+        last = df.index[-1]
+        if last.tzinfo is None and self.timezone:
+            last = last.tz_localize(self.timezone)
+        return last.timestamp()
+
+    def _fetch(self, ticker: str, interval: str) -> pd.DataFrame:
+        if self._synthetic:
             return self._synthetic_data(ticker, 200)
+        return self._yfinance(ticker, interval)
 
     # ── yfinance ──────────────────────────────────────────────────────────────
+    def _yfinance(self, ticker: str, tv_interval: str) -> pd.DataFrame:
+        period, yf_interval, _ = yf_source(tv_interval)
+        window = self._window(tv_interval, period)
+
+        if self.store is None:
+            df = self._download(ticker, yf_interval, **window)
+        else:
+            df = self._download_incremental(ticker, yf_interval, window)
+        if df.empty:
+            raise ValueError(f"No data returned from yfinance for {ticker}")
+
+        if needs_resample(tv_interval):
+            df = self.resampler.get(
+                (ticker, yf_interval), df, tv_interval, self.timezone, self.session_start,
+            )
+        return df
+
+    def _window(self, tv_interval: str, period: str) -> dict[str, Any]:
+        """yfinance download window: the default period, or just enough for ``history_bars``."""
+        span = self.history_session
+        # at or above the session length every bar is a session: VWAP needs them all
+        trim = span is None or interval_seconds(tv_interval) < span.total_seconds()
+        if self.history_bars and trim:
+            days = history_days(tv_interval, self.history_bars)
+            if span is not None:
+                # the second-to-last bar's session may be the previous one
+                days += 2 * math.ceil(span / pd.Timedelta(days=1))
+            if days < _period_days(period):
+                start = datetime.fromtimestamp(time.time() - days * 86400, tz=timezone.utc)
+                return {"start": start}
+        return {"period": period}
+
+    def _download_incremental(
+        self, ticker: str, yf_interval: str, window: dict[str, Any],
+    ) -> pd.DataFrame:
+        """Pull only bars at/after the last stored one, append, and serve from the store."""
+        last = self.store.last_timestamp(ticker, yf_interval)
+        if last is not None:
+            try:
+                new = self._download(ticker, yf_interval, start=last.to_pydatetime())
+                self.store.append(ticker, yf_interval, new)
+                log.debug("Appended %d bars for %s/%s", len(new), ticker, yf_interval)
+                stored = self.store.read(ticker, yf_interval)
+                if stored is not None:
+                    return stored
+            except Exception as exc:
+                log.warning(
+                    "Incremental fetch failed for %s/%s: %s — refetching", ticker, yf_interval, exc,
+                )
+
+        df = self._download(ticker, yf_interval, **window)
+        if not df.empty:
+            self.store.write(ticker, yf_interval, df)
+        return df
+
     @staticmethod
-    def _yfinance(ticker: str, tv_interval: str) -> pd.DataFrame:
+    def _download(ticker: str, yf_interval: str, **window) -> pd.DataFrame:
         import yfinance as yf   # lazy import — not in stdlib
 
-        period, yf_interval = _TV_TO_YF.get(tv_interval, ("730d", "1d"))
-
-        hist = yf.Ticker(ticker).history(period=period, interval=yf_interval)
+        hist = yf.Ticker(ticker).history(interval=yf_interval, **window)
         if hist.empty:
-            raise ValueError(f"No data returned from yfinance for {ticker}")
+            return pd.DataFrame(columns=["open","high","low","close","volume"])
 
         hist.columns = [c.lower() for c in hist.columns]
         df = hist[["open","high","low","close","volume"]].copy()
         df.dropna(inplace=True)
-
-        # Resample 4h from 1h if needed
-        if tv_interval == "4h" and yf_interval == "60m":
-            df = df.resample("4h").agg({
-                "open":   "first",
-                "high":   "max",
-                "low":    "min",
-                "close":  "last",
-                "volume": "sum",
-            }).dropna()
-
         return df
 
     # ── Synthetic fallback ────────────────────────────────────────────────────
@@ -0,0 +1,211 @@
+"""
+MetricsRegistry — in-process latency histograms, counters and stats collectors.
+Extended with:
+  • perf_counter timers per pipeline stage (parse, fetch, each indicator,
+    composite, each notification channel), labelled e.g. cache="hit"
+  • p50 / p95 / p99 over a sliding window of recent samples, plus
+    lifetime count / sum / max
+  • Collectors: callables returning (nested) numeric dicts — queue, cache
+    and single-flight stats — sampled at scrape time
+  • Prometheus text exposition (``/metrics``) and a JSON snapshot (``/stats``)
+
+Components default to the process-wide ``REGISTRY``; pass a private
+``MetricsRegistry`` to isolate them (tests, benchmarks).
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Mapping
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+_LabelKey = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Latency samples in milliseconds; quantiles are computed over the last ``window`` samples."""
+
+    def __init__(self, window: int = 2048) -> None:
+        self._recent: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.sum   = 0.0
+        self.max   = 0.0
+
+    def observe(self, value: float) -> None:
+        self._recent.append(value)
+        self.count += 1
+        self.sum   += value
+        if value > self.max:
+            self.max = value
+
+    def quantiles(self, qs: tuple[float, ...] = QUANTILES) -> dict[float, float]:
+        data = sorted(self._recent)
+        if not data:
+            return {q: math.nan for q in qs}
+        # nearest-rank
+        return {q: data[min(len(data) - 1, max(0, math.ceil(q * len(data)) - 1))] for q in qs}
+
+    def summary(self) -> dict[str, float]:
+        q = self.quantiles()
+        return {
+            "count":   self.count,
+            "mean_ms": round(self.sum / self.count, 3) if self.count else 0.0,
+            "p50_ms":  round(q[0.5], 3)  if self.count else 0.0,
+            "p95_ms":  round(q[0.95], 3) if self.count else 0.0,
+            "p99_ms":  round(q[0.99], 3) if self.count else 0.0,
+            "max_ms":  round(self.max, 3),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self, namespace: str = "tv", window: int = 2048) -> None:
+        self.namespace = namespace
+        self.window    = window
+        self._lock     = threading.Lock()
+        self._hists:    dict[tuple[str, _LabelKey], Histogram] = {}
+        self._counters: dict[tuple[str, _LabelKey], float]     = {}
+        self._collectors: dict[str, Callable[[], Mapping[str, Any]]] = {}
+
+    # ── Recording ─────────────────────────────────────────────────────────────
+    def observe(self, stage: str, ms: float, **labels: str) -> None:
+        key = (stage, self._labels(labels))
+        with self._lock:
+            hist = self._hists.get(key)
+            if hist is None:
+                hist = self._hists[key] = Histogram(self.window)
+            hist.observe(ms)
+
+    @contextmanager
+    def timer(self, stage: str, **labels: str) -> Iterator[dict[str, str]]:
+        """
+        Time the block into ``stage``. The yielded dict holds the labels and
+        may be amended inside the block (e.g. ``labels["cache"] = "hit"``).
+        """
+        t0 = time.perf_counter()
+        try:
+            yield labels
+        finally:
+            self.observe(stage, (time.perf_counter() - t0) * 1000, **labels)
+
+    def summary(self, stage: str, **labels: str) -> dict[str, float]:
+        """Latency summary of one stage / label set (zeros before its first sample)."""
+        key = (stage, self._labels(labels))
+        with self._lock:
+            hist = self._hists.get(key)
+            return hist.summary() if hist is not None else Histogram(self.window).summary()
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def register(self, name: str, collector: Callable[[], Mapping[str, Any]]) -> None:
+        """Sample ``collector()`` at scrape time; replaces any collector of the same name."""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hists.clear()
+            self._counters.clear()
+
+    # ── Export ────────────────────────────────────────────────────────────────
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-friendly view: latency summaries per stage, counters, collector stats."""
+        with self._lock:
+            hists      = list(self._hists.items())
+            counters   = list(self._counters.items())
+            collectors = list(self._collectors.items())
+
+        latency: dict[str, list[dict]] = {}
+        for (stage, labels), hist in sorted(hists, key=lambda kv: kv[0]):
+            latency.setdefault(stage, []).append({**dict(labels), **hist.summary()})
+        out: dict[str, Any] = {
+            "latency":  latency,
+            "counters": [{"name": n, **dict(l), "value": v} for (n, l), v in sorted(counters)],
+        }
+        for name, fn in collectors:
+            out[name] = self._collect(fn)
+        return out
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            hists      = sorted(self._hists.items(), key=lambda kv: kv[0])
+            counters   = sorted(self._counters.items())
+            collectors = list(self._collectors.items())
+
+        ns    = self.namespace
+        lines = []
+        if hists:
+            name = f"{ns}_stage_latency_ms"
+            lines += [
+                f"# HELP {name} Pipeline stage latency in milliseconds.",
+                f"# TYPE {name} summary",
+            ]
+            for (stage, labels), hist in hists:
+                base = (("stage", stage),) + labels
+                for q, v in hist.quantiles().items():
+                    lines.append(f"{name}{self._fmt(base + (('quantile', str(q)),))} {_num(v)}")
+                lines.append(f"{name}_sum{self._fmt(base)} {_num(hist.sum)}")
+                lines.append(f"{name}_count{self._fmt(base)} {hist.count}")
+
+        seen = set()
+        for (cname, labels), value in counters:
+            name = f"{ns}_{_metric_name(cname)}_total"
+            if name not in seen:
+                lines.append(f"# TYPE {name} counter")
+                seen.add(name)
+            lines.append(f"{name}{self._fmt(labels)} {_num(value)}")
+
+        for cname, fn in collectors:
+            for key, value in _flatten(self._collect(fn)):
+                name = f"{ns}_{_metric_name(cname)}_{_metric_name(key)}"
+                lines += [f"# TYPE {name} gauge", f"{name} {_num(value)}"]
+        return "\n".join(lines) + "\n"
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+    @staticmethod
+    def _labels(labels: Mapping[str, str]) -> _LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    @staticmethod
+    def _fmt(labels: _LabelKey) -> str:
+        if not labels:
+            return ""
+        esc = lambda v: v.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+        return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels) + "}"
+
+    @staticmethod
+    def _collect(fn: Callable[[], Mapping[str, Any]]) -> Any:
+        try:
+            return fn()
+        except Exception as exc:          # a broken collector must not break the scrape
+            return {"error": str(exc)}
+
+
+def _flatten(data: Any, prefix: str = "") -> Iterator[tuple[str, float]]:
+    if isinstance(data, Mapping):
+        for k, v in data.items():
+            yield from _flatten(v, f"{prefix}_{k}" if prefix else str(k))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield prefix, data
+
+
+def _metric_name(s: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", s)
+
+
+def _num(v: float) -> str:
+    if isinstance(v, float) and math.isnan(v):
+        return "NaN"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,195 @@
+"""
+In-memory OHLCV resampling — higher timeframes from one base series.
+Extended with:
+  • Bar keys for any "N" minutes / "Nh" / "ND" / "NW" / "NM" interval in
+    exchange wall-clock time, with intraday buckets restarting each day
+    (optionally at a session open such as "09:30")
+  • Vectorized aggregation: one reduceat per column, no groupby
+  • ResampleCache — when the base series only grew at the end, re-aggregates
+    just the trailing (possibly partial) bar instead of the whole history
+
+Each output bar is labelled with the timestamp of its first base bar, so a
+partial bar keeps its label as it fills in.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+_UNIT_SECONDS = {"": 60, "m": 60, "h": 3600, "D": 86400, "W": 7 * 86400, "M": 30 * 86400}
+_EPOCH_MONDAY = 3            # 1970-01-01 is a Thursday: (days + 3) // 7 counts Monday-based weeks
+
+
+def parse_interval(tv_interval: str) -> tuple[int, str]:
+    """TradingView interval → (count, unit): "5" → (5, ""), "4h" → (4, "h"), "1W" → (1, "W")."""
+    m = re.fullmatch(r"(\d*)([mhHDdWM]?)", tv_interval.strip())
+    if not m or (not m.group(1) and not m.group(2)):
+        return 1, "D"
+    return int(m.group(1) or 1), {"H": "h", "d": "D"}.get(m.group(2), m.group(2))
+
+
+def interval_seconds(tv_interval: str) -> int:
+    """Bar length in seconds for a TradingView interval ("5", "60", "4h", "D", "1W" …)."""
+    count, unit = parse_interval(tv_interval)
+    return count * _UNIT_SECONDS[unit]
+
+
+def bar_keys(
+    index:    pd.DatetimeIndex,
+    interval: str,
+    tz:       Optional[str] = None,
+    start:    Optional[str] = None,
+) -> np.ndarray:
+    """
+    Integer bucket of every timestamp for ``interval`` bars. A tz-aware
+    index is read as wall-clock time in ``tz`` (default: its own zone),
+    a naive one as local. ``start`` ("09:30", "18:00") moves the day's
+    first bucket — intraday buckets restart every day, like TradingView.
+    """
+    local = index
+    if tz is not None and local.tz is not None:
+        local = local.tz_convert(tz)
+    if local.tz is not None:
+        local = local.tz_localize(None)
+    if start:
+        hours, _, minutes = start.partition(":")
+        local = local - pd.Timedelta(hours=int(hours), minutes=int(minutes or 0))
+
+    count, unit = parse_interval(interval)
+    ticks = local.asi8                           # in the index's own resolution (s / ms / us / ns)
+    day   = int(np.timedelta64(1, "D") // np.timedelta64(1, local.unit))
+    days  = ticks // day
+    if unit in ("", "m", "h"):
+        step    = count * _UNIT_SECONDS[unit] * day // 86400
+        per_day = -(-day // step)
+        return days * per_day + (ticks - days * day) // step
+    if unit == "D":
+        return days // count
+    if unit == "W":
+        return ((days + _EPOCH_MONDAY) // 7) // count
+    return (local.year.to_numpy() * 12 + local.month.to_numpy() - 1) // count
+
+
+def resample_ohlcv(
+    df:       pd.DataFrame,
+    interval: str,
+    tz:       Optional[str] = None,
+    start:    Optional[str] = None,
+) -> pd.DataFrame:
+    """Aggregate a time-sorted OHLCV frame into ``interval`` bars (see ``bar_keys``)."""
+    if df.empty:
+        return df.iloc[:0]
+    keys  = bar_keys(df.index, interval, tz, start)
+    first = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    last  = np.concatenate((first[1:], [len(keys)])) - 1
+
+    out = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col == "open":
+            out[col] = values[first]
+        elif col == "high":
+            out[col] = np.maximum.reduceat(values, first)
+        elif col == "low":
+            out[col] = np.minimum.reduceat(values, first)
+        elif col == "volume":
+            out[col] = np.add.reduceat(values, first)
+        else:                                    # close and anything else: last value of the bar
+            out[col] = values[last]
+    return pd.DataFrame(out, index=df.index[first])
+
+
+@dataclass
+class _Resampled:
+    frame:      pd.DataFrame
+    base_first: pd.Timestamp
+    base_len:   int
+    base_last:  pd.Timestamp
+    tail_pos:   int              # base row where the frame's last bar starts
+
+
+class ResampleCache:
+    """
+    Thread-safe LRU of resampled frames keyed on (key, interval, tz, start).
+
+    ``get`` with a base series that extends the cached one (same first bar,
+    old last bar still in place) re-aggregates only from the start of the
+    last resampled bar — the partial bar and any new ones. Anything else
+    (trimmed or rewritten history) is rebuilt in full.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._lock       = threading.Lock()
+        self._data: OrderedDict[Hashable, _Resampled] = OrderedDict()
+        self.hits        = 0        # served by re-aggregating the tail only
+        self.misses      = 0        # full resample
+
+    def get(
+        self,
+        key:      Hashable,
+        base:     pd.DataFrame,
+        interval: str,
+        tz:       Optional[str] = None,
+        start:    Optional[str] = None,
+    ) -> pd.DataFrame:
+        if base.empty:
+            return base.iloc[:0]
+        slot = (key, interval, tz, start)
+        with self._lock:
+            entry = self._data.get(slot)
+            if entry is not None:
+                self._data.move_to_end(slot)
+
+        if entry is not None and self._extends(entry, base):
+            tail  = resample_ohlcv(base.iloc[entry.tail_pos:], interval, tz, start)
+            frame = pd.concat([entry.frame.iloc[:-1], tail])
+            tail_pos = entry.tail_pos + base.index[entry.tail_pos:].get_loc(tail.index[-1])
+            hit = True
+        else:
+            frame    = resample_ohlcv(base, interval, tz, start)
+            tail_pos = base.index.get_loc(frame.index[-1])
+            hit = False
+
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if self.max_entries > 0:
+                self._data[slot] = _Resampled(
+                    frame, base.index[0], len(base), base.index[-1], int(tail_pos),
+                )
+                self._data.move_to_end(slot)
+                while len(self._data) > self.max_entries:
+                    self._data.popitem(last=False)
+        return frame
+
+    @staticmethod
+    def _extends(entry: _Resampled, base: pd.DataFrame) -> bool:
+        return (
+            len(base) >= entry.base_len
+            and base.index[0] == entry.base_first
+            and base.index[entry.base_len - 1] == entry.base_last
+        )
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries":   len(self._data),
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
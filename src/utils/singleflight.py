@@ -0,0 +1,70 @@
+"""
+SingleFlight — coalesce concurrent calls for the same key into one execution.
+
+The first caller for a key runs the function; callers arriving while it is
+in flight block and receive the same result (or the same exception).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done    = threading.Event()
+        self.result  = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock  = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.executed = 0      # calls that actually ran fn
+        self.shared   = 0      # calls served by someone else's in-flight run
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared  += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "executed":  self.executed,
+                "shared":    self.shared,
+                "in_flight": len(self._calls),
+            }
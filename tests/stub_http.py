@@ -0,0 +1,62 @@
+"""
+Local stub HTTP server for notification tests.
+
+Speaks HTTP/1.1 keep-alive, records every request, counts distinct client
+connections, and can delay or fail per path:
+
+    with StubHTTPServer() as srv:
+        srv.routes["/slow"] = (0.5, 200)       # (delay seconds, status)
+        router.add_slack(srv.url("/slow"))
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHTTPServer:
+    def __init__(self) -> None:
+        self.routes: dict[str, tuple[float, int]] = {}
+        self.requests: list[tuple[str, dict]] = []
+        self.connections: set[tuple[str, int]] = set()
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub._lock:
+                    stub.connections.add(self.client_address)
+                    stub.requests.append((self.path, json.loads(body or b"{}")))
+                delay, status = stub.routes.get(self.path, (0.0, 200))
+                time.sleep(delay)
+                payload = b'{"ok": true}'
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, path: str = "/") -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self) -> "StubHTTPServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,289 @@
+"""Tests for alert processing: worker queue, notification routing and the stream hub."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from src.alerts.handler import AlertResult
+from src.alerts.hub     import HubFull, SignalHub
+from src.alerts.parser  import AlertParser
+from src.alerts.router  import AlertRouter
+from src.alerts.workers import AlertQueue, QueueFull
+from src.indicators.custom import CompositeSignal
+from src.utils.metrics  import MetricsRegistry
+
+from .stub_http import StubHTTPServer
+
+
+def make_alert(ticker: str = "AAPL"):
+    return AlertParser().parse(f'{{"ticker": "{ticker}", "price": 100, "interval": "1h"}}')
+
+
+class BlockingHandler:
+    """Stand-in AlertHandler that blocks until released."""
+
+    def __init__(self, result=None) -> None:
+        self.release = threading.Event()
+        self.result  = result
+
+    def handle(self, alert):
+        self.release.wait(5)
+        return self.result
+
+
+class TestAlertQueue:
+    def test_rejects_when_full(self):
+        handler = BlockingHandler()
+        jobs    = AlertQueue(handler, AlertRouter(), workers=1, max_size=1).start()
+        try:
+            jobs.submit(make_alert())               # picked up by the worker
+            deadline = time.monotonic() + 2
+            while jobs.stats()["depth"] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            jobs.submit(make_alert())               # fills the single slot
+            with pytest.raises(QueueFull):
+                jobs.submit(make_alert())
+            assert jobs.stats()["rejected"] == 1
+        finally:
+            handler.release.set()
+            jobs.stop()
+
+    def test_failed_handle_marks_job_failed(self):
+        handler = BlockingHandler(result=None)
+        handler.release.set()
+        jobs = AlertQueue(handler, AlertRouter(), workers=1).start()
+        job  = jobs.submit(make_alert())
+        jobs.stop()
+        assert jobs.get(job.id).status == "failed"
+        assert jobs.stats()["failed"] == 1
+
+    def test_stop_with_full_backlog_returns(self):
+        handler = BlockingHandler()
+        jobs    = AlertQueue(handler, AlertRouter(), workers=1, max_size=1).start()
+        jobs.submit(make_alert())
+        deadline = time.monotonic() + 2
+        while jobs.stats()["depth"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        jobs.submit(make_alert())                   # worker blocked, backlog full
+        t0 = time.monotonic()
+        jobs.stop(timeout=0.3)
+        assert time.monotonic() - t0 < 1
+        handler.release.set()
+
+    def test_stats_read_the_registry_histograms(self):
+        handler = BlockingHandler(result=None)
+        handler.release.set()
+        metrics = MetricsRegistry()
+        jobs    = AlertQueue(handler, AlertRouter(), workers=1, metrics=metrics).start()
+        for _ in range(3):
+            jobs.submit(make_alert())
+        jobs.stop()
+        stats = jobs.stats()
+        assert stats["wait_ms"] == metrics.summary("queue_wait") and stats["wait_ms"]["count"] == 3
+        assert stats["processing_ms"]["count"] == 3
+
+
+def make_result(ticker: str = "AAPL", rating: str = "BUY") -> AlertResult:
+    composite = CompositeSignal(
+        score=0.42, rating=rating, rsi_signal="neutral", macd_signal="bullish_cross",
+        bb_signal="neutral", st_signal="bullish", vwap_signal="above_vwap",
+    )
+    alert = make_alert(ticker)
+    return AlertResult(
+        alert=alert, composite=composite, processed_at=alert.timestamp, latency_ms=12.0,
+    )
+
+
+class TestAlertRouter:
+    def test_channels_run_concurrently(self):
+        with StubHTTPServer() as srv:
+            srv.routes["/slack"]   = (0.3, 200)
+            srv.routes["/discord"] = (0.3, 200)
+            router = AlertRouter()
+            router.add_slack(srv.url("/slack"))
+            router.add_discord(srv.url("/discord"))
+            report = router.dispatch(make_result())
+        assert report.ok
+        assert [o.channel for o in report.outcomes] == ["slack", "discord"]
+        assert report.total_ms < 550                     # serial would be ≥ 600ms
+        assert {p for p, _ in srv.requests} == {"/slack", "/discord"}
+
+    def test_slow_channel_times_out_without_blocking_others(self):
+        with StubHTTPServer() as srv:
+            srv.routes["/slow"] = (1.0, 200)
+            router = AlertRouter()
+            router.add_slack(srv.url("/slow"), timeout=0.2)
+            router.add_discord(srv.url("/fast"))
+            report = router.dispatch(make_result())
+        slow, fast = report.outcomes
+        assert not slow.ok and "timed out" in slow.error
+        assert fast.ok and fast.status == 200
+        assert report.total_ms < 900
+
+    def test_connections_are_reused(self):
+        with StubHTTPServer() as srv:
+            router = AlertRouter()
+            router.add_slack(srv.url("/hook"))
+            for _ in range(5):
+                router.dispatch(make_result())
+            stats = router._http.stats()
+        assert len(srv.requests) == 5
+        assert len(srv.connections) == 1
+        assert stats["opened"] == 1 and stats["reused"] == 4
+
+    def test_http_error_and_exception_reported(self):
+        def broken(result):
+            raise RuntimeError("boom")
+
+        with StubHTTPServer() as srv:
+            srv.routes["/err"] = (0.0, 500)
+            router = AlertRouter()
+            router.add_slack(srv.url("/err"))
+            router.add_custom(broken, name="broken")
+            report = router.dispatch(make_result())
+        err, exc = report.outcomes
+        assert not err.ok and err.status == 500
+        assert not exc.ok and exc.error == "boom"
+        assert report.to_dict()["ok"] is False
+
+    @staticmethod
+    def _saturated(queued_timeout: float):
+        """One worker busy for 0.3s on the first channel; the second channel waits in the queue."""
+        sent   = []
+        router = AlertRouter(max_workers=1)
+        router.add_custom(lambda r: time.sleep(0.3), name="busy", timeout=1.0)
+
+        def queued(r):
+            time.sleep(0.2)
+            sent.append(r.alert.ticker)
+        router.add_custom(queued, name="queued", timeout=queued_timeout)
+        return router, sent
+
+    def test_timeout_counts_from_send_start_when_saturated(self):
+        router, sent = self._saturated(queued_timeout=0.4)
+        busy, queued = router.dispatch(make_result()).outcomes
+        assert busy.ok
+        assert queued.ok and queued.latency_ms < 400          # 0.3s queued + 0.2s sending
+        assert sent == ["AAPL"]
+
+    def test_channel_queued_past_its_timeout_is_dropped_not_sent_late(self):
+        router, sent = self._saturated(queued_timeout=0.1)
+        busy, queued = router.dispatch(make_result()).outcomes
+        assert busy.ok
+        assert not queued.ok and "not started" in queued.error
+        time.sleep(0.4)                                       # the worker is free again
+        assert sent == []
+
+
+class TestAsyncDispatch:
+    def test_http_channels_share_one_loop(self):
+        async def burst(router):
+            sends   = (router.dispatch_async(make_result()) for _ in range(20))
+            reports = await asyncio.gather(*sends)
+            stats   = router._ahttp.stats()
+            await router.aclose()
+            return reports, stats
+
+        with StubHTTPServer() as srv:
+            srv.routes["/slack"] = (0.3, 200)
+            router = AlertRouter()
+            router.add_slack(srv.url("/slack"))
+            t0 = time.perf_counter()
+            reports, stats = asyncio.run(burst(router))
+            elapsed = time.perf_counter() - t0
+        assert all(r.ok and r.outcomes[0].status == 200 for r in reports)
+        assert len(srv.requests) == 20 and srv.requests[0][1]["text"]
+        assert elapsed < 3                                 # 20 × 0.3s in parallel, not in series
+        assert stats["opened"] == 20
+
+    def test_timeouts_errors_and_custom_channels(self):
+        calls = []
+
+        with StubHTTPServer() as srv:
+            srv.routes["/slow"] = (1.0, 200)
+            srv.routes["/err"]  = (0.0, 503)
+            router = AlertRouter()
+            router.add_slack(srv.url("/slow"), timeout=0.2)
+            router.add_discord(srv.url("/err"))
+            router.add_custom(calls.append, name="log")
+            report = asyncio.run(router.dispatch_async(make_result()))
+        slow, err, custom = report.outcomes
+        assert not slow.ok and "timed out" in slow.error
+        assert not err.ok and err.status == 503
+        assert custom.ok and len(calls) == 1
+        assert report.total_ms < 900
+
+    def test_custom_channel_clock_starts_with_send(self):
+        router, sent = TestAlertRouter._saturated(queued_timeout=0.4)
+        busy, queued = asyncio.run(router.dispatch_async(make_result())).outcomes
+        assert busy.ok and queued.ok and sent == ["AAPL"]
+
+        router, sent = TestAlertRouter._saturated(queued_timeout=0.1)
+        _, queued = asyncio.run(router.dispatch_async(make_result())).outcomes
+        time.sleep(0.4)
+        assert not queued.ok and "not started" in queued.error and sent == []
+
+    def test_keep_alive_reuse(self):
+        async def sequential(router):
+            for _ in range(5):
+                await router.dispatch_async(make_result())
+            stats = router._ahttp.stats()
+            await router.aclose()
+            return stats
+
+        with StubHTTPServer() as srv:
+            router = AlertRouter()
+            router.add_slack(srv.url("/hook"))
+            stats = asyncio.run(sequential(router))
+        assert len(srv.connections) == 1
+        assert stats["opened"] == 1 and stats["reused"] == 4
+
+
+class TestSignalHub:
+    def test_filters_by_ticker_and_rating(self):
+        hub  = SignalHub()
+        aapl = hub.subscribe(tickers=["aapl"])
+        buys = hub.subscribe(ratings=["strong buy"])
+        feed = hub.subscribe()
+        assert hub.publish(make_result("AAPL", "BUY")) == 2
+        assert hub.publish(make_result("MSFT", "STRONG BUY")) == 2
+        assert [aapl.get(0).ticker, aapl.get(0)] == ["AAPL", None]
+        assert [buys.get(0).ticker, buys.get(0)] == ["MSFT", None]
+        assert [feed.get(0).ticker, feed.get(0).ticker] == ["AAPL", "MSFT"]
+
+    def test_event_frame_is_sse(self):
+        hub = SignalHub()
+        with hub.subscribe() as sub:
+            hub.publish(make_result())
+            event = sub.get(0)
+        head, data = event.frame.decode().rstrip("\n").split("\ndata: ")
+        assert head == f"id: {event.id}\nevent: signal"
+        assert json.loads(data)["rating"] == "BUY" and "components" in json.loads(data)
+        assert hub.stats()["subscribers"] == 0
+
+    def test_slow_subscriber_drops_oldest(self):
+        hub  = SignalHub(buffer=3)
+        slow = hub.subscribe()
+        for i in range(5):
+            hub.publish(make_result(f"T{i}"))
+        assert [slow.get(0).ticker for _ in range(3)] == ["T2", "T3", "T4"]
+        assert slow.dropped == 2 and hub.stats()["dropped"] == 2
+
+    def test_get_wakes_on_publish_and_close(self):
+        hub = SignalHub()
+        sub = hub.subscribe()
+        threading.Timer(0.05, hub.publish, (make_result(),)).start()
+        assert sub.get(2).ticker == "AAPL"
+        threading.Timer(0.05, sub.close).start()
+        t0 = time.monotonic()
+        assert sub.get(2) is None and time.monotonic() - t0 < 1
+
+    def test_subscriber_limit(self):
+        hub = SignalHub(max_subscribers=1)
+        sub = hub.subscribe()
+        with pytest.raises(HubFull):
+            hub.subscribe()
+        sub.close()
+        hub.subscribe().close()
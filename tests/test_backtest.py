@@ -0,0 +1,128 @@
+"""Tests for the vectorized backtester, the universe runner and the weight optimizer."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest import Backtester, load_bars, run_universe, summary
+from src.backtest.optimize import build_components, evaluate, random_candidates, search
+from src.indicators.custom import CustomSignalEngine, _RATINGS
+from src.utils import BarStore
+from src.utils.data_fetcher import DataFetcher
+
+BUY, NEUTRAL, SELL = (_RATINGS.index(r) for r in ("BUY", "NEUTRAL", "SELL"))
+
+
+class TestBacktester:
+    def test_buy_and_hold_pays_costs_once(self):
+        close = np.array([100.0, 110.0, 121.0, 133.1])
+        res   = Backtester(fee_bps=5, slippage_bps=5).run_arrays(close, [BUY] * 4)[0]
+        # bought at the first close, held over bars 1..3
+        assert res.total_return == pytest.approx(0.999 * 1.331 - 1)
+        assert res.trades == 1 and res.hit_rate == 1.0
+        assert res.turnover == 1.0
+        assert res.exposure == pytest.approx(0.75)
+
+    def test_position_starts_the_bar_after_the_signal(self):
+        close = np.array([100.0, 50.0, 100.0])
+        res   = Backtester(fee_bps=0, slippage_bps=0).run_arrays(close, [NEUTRAL, BUY, BUY])[0]
+        assert res.total_return == pytest.approx(1.0)      # missed the drop, caught the rebound
+
+    def test_neutral_holds_and_sell_exits(self):
+        close = np.array([100.0, 101.0, 102.0, 103.0, 104.0, 105.0])
+        bt    = Backtester(fee_bps=0, slippage_bps=0)
+        res   = bt.run_arrays(close, [BUY, NEUTRAL, SELL, NEUTRAL, BUY, NEUTRAL])[0]
+        assert res.trades == 2
+        assert res.total_return == pytest.approx(102 / 100 * 105 / 104 - 1)
+
+    def test_short_side_and_drawdown(self):
+        close = np.array([100.0, 120.0, 100.0])
+        bt    = Backtester(fee_bps=0, slippage_bps=0, allow_short=True)
+        res   = bt.run_arrays(close, [SELL] * 3)[0]
+        assert res.total_return == pytest.approx(0.8 * (1 + 1 / 6) - 1)
+        assert res.max_drawdown == pytest.approx(-0.2)
+        assert (res.trades, res.hit_rate) == (1, 0.0)
+
+    def test_rows_are_independent(self):
+        rng   = np.random.default_rng(0)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (3, 400)), axis=1))
+        codes = rng.integers(0, len(_RATINGS), (3, 400))
+        index = pd.date_range("2024-01-01", periods=400, freq="h")
+        bt    = Backtester()
+        together = bt.run_arrays(close, codes, index)
+        for i in range(3):
+            alone = bt.run_arrays(close[i], codes[i], index)[0]
+            assert together[i].to_dict() | {"ticker": "0"} == alone.to_dict()
+
+    def test_run_uses_engine_history(self):
+        df  = DataFetcher._synthetic_data("AAPL", 600)
+        res = Backtester().run(df, "AAPL")
+        assert res.bars == 600 and res.equity.index.equals(df.index)
+        assert np.isfinite(res.sharpe) and res.max_drawdown <= 0
+
+
+class BrokenOn(Backtester):
+    """Raises for one ticker, like a malformed frame would in the engine."""
+
+    def __init__(self, bad: str) -> None:
+        super().__init__()
+        self.bad = bad
+
+    def run(self, ohlcv, ticker="", keep_equity=True):
+        if ticker == self.bad:
+            raise ValueError("malformed frame")
+        return super().run(ohlcv, ticker, keep_equity)
+
+
+class TestRunUniverse:
+    def test_pool_matches_in_process(self):
+        tickers = ["AAA", "BBB", "CCC"]
+        serial  = summary(run_universe(tickers, processes=1, bars=500))
+        pooled  = summary(run_universe(tickers, processes=2, bars=500))
+        pd.testing.assert_frame_equal(serial, pooled)
+
+    def test_reads_bar_store_and_skips_missing(self, tmp_path):
+        store = BarStore(tmp_path)
+        df    = DataFetcher._synthetic_data("AAPL", 300).tz_localize("UTC")
+        store.write("AAPL", "60m", df)
+        assert load_bars("AAPL", "1h", str(tmp_path)).index.equals(df.index)
+        results = run_universe(["AAPL", "MISSING"], "1h", store_dir=str(tmp_path), processes=1)
+        assert [r.ticker for r in results] == ["AAPL"]
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_failing_ticker_is_recorded_not_fatal(self, processes):
+        results = run_universe(["AAA", "BAD"], backtester=BrokenOn("BAD"), processes=processes,
+                               bars=300)
+        by      = {r.ticker: r for r in results}
+        assert by["AAA"].error is None and by["AAA"].bars == 300
+        assert by["BAD"].error == "ValueError: malformed frame" and np.isnan(by["BAD"].sharpe)
+
+
+@pytest.fixture(scope="module")
+def components():
+    return build_components(["AAA", "BBB"], bars=800, processes=1)
+
+
+class TestOptimizer:
+    def test_default_candidate_matches_backtester(self, components):
+        weights    = np.array([list(CustomSignalEngine().weights.values())])
+        thresholds = np.array([CustomSignalEngine().thresholds])
+        _, total   = evaluate(components, weights, thresholds)
+        results    = run_universe(["AAA", "BBB"], bars=800, processes=1)
+        assert total[0] == pytest.approx(np.mean([r.total_return for r in results]), rel=1e-9)
+
+    def test_search_ranks_and_pool_matches_serial(self, components):
+        weights, thresholds = random_candidates(60, seed=1)
+        serial = search(components, weights, thresholds, processes=1, top=5)
+        pooled = search(components, weights, thresholds, processes=2, top=5)
+        assert serial == pooled
+        assert [c.sharpe for c in serial] == sorted((c.sharpe for c in serial), reverse=True)
+        engine = CustomSignalEngine(**{k: v for k, v in serial[0].profile().items() if k != "meta"})
+        assert engine.thresholds == serial[0].thresholds
+
+    def test_component_cache_round_trip(self, components, tmp_path):
+        path   = tmp_path / "components.npz"
+        built  = build_components(["AAA", "BBB"], bars=800, processes=1, cache=path)
+        loaded = build_components(["AAA", "BBB"], bars=800, processes=1, cache=path)
+        np.testing.assert_array_equal(loaded.scores, components.scores)
+        assert (loaded.tickers, loaded.key) == (built.tickers, built.key)
@@ -0,0 +1,34 @@
+"""Tests for the benchmark harness (tiny sizes — not a benchmark run)."""
+
+import io
+
+from benchmarks.bench_indicators import Result, compare, run
+
+
+def test_run_small_sizes():
+    results = run(sizes=[200], tickers=[2], repeat=1, out=io.StringIO())
+    names   = {r.name for r in results}
+    assert {"rsi/200", "macd/200", "bb/200", "st/200", "vwap/200", "engine/200",
+            "history/200", "batch/2x500"} == names
+    assert all(r.ms > 0 and r.peak_kb > 0 for r in results)
+
+
+def test_only_filters_cases():
+    results = run(sizes=[200], tickers=[2], only={"st"}, repeat=1, out=io.StringIO())
+    assert [r.name for r in results] == ["st/200"]
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = {
+        "rsi/200":  {"ms": 1.0,  "peak_kb": 100.0},
+        "st/200":   {"ms": 10.0, "peak_kb": 100.0},
+        "bb/200":   {"ms": 0.01, "peak_kb": 100.0},
+    }
+    results = [
+        Result("rsi/200", 1.2,  100.0),      # +20% — within threshold
+        Result("st/200",  13.0, 400.0),      # +30% time, 4x memory
+        Result("bb/200",  0.03, 100.0),      # 3x, but below the noise floor
+        Result("new/200", 99.0, 999.0),      # not in baseline
+    ]
+    found = {(r.name, r.metric) for r in compare(results, baseline, threshold=0.25)}
+    assert found == {("st/200", "ms"), ("st/200", "peak_kb")}
@@ -0,0 +1,392 @@
+"""Tests for DataFetcher caching, interval helpers and resampling."""
+
+import datetime as dt
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.bar_store    import BarStore
+from src.utils.cache        import BarCache, SignalCache
+from src.utils.data_fetcher import (
+    DataFetcher, history_days, interval_seconds, next_bar_close, yf_source,
+)
+from src.utils.resample     import ResampleCache, resample_ohlcv
+from src.utils.singleflight import SingleFlight
+
+
+class FakeClock:
+    def __init__(self, t: float = 1_700_000_000.0) -> None:
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def frame(rows: int = 10) -> pd.DataFrame:
+    return DataFetcher._synthetic_data("TEST", rows)
+
+
+class TestIntervals:
+    @pytest.mark.parametrize("tv,seconds", [
+        ("1", 60), ("15", 900), ("60", 3600), ("240", 14400),
+        ("1h", 3600), ("4h", 14400), ("D", 86400), ("1W", 604800),
+    ])
+    def test_interval_seconds(self, tv, seconds):
+        assert interval_seconds(tv) == seconds
+
+    @pytest.mark.parametrize("tv,base", [
+        ("1h", ("730d", "60m", "1h")), ("4h", ("730d", "60m", "60")), ("3h", ("730d", "60m", "60")),
+        ("45", ("60d", "15m", "15")), ("2D", ("5y", "1d", "1D")), ("W", ("10y", "1wk", "W")),
+    ])
+    def test_yf_source(self, tv, base):
+        assert yf_source(tv) == base
+
+    def test_next_bar_close_hourly(self):
+        t = dt.datetime(2024, 3, 5, 10, 17, tzinfo=dt.timezone.utc).timestamp()
+        close = dt.datetime.fromtimestamp(next_bar_close("1h", t), dt.timezone.utc)
+        assert close == dt.datetime(2024, 3, 5, 11, 0, tzinfo=dt.timezone.utc)
+
+    def test_next_bar_close_weekly_is_monday(self):
+        t = dt.datetime(2024, 3, 6, 12, 0, tzinfo=dt.timezone.utc).timestamp()
+        close = dt.datetime.fromtimestamp(next_bar_close("W", t), dt.timezone.utc)
+        assert close.weekday() == 0 and close > dt.datetime.fromtimestamp(t, dt.timezone.utc)
+
+
+    def test_next_bar_close_follows_session_anchor(self):
+        anchor = dt.datetime(2024, 3, 5, 9, 30, tzinfo=dt.timezone.utc).timestamp()
+        t      = dt.datetime(2024, 3, 5, 14, 17, tzinfo=dt.timezone.utc).timestamp()
+        close  = dt.datetime.fromtimestamp(next_bar_close("1h", t, anchor), dt.timezone.utc)
+        assert close == dt.datetime(2024, 3, 5, 14, 30, tzinfo=dt.timezone.utc)
+        assert next_bar_close("1h", anchor, anchor) == anchor + 3600      # open → close of one bar
+
+
+class TestBarCache:
+    def test_hit_and_expiry(self):
+        clock = FakeClock()
+        cache = BarCache(clock=clock)
+        cache.put(("AAPL", "1h"), frame(), expires_at=clock.t + 60)
+        assert cache.get(("AAPL", "1h")) is not None
+        clock.t += 61
+        assert cache.get(("AAPL", "1h")) is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+
+    def test_lru_eviction_by_count(self):
+        cache = BarCache(max_entries=2)
+        for key in ("A", "B"):
+            cache.put(key, frame(), expires_at=float("inf"))
+        cache.get("A")                               # B is now least recently used
+        cache.put("C", frame(), expires_at=float("inf"))
+        assert cache.get("B") is None
+        assert cache.get("A") is not None and cache.get("C") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_lru_eviction_by_bytes(self):
+        one   = int(frame(100).memory_usage(index=True, deep=True).sum())
+        cache = BarCache(max_bytes=int(one * 2.5))
+        for key in ("A", "B", "C"):
+            cache.put(key, frame(100), expires_at=float("inf"))
+        assert len(cache) == 2 and cache.get("A") is None
+        assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+class TestSignalCache:
+    def test_reused_until_last_bar_changes(self):
+        cache, calls = SignalCache(), []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        df = frame(50)
+        assert cache.get_or_compute("k", df, compute) == 1
+        assert cache.get_or_compute("k", df.copy(), compute) == 1
+        assert cache.get_or_compute("k", frame(51), compute) == 2        # new bar
+        live = frame(51)
+        live.iloc[-1, live.columns.get_loc("close")] += 1.0
+        assert cache.get_or_compute("k", live, compute) == 3             # live bar moved
+        assert cache.get_or_compute("other", live, compute) == 4
+        assert cache.stats()["hit_ratio"] == 0.2
+
+    def test_concurrent_misses_compute_once(self):
+        cache, calls, gate = SignalCache(), [], threading.Event()
+
+        def compute():
+            calls.append(1)
+            gate.wait(1)
+            return "sig"
+
+        threads = [
+            threading.Thread(target=cache.get_or_compute, args=("k", frame(), compute))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        gate.set()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
+
+
+class TestDataFetcherCache:
+    def test_second_get_is_cached(self, monkeypatch):
+        calls   = []
+        fetcher = DataFetcher(use_synthetic=True)
+        real    = fetcher._fetch
+        monkeypatch.setattr(fetcher, "_fetch", lambda t, i: calls.append(t) or real(t, i))
+        a = fetcher.get("AAPL", "1h")
+        b = fetcher.get("AAPL", "1h")
+        fetcher.get("AAPL", "D")
+        assert a is b
+        assert calls == ["AAPL", "AAPL"]
+        assert fetcher.cache_stats()["hits"] == 1
+
+    def test_synthetic_fallback_is_not_cached(self, monkeypatch):
+        calls   = []
+        fetcher = DataFetcher()
+
+        def down(ticker, interval):
+            calls.append(ticker)
+            raise ConnectionError("yahoo down")
+
+        monkeypatch.setattr(fetcher, "_yfinance", down)
+        df = fetcher.get("AAPL", "1h")
+        assert not df.empty
+        fetcher.get("AAPL", "1h")
+        assert calls == ["AAPL", "AAPL"]
+        assert fetcher.cache_stats()["entries"] == 0
+
+    def test_strict_fetcher_raises_instead_of_synthesizing(self, monkeypatch):
+        fetcher = DataFetcher(fallback_synthetic=False)
+
+        def down(ticker, interval):
+            raise ConnectionError("yahoo down")
+
+        monkeypatch.setattr(fetcher, "_yfinance", down)
+        with pytest.raises(ConnectionError):
+            fetcher.get("AAPL", "1h")
+
+    def test_cache_expires_at_anchored_bar_close(self, monkeypatch):
+        fetcher = DataFetcher()
+        idx     = pd.date_range("2024-01-02 09:30", periods=20, freq="h", tz="America/New_York")
+        bars    = frame(20).set_index(idx)
+        monkeypatch.setattr(fetcher, "_yfinance", lambda t, i: bars)
+        fetcher.get("AAPL", "1h")
+        expires = fetcher.cache._data[("AAPL", "1h")].expires_at
+        assert expires > time.time() and expires % 3600 == 1800
+
+    def test_cache_can_be_disabled(self):
+        fetcher = DataFetcher(use_synthetic=True, use_cache=False)
+        assert fetcher.get("AAPL") is not fetcher.get("AAPL")
+        assert fetcher.cache_stats() == {}
+
+
+def tz_frame(start: str, rows: int, seed: str = "TEST") -> pd.DataFrame:
+    df = DataFetcher._synthetic_data(seed, rows)
+    df.index = pd.date_range(start, periods=rows, freq="h", tz="America/New_York", unit="ns")
+    return df
+
+
+class TestBarStore:
+    def test_round_trip_keeps_values_and_timezone(self, tmp_path):
+        store = BarStore(tmp_path)
+        df    = tz_frame("2024-01-02 09:00", 50)
+        store.write("AAPL", "60m", df)
+        out = store.read("AAPL", "60m")
+        pd.testing.assert_frame_equal(out, df, check_freq=False)
+        assert store.last_timestamp("AAPL", "60m") == df.index[-1]
+
+    def test_append_overwrites_overlapping_tail(self, tmp_path):
+        store = BarStore(tmp_path)
+        full  = tz_frame("2024-01-02 09:00", 60)
+        store.write("AAPL", "60m", full.iloc[:40])
+        stale = full.iloc[39:40].copy()
+        store.append("AAPL", "60m", stale * 0 + 1)       # in-progress bar, later revised
+        store.append("AAPL", "60m", full.iloc[39:])
+        pd.testing.assert_frame_equal(store.read("AAPL", "60m"), full, check_freq=False)
+
+    def test_torn_write_is_ignored(self, tmp_path):
+        store = BarStore(tmp_path)
+        store.write("AAPL", "60m", tz_frame("2024-01-02 09:00", 10))
+        path = store._dir("AAPL", "60m") / "close.f8"
+        path.write_bytes(path.read_bytes()[:40])
+        assert store.read("AAPL", "60m") is None
+        assert store.last_timestamp("AAPL", "60m") is None
+
+    def test_write_interrupted_between_columns_is_ignored(self, tmp_path, monkeypatch):
+        store = BarStore(tmp_path)
+        store.write("AAPL", "60m", tz_frame("2024-01-02 09:00", 10))
+
+        def crash_at_close(file, *args, **kwargs):
+            if str(file).endswith("close.f8"):
+                raise OSError("killed mid-write")
+            return open(file, *args, **kwargs)
+
+        monkeypatch.setattr("src.utils.bar_store.open", crash_at_close, raising=False)
+        with pytest.raises(OSError):
+            store.append("AAPL", "60m", tz_frame("2024-01-02 15:00", 10) + 1)
+        monkeypatch.undo()
+        # ts…low already hold the new rows and every column is long enough
+        assert store.read("AAPL", "60m") is None
+        assert store.last_timestamp("AAPL", "60m") is None
+
+
+class TestIncrementalFetch:
+    def test_second_fetch_requests_only_new_bars(self, tmp_path, monkeypatch):
+        full    = tz_frame("2024-01-02 09:00", 100)
+        calls   = []
+        fetcher = DataFetcher(use_cache=False, store=BarStore(tmp_path))
+
+        def fake_download(ticker, interval, period=None, start=None):
+            calls.append(start)
+            if start is None:
+                return full.iloc[:80]
+            return full[full.index >= start]
+
+        monkeypatch.setattr(fetcher, "_download", fake_download)
+        first  = fetcher.get("AAPL", "1h")
+        second = fetcher.get("AAPL", "1h")
+        assert calls[0] is None and calls[1] == full.index[79]
+        assert len(first) == 80
+        pd.testing.assert_frame_equal(second, full, check_freq=False)
+
+    def test_resampled_interval_reaggregates_tail(self, tmp_path, monkeypatch):
+        full    = tz_frame("2024-01-02 09:00", 100)
+        fetcher = DataFetcher(use_cache=False, store=BarStore(tmp_path))
+        monkeypatch.setattr(fetcher, "_download", lambda ticker, interval, period=None, start=None:
+                            full.iloc[:81] if start is None else full[full.index >= start])
+        first  = fetcher.get("AAPL", "4h")
+        second = fetcher.get("AAPL", "4h")
+        assert fetcher.store.read("AAPL", "60m") is not None         # base bars are what's stored
+        pd.testing.assert_frame_equal(first, resample_ohlcv(full.iloc[:81], "4h"))
+        pd.testing.assert_frame_equal(second, resample_ohlcv(full, "4h"), check_freq=False)
+        assert fetcher.stats()["resample"]["hits"] == 1
+
+    def test_empty_increment_serves_store(self, tmp_path, monkeypatch):
+        full    = tz_frame("2024-01-02 09:00", 30)
+        fetcher = DataFetcher(use_cache=False, store=BarStore(tmp_path))
+        fetcher.store.write("AAPL", "60m", full)
+        monkeypatch.setattr(fetcher, "_download", lambda *a, **kw: full.iloc[:0])
+        pd.testing.assert_frame_equal(fetcher.get("AAPL", "1h"), full, check_freq=False)
+
+
+class TestHistoryWindow:
+    def test_history_days_covers_bars(self):
+        assert history_days("D", 250) >= 350            # ~250 trading days a year
+        assert history_days("1h", 300) >= 300 / 6.5 * 7 / 5
+        assert history_days("1W", 100) >= 700
+
+    def test_download_window_trimmed_to_history_bars(self, monkeypatch):
+        windows = []
+        fetcher = DataFetcher(use_cache=False, history_bars=300)
+
+        def fake_download(ticker, interval, **window):
+            windows.append(window)
+            return frame()
+
+        monkeypatch.setattr(fetcher, "_download", fake_download)
+        fetcher.get("AAPL", "D")
+        start = windows[0]["start"]
+        age   = (dt.datetime.now(dt.timezone.utc) - start).days
+        assert history_days("D", 300) - 1 <= age <= history_days("D", 300)
+
+        fetcher.history_bars = 100_000                    # more than the default period
+        fetcher.get("AAPL", "D")
+        assert windows[1] == {"period": "5y"}
+
+    def test_download_window_covers_two_vwap_sessions(self, monkeypatch):
+        windows = []
+        fetcher = DataFetcher(use_cache=False, history_bars=300, history_session=pd.Timedelta("7D"))
+
+        def fake_download(ticker, interval, **window):
+            windows.append(window)
+            return frame()
+
+        monkeypatch.setattr(fetcher, "_download", fake_download)
+        fetcher.get("AAPL", "1h")
+        age = (dt.datetime.now(dt.timezone.utc) - windows[0]["start"]).days
+        assert age >= history_days("1h", 300) + 14 - 1
+        fetcher.get("AAPL", "1W")                         # one bar per session: full period
+        assert windows[1] == {"period": "10y"}
+
+
+class TestSingleFlight:
+    @staticmethod
+    def _burst(fn, n: int = 20) -> list:
+        barrier = threading.Barrier(n)
+        out     = [None] * n
+
+        def worker(i):
+            barrier.wait()
+            try:
+                out[i] = fn()
+            except Exception as exc:
+                out[i] = exc
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        return out
+
+    def test_concurrent_fetches_coalesce(self, monkeypatch):
+        calls   = []
+        fetcher = DataFetcher(use_synthetic=True, use_cache=False)
+
+        def slow_fetch(ticker, interval):
+            calls.append(ticker)
+            time.sleep(0.2)
+            return frame()
+
+        monkeypatch.setattr(fetcher, "_fetch", slow_fetch)
+        results = self._burst(lambda: fetcher.get("AAPL", "1h"))
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        stats = fetcher.stats()["singleflight"]
+        assert stats["executed"] == 1 and stats["shared"] == 19
+
+    def test_error_reaches_every_waiter(self):
+        flight = SingleFlight()
+
+        def boom():
+            time.sleep(0.2)
+            raise RuntimeError("upstream down")
+
+        results = self._burst(lambda: flight.do("k", boom), n=5)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flight.in_flight() == 0
+
+
+class TestResample:
+    @pytest.mark.parametrize("tv,rule", [("15", "15min"), ("4h", "4h"), ("3h", "3h"), ("D", "D")])
+    def test_matches_pandas_resample(self, tv, rule):
+        df   = frame(2000)
+        want = df.resample(rule).agg({
+            "open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum",
+        }).dropna()
+        got  = resample_ohlcv(df, tv)
+        np.testing.assert_array_equal(got.to_numpy(), want.to_numpy())
+        assert got.index.equals(want.index)
+
+    def test_session_start_and_labels(self):
+        idx = pd.date_range("2024-01-02 09:30", periods=7, freq="h", tz="America/New_York")
+        df  = pd.DataFrame({"close": np.arange(7.0), "volume": np.ones(7)}, index=idx)
+        out = resample_ohlcv(df, "4h", start="09:30")
+        assert list(out.index.strftime("%H:%M")) == ["09:30", "13:30"]
+        assert list(out["close"]) == [3.0, 6.0] and list(out["volume"]) == [4.0, 3.0]
+
+    def test_weeks_open_on_monday(self):
+        out = resample_ohlcv(frame(24 * 30), "W")
+        assert (out.index[1:].dayofweek == 0).all()
+
+    def test_cache_reaggregates_only_the_tail(self):
+        df    = frame(1000)
+        cache = ResampleCache()
+        for n in (500, 503, 503, 520, 1000):
+            got = cache.get("T", df.iloc[:n], "4h")
+            pd.testing.assert_frame_equal(got, resample_ohlcv(df.iloc[:n], "4h"))
+        assert (cache.hits, cache.misses) == (4, 1)
+        cache.get("T", df.iloc[100:], "4h")                  # trimmed history → rebuilt
+        assert cache.misses == 2
@@ -1,13 +1,21 @@
 """Unit tests for indicator calculations."""
 
+import json
+
 import numpy as np
 import pandas as pd
 import pytest
+from benchmarks.reference   import supertrend_iloc
 from src.indicators.rsi     import RSIIndicator, RSISignal
 from src.indicators.macd    import MACDIndicator, MACDSignal
 from src.indicators.bb      import BollingerBands, BBSignal
 from src.indicators.supertrend import SuperTrend
+from src.indicators.kernels import JIT_AVAILABLE, supertrend_bands
+from src.indicators.vwap    import VWAPIndicator
 from src.indicators.custom  import CustomSignalEngine
+from src.indicators.graph   import ComputeGraph, ema, hl2, sub, true_range, typical_price
+from src.indicators.mtf     import ConfluenceEngine, parse_timeframes
+from src.utils.resample     import resample_ohlcv
 
 
 def make_price_series(n: int = 100, seed: int = 42) -> pd.Series:
@@ -87,6 +95,123 @@ class TestSuperTrend:
         st = SuperTrend().calculate(df["high"], df["low"], df["close"])
         assert 0.0 <= st.strength <= 1.0
 
+    @pytest.mark.parametrize("n,seed", [(1, 0), (2, 1), (100, 42), (2_000, 7)])
+    def test_bit_identical_to_iloc_reference(self, n, seed):
+        df  = make_ohlcv(n, seed)
+        ref_st, ref_dir = supertrend_iloc(df["high"], df["low"], df["close"])
+        st  = SuperTrend().calculate(df["high"], df["low"], df["close"])
+        assert np.array_equal(st.supertrend.to_numpy(), ref_st.to_numpy(), equal_nan=True)
+        assert np.array_equal(st.direction.to_numpy(), ref_dir.to_numpy())
+
+    @pytest.mark.skipif(not JIT_AVAILABLE, reason="numba not installed")
+    def test_jit_matches_fallback(self):
+        df  = make_ohlcv(5_000, 3)
+        hl2 = ((df["high"] + df["low"]) / 2).to_numpy()
+        atr = SuperTrend()._atr(df["high"], df["low"], df["close"]).to_numpy()
+        args = (hl2 + 3 * atr, hl2 - 3 * atr, df["close"].to_numpy())
+        jit  = supertrend_bands(*args, use_jit=True)
+        pure = supertrend_bands(*args, use_jit=False)
+        for a, b in zip(jit, pure):
+            assert np.array_equal(a, b)
+
+
+def hourly(
+    df: pd.DataFrame, start: str = "2024-03-04 09:00", tz: str | None = None,
+) -> pd.DataFrame:
+    return df.set_index(pd.date_range(start, periods=len(df), freq="h", tz=tz))
+
+
+class TestVWAPSessions:
+    def test_daily_reset_matches_per_day_vwap(self):
+        df  = hourly(make_ohlcv(120))
+        hlcv = lambda f: (f["high"], f["low"], f["close"], f["volume"])
+        res  = VWAPIndicator(session_reset="daily").calculate(*hlcv(df))
+        for _, day in df.groupby(df.index.date):
+            ref = VWAPIndicator(session_reset=False).calculate(*hlcv(day))
+            np.testing.assert_allclose(res.vwap[day.index], ref.vwap, rtol=1e-12)
+            np.testing.assert_allclose(res.upper_2[day.index], ref.upper_2, rtol=1e-12)
+
+    def test_exchange_timezone_boundaries(self):
+        df  = hourly(make_ohlcv(48), "2024-03-04 00:00", tz="UTC")
+        ny  = VWAPIndicator(timezone="America/New_York")
+        res = ny.calculate(df["high"], df["low"], df["close"], df["volume"])
+        tp  = (df["high"] + df["low"] + df["close"]) / 3
+        # New York midnight is 05:00 UTC: a new session opens there, not at 00:00 UTC
+        assert res.vwap.iloc[5] == pytest.approx(tp.iloc[5])
+        assert res.vwap.iloc[24] != pytest.approx(tp.iloc[24])
+
+    def test_weekly_and_custom_sessions(self):
+        df = hourly(make_ohlcv(400))
+        h, l, c, v = df["high"], df["low"], df["close"], df["volume"]
+        tp = (h + l + c) / 3
+        weekly = VWAPIndicator(session_reset="weekly").calculate(h, l, c, v).vwap
+        monday = df.index[(df.index.dayofweek == 0) & (df.index.hour == 0)][0]
+        assert weekly[monday] == pytest.approx(tp[monday])
+        evening = VWAPIndicator(session_start="18:00").calculate(h, l, c, v).vwap
+        opens   = df.index.hour == 18
+        np.testing.assert_allclose(evening[opens], tp[opens], rtol=1e-12)
+
+    def test_bars_at_session_length_stay_cumulative(self):
+        df = make_ohlcv(60).set_index(pd.date_range("2024-01-01", periods=60, freq="D"))
+        h, l, c, v = df["high"], df["low"], df["close"], df["volume"]
+        daily = VWAPIndicator().calculate(h, l, c, v)
+        assert daily.vwap.equals(VWAPIndicator(session_reset=False).calculate(h, l, c, v).vwap)
+
+    def test_third_band(self):
+        df  = hourly(make_ohlcv(50))
+        two = VWAPIndicator().calculate(df["high"], df["low"], df["close"], df["volume"])
+        res = VWAPIndicator(bands=3).calculate(df["high"], df["low"], df["close"], df["volume"])
+        assert two.upper_3 is None
+        np.testing.assert_allclose(res.upper_3 - res.vwap, 3 * (res.vwap - res.lower_1), rtol=1e-9)
+
+    def test_lookback_starts_at_previous_session(self):
+        df = hourly(make_ohlcv(100), "2024-03-04 00:00")
+        assert VWAPIndicator().lookback(index=df.index) == 4            # bar[-2]: day from bar 96
+        assert VWAPIndicator().lookback(index=df.index[:-3]) == 24 + 1  # bar[-2]: the day before
+        eng = CustomSignalEngine(tolerance=1e-6, strict=True)
+        h, l, c, v = df["high"], df["low"], df["close"], df["volume"]
+        assert eng.run(h, l, c, v) == CustomSignalEngine().run(h, l, c, v)
+        assert eng.mismatches == 0
+
+
+class TestAnchoredVWAP:
+    def test_many_matches_single_anchors(self):
+        df = hourly(make_ohlcv(300))
+        h, l, c, v = df["high"], df["low"], df["close"], df["volume"]
+        ind = VWAPIndicator()
+        many = ind.anchored_many(h, l, c, v, [0, 40, 250, -10])
+        assert many.vwap.shape == (4, 300)
+        for row, pos in enumerate(many.anchors):
+            ref = ind.anchored(h, l, c, v, int(pos))
+            assert np.isnan(many.vwap[row, :pos]).all()
+            np.testing.assert_allclose(many.vwap[row, pos:], ref.vwap, rtol=1e-10)
+
+    def test_std_is_volume_weighted_deviation(self):
+        df  = hourly(make_ohlcv(200))
+        h, l, c, v = df["high"], df["low"], df["close"], df["volume"]
+        res = VWAPIndicator().anchored_many(h, l, c, v, [120])
+        tp, vol = ((h + l + c) / 3).iloc[120:], v.iloc[120:]
+        vwap    = (tp * vol).cumsum() / vol.cumsum()
+        var     = [
+            (vol.iloc[:t + 1] * (tp.iloc[:t + 1] - vwap.iloc[t]) ** 2).sum()
+            / vol.iloc[:t + 1].sum()
+            for t in range(len(tp))
+        ]
+        np.testing.assert_allclose(res.std[0, 120:], np.sqrt(var), rtol=1e-6, atol=1e-5)
+        np.testing.assert_allclose(res.upper(2) - res.lower(2), 4 * res.std)
+
+    def test_timestamp_anchors_use_next_bar(self):
+        df  = hourly(make_ohlcv(100), "2024-03-04 00:00", tz="America/New_York")
+        res = VWAPIndicator().anchored_many(
+            df["high"], df["low"], df["close"], df["volume"],
+            ["2024-03-05", pd.Timestamp("2024-03-05 10:30"), 3],
+        )
+        assert list(res.anchors) == [24, 35, 3]
+        with pytest.raises(ValueError):
+            VWAPIndicator().anchored_many(
+                df["high"], df["low"], df["close"], df["volume"], ["2030-01-01"],
+            )
+
 
 class TestCustomSignalEngine:
     def test_score_in_range(self):
@@ -106,3 +231,326 @@ class TestCustomSignalEngine:
         eng = CustomSignalEngine()
         sig = eng.run(df["high"], df["low"], df["close"])   # no volume
         assert sig.rating is not None
+
+    def test_profile_weights_and_thresholds(self, tmp_path):
+        df   = make_ohlcv(300)
+        eng  = CustomSignalEngine(
+            weights    = {"rsi": 0.0, "macd": 0.0, "bb": 0.0, "st": 1.0, "vwap": 0.0},
+            thresholds = (0.9, 0.5, -0.5, -0.9),
+        )
+        path = tmp_path / "profile.json"
+        path.write_text(json.dumps(eng.to_profile(source="test")))
+        loaded = CustomSignalEngine.from_profile(path)
+        assert (loaded.weights, loaded.thresholds) == (eng.weights, eng.thresholds)
+
+        sig  = loaded.run(df["high"], df["low"], df["close"], df["volume"])
+        assert sig.score == sig.components["st"]
+        hist = loaded.history(df["high"], df["low"], df["close"], df["volume"])
+        assert hist["rating"].iloc[-1] == sig.rating and hist["score"].iloc[-1] == sig.score
+
+    def test_fingerprint_tracks_parameters(self):
+        base = CustomSignalEngine().fingerprint()
+        assert CustomSignalEngine().fingerprint() == base
+        assert CustomSignalEngine(weights={"rsi": 0.5}).fingerprint() != base
+        eng = CustomSignalEngine()
+        eng.rsi.period = 21
+        assert eng.fingerprint() != base
+
+    def test_thresholds_must_descend(self):
+        with pytest.raises(ValueError):
+            CustomSignalEngine(thresholds=(0.1, 0.5, -0.1, -0.5))
+
+
+class TestComputeGraph:
+    def test_nodes_match_pandas_exactly(self):
+        df = make_ohlcv(500)
+        h, l, c = df["high"], df["low"], df["close"]
+        g  = ComputeGraph(high=h, low=l, close=c)
+        tr = pd.concat([h - l, (h - c.shift()).abs(), (l - c.shift()).abs()], axis=1).max(axis=1)
+        assert g[true_range()].equals(tr)
+        assert g[hl2()].equals((h + l) / 2)
+        assert g[typical_price()].equals((h + l + c) / 3)
+        macd = c.ewm(span=12, adjust=False).mean() - c.ewm(span=26, adjust=False).mean()
+        signal = macd.ewm(span=9, adjust=False).mean()
+        assert g[ema(sub(ema("close", 12), ema("close", 26)), 9)].equals(signal)
+
+    def test_shared_nodes_computed_once(self):
+        df = make_ohlcv(300)
+        _, nodes = CustomSignalEngine().profile(df["high"], df["low"], df["close"], df["volume"])
+        names = [n.node for n in nodes]
+        assert len(names) == len(set(names))
+        by_name = {n.node: n for n in nodes}
+        assert by_name["hl_sum(high,low)"].hits == 1          # SuperTrend hl2 + VWAP tp
+        assert by_name["delta(close)"].hits == 1              # RSI gains + losses
+        # the VWAP session node is None without a DatetimeIndex
+        assert all(n.nbytes == 300 * 8 for n in nodes if not n.node.startswith("session("))
+
+    def test_engine_matches_standalone_indicators(self):
+        df  = make_ohlcv(400)
+        h, l, c, v = df["high"], df["low"], df["close"], df["volume"]
+        sig, _ = CustomSignalEngine().profile(h, l, c, v)
+        assert sig.rsi_signal  == RSIIndicator().calculate(c).signal.value
+        assert sig.macd_signal == MACDIndicator().calculate(c).event.value
+        assert sig.bb_signal   == BollingerBands().calculate(c).signal.value
+        assert sig.st_signal   == SuperTrend().calculate(h, l, c).signal.value
+        assert sig.vwap_signal == VWAPIndicator().calculate(h, l, c, v).signal.value
+        assert sig == CustomSignalEngine().run(h, l, c, v)
+
+    def test_prune_keeps_inputs_and_needed_nodes(self):
+        df = make_ohlcv(50)
+        g  = ComputeGraph(high=df["high"], low=df["low"], close=df["close"])
+        g[true_range()]
+        g[ema("close", 12)]
+        g.prune([ema(true_range(), 10)])
+        assert true_range() in g and "close" in g
+        assert ema("close", 12) not in g
+
+    def test_missing_input(self):
+        with pytest.raises(KeyError):
+            ComputeGraph(close=make_price_series())[typical_price()]
+
+
+class TestWarmup:
+    def test_ema_warmup_matches_tolerance(self):
+        from src.indicators.graph import warmup
+        close = make_price_series(2000)
+        bars  = warmup(ema("close", 26), 1e-8)
+        full  = close.ewm(span=26, adjust=False).mean().iloc[-1]
+        tail  = close.iloc[-(bars + 1):].ewm(span=26, adjust=False).mean().iloc[-1]
+        assert abs(tail - full) / full < 1e-8
+        assert warmup(typical_price(), 1e-8) == 0
+
+    def test_vwap_needs_full_history(self):
+        assert VWAPIndicator(session_reset=False).lookback() is None
+        assert VWAPIndicator().lookback() is None                 # no index: session open unknown
+        assert CustomSignalEngine().lookback() is None
+        assert CustomSignalEngine().lookback(volume=False) == max(
+            RSIIndicator().lookback(), MACDIndicator().lookback(),
+            BollingerBands().lookback(), SuperTrend().lookback(),
+        )
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_trimmed_run_matches_full_history(self, seed):
+        df   = make_ohlcv(3000, seed)
+        h, l, c, v = df["high"], df["low"], df["close"], df["volume"]
+        eng  = CustomSignalEngine(tolerance=1e-6, strict=True)
+        assert eng.run(h, l, c, v) == CustomSignalEngine().run(h, l, c, v)
+        assert eng.run(h, l, c)    == CustomSignalEngine().run(h, l, c)
+        assert eng.mismatches == 0
+
+    def test_strict_mode_falls_back_on_mismatch(self):
+        df  = make_ohlcv(600)
+        h, l, c = df["high"], df["low"], df["close"]
+        eng = CustomSignalEngine(tolerance=0.5, strict=True)     # absurdly loose → too short
+        eng.st.settle = 0
+        eng.rsi.period = 60
+        ref = CustomSignalEngine()
+        ref.rsi.period = 60
+        assert eng.run(h, l, c) == ref.run(h, l, c)
+        assert eng.mismatches == 1
+
+
+class TestStreaming:
+    def test_rsi_stream_matches_batch(self):
+        close  = make_price_series(300)
+        batch  = RSIIndicator().calculate(close)
+        stream = RSIIndicator().stream(close)
+        assert np.array_equal([stream.last], [batch.last], equal_nan=True)
+        assert stream.signal == batch.signal
+        assert stream.divergence == batch.divergence
+
+    def test_macd_stream_matches_batch(self):
+        close  = make_price_series(300)
+        batch  = MACDIndicator().calculate(close)
+        stream = MACDIndicator().stream(close)
+        assert stream.last_macd == batch.last_macd
+        assert stream.last_hist == batch.last_hist
+        assert stream.event == batch.event
+
+    def test_bb_stream_matches_batch(self):
+        close  = make_price_series(300)
+        batch  = BollingerBands().calculate(close)
+        stream = BollingerBands().stream(close)
+        assert stream.upper == pytest.approx(float(batch.upper.iloc[-1]), rel=1e-12)
+        assert stream.lower == pytest.approx(float(batch.lower.iloc[-1]), rel=1e-12)
+        assert stream.signal == batch.signal
+
+    def test_bb_stream_tracks_batch_every_bar(self):
+        close  = make_price_series(2000, seed=7) * 500     # BTC-like level: cancellation-prone
+        batch  = BollingerBands().calculate(close)
+        stream = BollingerBands().stream(close.iloc[:20])
+        for t in range(20, len(close)):
+            signal = stream.update(close.iloc[t])
+            # documented tolerance: pandas' rolling mean/std agree to ~1e-12 relative
+            assert stream.upper == pytest.approx(float(batch.upper.iloc[t]), rel=1e-12), t
+            assert stream.lower == pytest.approx(float(batch.lower.iloc[t]), rel=1e-12), t
+            if t % 50 == 0:
+                assert signal == BollingerBands().calculate(close.iloc[: t + 1]).signal, t
+
+    def test_supertrend_stream_matches_batch(self):
+        df     = make_ohlcv(300)
+        batch  = SuperTrend().calculate(df["high"], df["low"], df["close"])
+        stream = SuperTrend().stream(df["high"], df["low"], df["close"])
+        assert stream.supertrend == float(batch.supertrend.iloc[-1])
+        assert stream.direction == int(batch.direction.iloc[-1])
+        assert stream.signal == batch.signal
+        assert stream.strength == batch.strength
+
+    def test_vwap_session_stream_matches_batch(self):
+        df     = hourly(make_ohlcv(200), tz="America/New_York")
+        h, l, c, v = df["high"], df["low"], df["close"], df["volume"]
+        batch  = VWAPIndicator().calculate(h, l, c, v)
+        stream = VWAPIndicator().stream(h.iloc[:150], l.iloc[:150], c.iloc[:150], v.iloc[:150])
+        for ts, bar in df.iloc[150:].iterrows():
+            stream.update(bar["high"], bar["low"], bar["close"], bar["volume"], ts)
+        assert stream.vwap == pytest.approx(batch.last, rel=1e-12)
+        assert stream.signal == batch.signal
+
+    def test_vwap_stream_matches_batch_across_session_boundaries(self):
+        df     = hourly(make_ohlcv(60), "2024-03-04 23:00")   # opens on a session's last bar
+        stream = VWAPIndicator().stream()
+        for t, (ts, bar) in enumerate(df.iterrows()):
+            stream.update(bar["high"], bar["low"], bar["close"], bar["volume"], ts)
+            p     = df.iloc[: t + 1]
+            batch = VWAPIndicator().calculate(p["high"], p["low"], p["close"], p["volume"])
+            assert stream.vwap == pytest.approx(batch.last, rel=1e-12), t
+            upper = float(batch.upper_1.iloc[-1])
+            assert stream.vwap + stream.std == pytest.approx(upper, rel=1e-9), t
+            assert stream.signal == batch.signal, t
+
+    def test_vwap_stream_matches_batch(self):
+        df     = make_ohlcv(300)
+        batch  = VWAPIndicator().calculate(df["high"], df["low"], df["close"], df["volume"])
+        stream = VWAPIndicator().stream(df["high"], df["low"], df["close"], df["volume"])
+        assert stream.vwap == batch.last
+        assert stream.signal == batch.signal
+
+    def test_engine_update_tracks_run_bar_by_bar(self):
+        df     = make_ohlcv(260)
+        eng    = CustomSignalEngine()
+        cols   = lambda end: (df[col][:end] for col in ("high", "low", "close", "volume"))
+        stream = eng.stream(*cols(200))
+        for i in range(200, 260):
+            sig = stream.update(df.iloc[i])
+            ref = eng.run(*cols(i + 1))
+            assert sig == ref
+
+    def test_engine_without_volume(self):
+        df     = make_ohlcv()
+        stream = CustomSignalEngine().stream(df["high"], df["low"], df["close"])
+        assert stream.last == CustomSignalEngine().run(df["high"], df["low"], df["close"])
+        assert stream.last.vwap_signal == "n/a"
+
+
+class TestBatchEngine:
+    @staticmethod
+    def _universe(n_tickers: int = 12, n: int = 150):
+        frames = [make_ohlcv(n, seed) for seed in range(n_tickers)]
+        stack  = lambda col: np.vstack([f[col].to_numpy() for f in frames])
+        return frames, stack("high"), stack("low"), stack("close"), stack("volume")
+
+    def test_matches_run_per_ticker(self):
+        frames, h, l, c, v = self._universe()
+        eng   = CustomSignalEngine()
+        batch = eng.run_batch(h, l, c, v, tickers=[f"T{i}" for i in range(len(frames))])
+        for i, df in enumerate(frames):
+            ref = eng.run(df["high"], df["low"], df["close"], df["volume"])
+            row = batch.loc[f"T{i}"]
+            assert row["rating"] == ref.rating
+            assert row["score"] == ref.score
+            for k in ("rsi", "macd", "bb", "st", "vwap"):
+                assert row[f"{k}_signal"] == getattr(ref, f"{k}_signal")
+                assert row[k] == ref.components[k]
+
+    def test_left_padded_rows_match_shorter_history(self):
+        frames, h, l, c, v = self._universe(4, 120)
+        for m in (h, l, c, v):
+            m[1, :40] = np.nan
+        batch = CustomSignalEngine().run_batch(h, l, c, v)
+        short = frames[1].iloc[40:]
+        ref   = CustomSignalEngine().run(*(short[k] for k in ("high", "low", "close", "volume")))
+        assert batch.iloc[1]["rating"] == ref.rating
+        assert batch.iloc[1]["score"] == ref.score
+        assert batch.iloc[1]["st_signal"] == ref.st_signal
+
+    def test_session_vwap_matches_run_with_shared_index(self):
+        frames = [hourly(make_ohlcv(150, seed), tz="America/New_York") for seed in range(4)]
+        stack  = lambda col: np.vstack([f[col].to_numpy() for f in frames])
+        eng   = CustomSignalEngine()
+        hlcv  = map(stack, ("high", "low", "close", "volume"))
+        batch = eng.run_batch(*hlcv, index=frames[0].index)
+        for i, df in enumerate(frames):
+            ref = eng.run(df["high"], df["low"], df["close"], df["volume"])
+            assert batch.iloc[i]["vwap_signal"] == ref.vwap_signal
+            assert batch.iloc[i]["vwap"] == ref.components["vwap"]
+            assert (batch.iloc[i]["rating"], batch.iloc[i]["score"]) == (ref.rating, ref.score)
+
+    def test_index_length_mismatch_raises(self):
+        _, h, l, c, v = self._universe(3, 100)
+        index = pd.date_range("2024-01-02", periods=99, freq="h")
+        with pytest.raises(ValueError):
+            CustomSignalEngine().run_batch(h, l, c, v, index=index)
+
+    def test_without_volume(self):
+        _, h, l, c, _ = self._universe(3)
+        batch = CustomSignalEngine().run_batch(h, l, c)
+        assert (batch["vwap_signal"] == "n/a").all()
+        assert (batch["vwap"] == 0.0).all()
+
+    def test_shape_mismatch_raises(self):
+        _, h, l, c, _ = self._universe(3)
+        with pytest.raises(ValueError):
+            CustomSignalEngine().run_batch(h[:, :-1], l, c)
+
+
+class TestSignalHistory:
+    @pytest.mark.parametrize("with_volume, start", [
+        (True,  "2024-03-04 09:00"),
+        (False, "2024-03-04 09:00"),
+        (True,  "2024-03-04 23:00"),                     # first bar is a session's last
+    ])
+    def test_every_bar_matches_run(self, with_volume, start):
+        df  = hourly(make_ohlcv(160, seed=3), start)
+        h, l, c = df["high"], df["low"], df["close"]
+        v   = df["volume"] if with_volume else None
+        eng = CustomSignalEngine()
+        hist = eng.history(h, l, c, v)
+        assert hist.index.equals(df.index)
+        for t in range(len(df)):
+            upto = slice(0, t + 1)
+            vol  = v.iloc[upto] if with_volume else None
+            ref  = eng.run(h.iloc[upto], l.iloc[upto], c.iloc[upto], vol)
+            row = hist.iloc[t]
+            assert (row["rating"], row["score"]) == (ref.rating, ref.score), t
+            for k in ("rsi", "macd", "bb", "st", "vwap"):
+                assert row[f"{k}_signal"] == getattr(ref, f"{k}_signal"), (t, k)
+                assert row[k] == ref.components[k], (t, k)
+
+    def test_last_row_matches_batch(self):
+        df    = make_ohlcv(200)
+        eng   = CustomSignalEngine()
+        hist  = eng.history(df["high"], df["low"], df["close"], df["volume"])
+        batch = eng.run_batch(*(df[col].to_numpy() for col in ("high", "low", "close", "volume")))
+        assert hist.iloc[-1].equals(batch.iloc[0].rename(hist.index[-1]))
+
+
+class TestConfluence:
+    def test_weighted_over_resampled_frames(self):
+        df  = hourly(make_ohlcv(24 * 60), "2024-01-01")
+        mtf = ConfluenceEngine(timeframes={"1h": 1.0, "4h": 1.0, "D": 2.0})
+        sig = mtf.run(df, key="T")
+        eng = CustomSignalEngine()
+        for tf in ("4h", "D"):
+            bars = resample_ohlcv(df, tf)
+            hlcv = bars["high"], bars["low"], bars["close"], bars["volume"]
+            assert sig.frames[tf] == eng.run(*hlcv)
+        want = (sig.frames["1h"].score + sig.frames["4h"].score + 2 * sig.frames["D"].score) / 4
+        assert sig.score == round(want, 4)
+        assert ConfluenceEngine(timeframes=mtf.timeframes, max_workers=1).run(df) == sig
+
+    def test_rejects_timeframes_below_base(self):
+        with pytest.raises(ValueError):
+            ConfluenceEngine(timeframes={"15": 1.0, "1h": 1.0}, base="1h")
+
+    def test_parse_timeframes(self):
+        assert parse_timeframes("1h:0.25, 4h:0.35,D") == {"1h": 0.25, "4h": 0.35, "D": 1.0}
@@ -0,0 +1,62 @@
+"""Tests for the in-process metrics registry."""
+
+import math
+
+import pytest
+from src.utils.metrics import Histogram, MetricsRegistry
+
+
+class TestHistogram:
+    def test_quantiles_nearest_rank(self):
+        h = Histogram()
+        for v in range(1, 101):
+            h.observe(float(v))
+        q = h.quantiles()
+        assert (q[0.5], q[0.95], q[0.99]) == (50.0, 95.0, 99.0)
+        assert h.count == 100 and h.max == 100.0
+
+    def test_window_bounds_quantiles_not_totals(self):
+        h = Histogram(window=10)
+        for v in range(1000):
+            h.observe(float(v))
+        assert h.quantiles()[0.5] >= 990
+        assert h.count == 1000
+
+    def test_empty(self):
+        assert math.isnan(Histogram().quantiles()[0.5])
+        assert Histogram().summary()["count"] == 0
+
+
+class TestMetricsRegistry:
+    def test_timer_labels_can_be_amended(self):
+        m = MetricsRegistry()
+        with m.timer("fetch", cache="miss") as labels:
+            labels["cache"] = "hit"
+        stages = m.snapshot()["latency"]["fetch"]
+        assert [s["cache"] for s in stages] == ["hit"]
+
+    def test_timer_records_on_exception(self):
+        m = MetricsRegistry()
+        with pytest.raises(ValueError):
+            with m.timer("parse"):
+                raise ValueError
+        assert m.snapshot()["latency"]["parse"][0]["count"] == 1
+
+    def test_prometheus_text(self):
+        m = MetricsRegistry()
+        m.observe("notify", 12.5, channel='sla"ck')
+        m.inc("notify_errors", channel="slack")
+        m.register("fetcher", lambda: {"cache": {"hits": 3, "hit_ratio": 0.5}, "label": "x"})
+        text = m.prometheus()
+        assert '# TYPE tv_stage_latency_ms summary' in text
+        assert 'tv_stage_latency_ms{stage="notify",channel="sla\\"ck",quantile="0.99"} 12.5' in text
+        assert 'tv_stage_latency_ms_count{stage="notify",channel="sla\\"ck"} 1' in text
+        assert 'tv_notify_errors_total{channel="slack"} 1' in text
+        assert "tv_fetcher_cache_hits 3" in text
+        assert "label" not in text
+
+    def test_broken_collector_does_not_break_scrape(self):
+        m = MetricsRegistry()
+        m.register("bad", lambda: 1 / 0)
+        assert "error" in m.snapshot()["bad"]
+        m.prometheus()
@@ -0,0 +1,54 @@
+"""Tests for the watchlist scanner."""
+
+import json
+
+import pandas as pd
+from src.scan import read_watchlist, scan
+from src.utils import BarStore, DataFetcher
+
+
+def test_read_watchlist(tmp_path):
+    path = tmp_path / "watchlist.txt"
+    path.write_text("aapl MSFT, nvda\n# a comment\nTSLA   # trailing\n\nAAPL\n")
+    assert read_watchlist(path) == ["AAPL", "MSFT", "NVDA", "TSLA"]
+
+
+def test_pool_matches_in_process_and_is_ranked():
+    tickers = [f"T{i}" for i in range(8)]
+    serial  = scan(tickers, source="synthetic", processes=1, bars=300)
+    pooled  = scan(tickers, source="synthetic", processes=2, bars=300)
+    assert serial.rows == pooled.rows
+    scores = [r.score for r in serial.rows]
+    assert scores == sorted(scores, reverse=True) and len(serial.ok) == 8
+
+
+def test_store_source_reports_missing_tickers(tmp_path):
+    bars = DataFetcher._synthetic_data("AAPL", 300).tz_localize("UTC")
+    BarStore(tmp_path).write("AAPL", "60m", bars)
+    report = scan(["MISSING", "AAPL"], source="store", store_dir=str(tmp_path), processes=1)
+    assert [r.ticker for r in report.rows] == ["AAPL", "MISSING"]
+    assert report.rows[0].bars == 300 and report.rows[1].error
+
+
+def test_live_source_and_output_files(tmp_path):
+    fetcher = DataFetcher(use_synthetic=True)
+    report  = scan(["AAPL", "MSFT"], source="live", fetcher=fetcher, processes=1)
+    assert len(report.ok) == 2 and report.fetch_s > 0 and report.throughput()["tickers_per_s"] > 0
+    report.write(tmp_path / "out.csv")
+    report.write(tmp_path / "out.json")
+    assert list(pd.read_csv(tmp_path / "out.csv")["ticker"]) == [r.ticker for r in report.rows]
+    rows = json.loads((tmp_path / "out.json").read_text())
+    assert [row["ticker"] for row in rows] == [r.ticker for r in report.rows]
+
+
+def test_failed_download_is_an_error_row(monkeypatch):
+    def down(self, ticker, interval):
+        if ticker == "GONE":
+            raise ValueError(f"No data returned from yfinance for {ticker}")
+        return DataFetcher._synthetic_data(ticker, 300)
+
+    monkeypatch.setattr(DataFetcher, "_yfinance", down)
+    report = scan(["GONE", "AAPL"], source="live", processes=1)
+    assert [r.ticker for r in report.ok] == ["AAPL"]
+    gone = report.rows[-1]
+    assert gone.ticker == "GONE" and "No data" in gone.error and gone.rating == ""
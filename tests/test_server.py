@@ -1,7 +1,13 @@
-"""Tests for the Flask webhook server."""
+"""Tests for the Flask webhook server and the asyncio (ASGI) server mode."""
 
+import asyncio
 import json
+import time
+from urllib.parse import unquote
+
+import pandas as pd
 import pytest
+from src.alerts     import AlertRouter
 from src.server     import create_app
 from src.utils      import DataFetcher
 
@@ -53,3 +59,413 @@ def test_signal_endpoint(client):
     data = r.json
     assert "rating" in data
     assert "score"  in data
+
+
+def test_signal_cache_reuses_unchanged_series(client):
+    first  = client.get("/signal/MSFT?interval=1h").json
+    second = client.get("/signal/MSFT?interval=1h").json
+    assert first == second
+    stats = client.get("/stats").json["signal_cache"]
+    assert stats["hits"] >= 1 and stats["hit_ratio"] > 0
+
+
+def test_mtf_endpoint(client):
+    r = client.get("/mtf/AAPL")
+    assert r.status_code == 200
+    data = r.json
+    assert set(data["timeframes"]) == {"1h", "4h", "D"}
+    assert data["rating"] in {"STRONG BUY","BUY","NEUTRAL","SELL","STRONG SELL"}
+
+
+@pytest.fixture
+def async_client():
+    app = create_app(fetcher=DataFetcher(use_synthetic=True), async_mode=True, workers=2)
+    app.config["TESTING"] = True
+    with app.test_client() as c:
+        yield c
+    app.extensions["alert_queue"].stop()
+
+
+def wait_for(client, url: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        data = client.get(url).json
+        if data["status"] in {"done", "failed"}:
+            return data
+        time.sleep(0.02)
+    raise AssertionError(f"{url} did not finish")
+
+
+def test_async_webhook_returns_202_and_completes(async_client):
+    payload = json.dumps({"ticker": "AAPL", "price": 180.5, "interval": "1h"})
+    r = async_client.post("/webhook", data=payload, content_type="application/json")
+    assert r.status_code == 202
+    job = wait_for(async_client, r.json["status_url"])
+    assert job["status"] == "done"
+    assert job["rating"] in {"STRONG BUY","BUY","NEUTRAL","SELL","STRONG SELL"}
+    assert job["wait_ms"] is not None and job["processing_ms"] is not None
+
+    stats = async_client.get("/queue").json
+    assert stats["async"] and stats["completed"] == 1
+
+
+def test_async_webhook_still_validates(async_client):
+    r = async_client.post("/webhook", data=b"not json", content_type="application/json")
+    assert r.status_code == 400
+
+
+def test_unknown_alert_id(async_client):
+    assert async_client.get("/alerts/nope").status_code == 404
+
+
+def test_metrics_endpoints():
+    from src.utils import MetricsRegistry
+
+    metrics = MetricsRegistry()
+    app     = create_app(fetcher=DataFetcher(use_synthetic=True, metrics=metrics), metrics=metrics)
+    app.config["TESTING"] = True
+    payload = json.dumps({"ticker": "AAPL", "price": 180.5, "action": "buy", "interval": "1h"})
+    with app.test_client() as c:
+        for _ in range(2):
+            r = c.post("/webhook", data=payload, content_type="application/json")
+            assert r.status_code == 200
+
+        text   = c.get("/metrics").get_data(as_text=True)
+        stages = (
+            "parse", "fetch", "rsi", "macd", "bb", "st", "vwap", "composite", "alert", "dispatch",
+        )
+        for stage in stages:
+            assert f'stage="{stage}"' in text
+        assert 'tv_stage_latency_ms_count{stage="fetch",cache="hit"} 1' in text
+        assert "tv_fetcher_singleflight_executed 1" in text
+
+        stats = c.get("/stats").json
+        assert {s["cache"] for s in stats["latency"]["fetch"]} == {"hit", "miss"}
+        assert stats["latency"]["alert"][0]["count"] == 2
+        assert stats["fetcher"]["cache"]["hits"] == 1
+
+
+def test_signal_reuses_shared_context(monkeypatch):
+    from src.indicators import CustomSignalEngine
+    from src.utils import MetricsRegistry
+
+    metrics = MetricsRegistry()
+    app     = create_app(fetcher=DataFetcher(use_synthetic=True, metrics=metrics), metrics=metrics)
+    app.config["TESTING"] = True
+    ctx     = app.extensions["context"]
+
+    built = []
+    init  = CustomSignalEngine.__init__
+    def counting_init(self, *a, **kw):
+        built.append(1)
+        init(self, *a, **kw)
+    monkeypatch.setattr(CustomSignalEngine, "__init__", counting_init)
+
+    payload = json.dumps({"ticker": "AAPL", "price": 180.5, "action": "buy", "interval": "1h"})
+    with app.test_client() as c:
+        assert c.post("/webhook", data=payload, content_type="application/json").status_code == 200
+        for _ in range(3):
+            assert c.get("/signal/AAPL?interval=1h").status_code == 200
+    assert built == []                                   # no per-request engines
+    assert ctx.signals.stats()["hits"] == 3              # served from the webhook's composite
+    assert ctx.fetcher.stats()["cache"]["misses"] == 1
+
+
+def test_context_from_config():
+    from config import Config
+    from src.server import ServerContext
+
+    class Demo(Config):
+        USE_SYNTHETIC        = True
+        SIGNAL_CACHE_ENTRIES = 16
+        CACHE_MAX_ENTRIES    = 8
+        MTF_TIMEFRAMES       = "1h:1,D:1"
+
+    ctx = ServerContext.from_config(Demo())
+    assert ctx.confluence.engine is ctx.engine and ctx.confluence.fetcher is ctx.fetcher
+    assert ctx.signals.max_entries == 16 and ctx.fetcher.cache.max_entries == 8
+    assert set(ctx.confluence.timeframes) == {"1h", "D"}
+    assert ctx.signal("AAPL", "1h").rating in {
+        "STRONG BUY", "BUY", "NEUTRAL", "SELL", "STRONG SELL",
+    }
+
+
+def test_injected_engine_is_not_rewired():
+    import pickle
+    from src.alerts.handler import AlertHandler
+    from src.indicators import CustomSignalEngine
+    from src.server import ServerContext
+    from src.utils import MetricsRegistry
+
+    metrics = MetricsRegistry()
+    engine  = CustomSignalEngine()
+    ctx     = ServerContext.build(engine=engine, metrics=metrics)
+    AlertHandler(ctx.fetcher, metrics=metrics, engine=engine)
+    assert engine.metrics is None
+    pickle.dumps(engine)                                 # still fit for a process pool
+    assert ServerContext.build(metrics=metrics).engine.metrics is metrics
+
+
+def test_session_vwap_still_trims_downloads():
+    from config import Config
+    from src.server import ServerContext
+
+    class Demo(Config):
+        USE_SYNTHETIC    = True
+        WARMUP_TOLERANCE = 1e-6
+        VWAP_SESSION     = "daily"
+        MTF_TIMEFRAMES   = "1h:1,4h:1"
+
+    fetcher = ServerContext.from_config(Demo()).fetcher
+    assert fetcher.history_bars is not None
+    assert fetcher.history_session == pd.Timedelta(days=1)
+
+    class Daily(Demo):
+        MTF_TIMEFRAMES = "1h:1,D:1"                       # daily bars: VWAP over every bar
+
+    assert ServerContext.from_config(Daily()).fetcher.history_bars is None
+
+
+def test_batch_signals_stream_ndjson(client):
+    body = {"tickers": ["aapl", "MSFT", "AAPL"], "intervals": ["1h", "D"]}
+    r    = client.post("/signals", json=body)
+    assert r.status_code == 200 and r.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in r.get_data(as_text=True).splitlines()]
+    assert sorted((row["ticker"], row["interval"]) for row in rows) == [
+        ("AAPL", "1h"), ("AAPL", "D"), ("MSFT", "1h"), ("MSFT", "D"),
+    ]
+    assert all("error" not in row and "latency_ms" in row for row in rows)
+
+    batch = next(row for row in rows if (row["ticker"], row["interval"]) == ("MSFT", "D"))
+    del batch["latency_ms"]
+    assert batch == client.get("/signal/MSFT?interval=D").json
+
+
+def test_batch_signals_strip_intervals(client):
+    r    = client.post("/signals", json={"tickers": [" msft "], "intervals": [" 1h", "1h "]})
+    rows = [json.loads(line) for line in r.get_data(as_text=True).splitlines()]
+    assert [(row["ticker"], row["interval"]) for row in rows] == [("MSFT", "1h")]
+    assert "error" not in rows[0]
+
+
+def test_batch_signals_report_failures_per_row():
+    class Flaky(DataFetcher):
+        def get(self, ticker, interval="1h"):
+            if ticker == "BAD":
+                raise ValueError("no data")
+            return super().get(ticker, interval)
+
+    app = create_app(fetcher=Flaky(use_synthetic=True), batch_max=3)
+    with app.test_client() as c:
+        r    = c.post("/signals", json={"tickers": ["BAD", "AAPL"]})
+        rows = [json.loads(line) for line in r.get_data(as_text=True).splitlines()]
+        assert {row["ticker"]: "error" in row for row in rows} == {"BAD": True, "AAPL": False}
+        too_many = {"tickers": ["A", "B"], "intervals": ["1h", "D"]}
+        assert c.post("/signals", json=too_many).status_code == 413
+        assert c.post("/signals", json={"tickers": []}).status_code == 400
+        assert c.post("/signals", data=b"nope", content_type="application/json").status_code == 400
+
+
+@pytest.mark.parametrize("body", [
+    {"tickers": {"AAPL": 1}},
+    {"tickers": 5},
+    {"tickers": ["AAPL", 5]},
+    {"tickers": ["  "]},
+    {"tickers": ["AAPL"], "intervals": {"1h": True}},
+    {"tickers": ["AAPL"], "intervals": 60},
+    {"tickers": ["AAPL"], "intervals": ["1h", None]},
+])
+def test_batch_signals_rejects_malformed_fields(client, body):
+    r = client.post("/signals", json=body)
+    assert r.status_code == 400 and "error" in r.json
+
+
+def test_batch_signals_stream_before_slowest_finishes():
+    import threading
+
+    release = threading.Event()
+
+    class Slow(DataFetcher):
+        def get(self, ticker, interval="1h"):
+            if ticker == "SLOW":
+                assert release.wait(5)
+            return super().get(ticker, interval)
+
+    app = create_app(fetcher=Slow(use_synthetic=True))
+    with app.test_client() as c:
+        r     = c.post("/signals", json={"tickers": ["SLOW", "FAST"]}, buffered=False)
+        lines = iter(r.response)
+        assert json.loads(next(lines))["ticker"] == "FAST"     # SLOW is still blocked
+        release.set()
+        assert json.loads(next(lines))["ticker"] == "SLOW"
+        r.close()
+
+
+def test_stream_pushes_filtered_alerts():
+    app = create_app(fetcher=DataFetcher(use_synthetic=True), stream_heartbeat=0.05)
+    with app.test_client() as c:
+        r      = c.get("/stream?tickers=MSFT", buffered=False)
+        frames = iter(r.response)
+        assert r.mimetype == "text/event-stream"
+        assert next(frames) == b"retry: 3000\n\n"
+        assert next(frames) == b": keep-alive\n\n"            # nothing for MSFT yet
+
+        for ticker in ("AAPL", "MSFT"):
+            payload = {"ticker": ticker, "price": 100, "action": "buy", "interval": "1h"}
+            assert c.post("/webhook", json=payload).status_code == 200
+
+        frame = next(frames).decode()
+        assert frame.startswith("id: 2\nevent: signal\n")
+        event = json.loads(frame.split("data: ", 1)[1])
+        assert event["ticker"] == "MSFT"
+        assert set(event["components"]) == {"rsi", "macd", "bb", "st", "vwap"}
+        assert c.get("/stats").json["stream"] == {
+            "subscribers": 1, "published": 2, "delivered": 1, "dropped": 0,
+        }
+        r.close()
+    assert app.extensions["hub"].stats()["subscribers"] == 0
+
+
+@pytest.mark.parametrize("async_mode", [False, True])
+def test_apps_sharing_a_router_publish_each_alert_once(async_mode):
+    router  = AlertRouter()
+    fetcher = DataFetcher(use_synthetic=True)
+    create_app(fetcher=fetcher, router=router, async_mode=async_mode)
+    app     = create_app(fetcher=fetcher, router=router, async_mode=async_mode)
+    hub     = app.extensions["hub"]
+    with hub.subscribe() as sub, app.test_client() as c:
+        payload = {"ticker": "AAPL", "price": 100, "action": "buy", "interval": "1h"}
+        assert c.post("/webhook", json=payload).status_code in (200, 202)
+        assert sub.get(timeout=5) is not None
+        assert sub.get(timeout=0.2) is None
+    assert hub.stats()["published"] == 1
+    assert router._channels == []
+
+
+def asgi_call(app, method, path, body=b"", headers=()):
+    """One request straight through the ASGI callable → (status, decoded JSON body)."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "method": method, "path": unquote(path), "raw_path": path.encode(),
+        "query_string": query.encode(), "headers": list(headers),
+    }
+    sent  = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def test_asgi_routes_match_flask():
+    from src.server import create_asgi_app
+
+    fetcher = DataFetcher(use_synthetic=True)
+    app     = create_asgi_app(fetcher=fetcher)
+    flask   = create_app(fetcher=fetcher).test_client()
+
+    status, health = asgi_call(app, "GET", "/health")
+    assert status == 200 and health["mode"] == "asgi"
+
+    alert   = {"ticker": "AAPL", "price": 180.5, "action": "buy", "interval": "1h"}
+    status, data = asgi_call(app, "POST", "/webhook", json.dumps(alert).encode())
+    assert status == 200 and data["ticker"] == "AAPL"
+    assert asgi_call(app, "POST", "/webhook", b"not json")[0] == 400
+    assert asgi_call(app, "GET", "/nope")[0] == 404
+
+    status, data = asgi_call(app, "GET", "/signal/msft?interval=D")
+    assert status == 200 and data == flask.get("/signal/MSFT?interval=D").json
+
+    status, data = asgi_call(app, "GET", "/signal/brk%2Fb")      # encoded "/" stays in the ticker
+    assert status == 200 and data["ticker"] == "BRK/B"
+    assert asgi_call(app, "GET", "/signal/a/b")[0] == 404
+
+
+def test_asgi_webhook_secret(monkeypatch):
+    from src.server import create_asgi_app
+
+    monkeypatch.setenv("WEBHOOK_SECRET", "s3cret")
+    app     = create_asgi_app(fetcher=DataFetcher(use_synthetic=True))
+    payload = json.dumps({"ticker": "AAPL", "price": 1, "interval": "1h"}).encode()
+    assert asgi_call(app, "POST", "/webhook", payload)[0] == 401
+    assert asgi_call(app, "POST", "/webhook", payload, [(b"x-webhook-secret", b"s3cret")])[0] == 200
+
+
+def test_asgi_server_holds_concurrent_slow_notifications():
+    from src.alerts.aio_http import AsyncHTTPPool
+    from src.server import create_asgi_app
+    from src.server.asgi import serve_async
+
+    from .stub_http import StubHTTPServer
+
+    async def burst(app, n):
+        started = asyncio.get_running_loop().create_future()
+        server  = asyncio.create_task(serve_async(app, "127.0.0.1", 0, started=started))
+        host, port = await started
+        client  = AsyncHTTPPool()
+        payload = json.dumps({"ticker": "AAPL", "price": 1, "interval": "1h"}).encode()
+        t0      = time.perf_counter()
+        replies = await asyncio.gather(*(
+            client.request("POST", f"http://{host}:{port}/webhook", payload) for _ in range(n)
+        ))
+        elapsed = time.perf_counter() - t0
+        await client.close()
+        server.cancel()
+        return replies, elapsed
+
+    with StubHTTPServer() as srv:
+        srv.routes["/slack"] = (0.5, 200)
+        router = AlertRouter()
+        router.add_slack(srv.url("/slack"))
+        app = create_asgi_app(fetcher=DataFetcher(use_synthetic=True), router=router)
+        replies, elapsed = asyncio.run(burst(app, 40))
+    assert [status for status, _ in replies] == [200] * 40
+    assert len(srv.requests) == 40
+    assert elapsed < 5                                   # 40 × 0.5s notifications overlap
+
+
+def raw_exchange(data: bytes, **server_kw) -> bytes:
+    """Send raw bytes to the built-in server; everything it writes before closing."""
+    from src.server import create_asgi_app
+    from src.server.asgi import serve_async
+
+    async def exchange():
+        app     = create_asgi_app(fetcher=DataFetcher(use_synthetic=True))
+        started = asyncio.get_running_loop().create_future()
+        server  = asyncio.create_task(
+            serve_async(app, "127.0.0.1", 0, started=started, **server_kw),
+        )
+        reader, writer = await asyncio.open_connection(*await started)
+        writer.write(data)
+        try:
+            return await asyncio.wait_for(reader.read(), 5)
+        finally:
+            writer.close()
+            server.cancel()
+
+    return asyncio.run(exchange())
+
+
+@pytest.mark.parametrize("data,status", [
+    (b"POST /webhook HTTP/1.1\r\nContent-Length: 4096\r\n\r\n", 413),
+    (b"POST /webhook HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n0\r\n\r\n", 400),
+    (b"POST /webhook HTTP/1.1\r\nContent-Length: -1\r\n\r\n", 400),
+    (b"POST /webhook HTTP/1.1\r\nContent-Length: 5\r\nContent-Length: 6\r\n\r\nhello!", 400),
+    (b"GARBAGE\r\n\r\n", 400),
+    (b"GET / HTTP/1.1\r\nX-Pad: " + b"a" * 100_000 + b"\r\n\r\n", 431),
+])
+def test_asgi_server_rejects_bad_framing(data, status):
+    reply = raw_exchange(data, max_body=1024)
+    assert reply.startswith(f"HTTP/1.1 {status} ".encode())
+    assert b"connection: close" in reply
+
+
+def test_asgi_server_drops_stalled_clients():
+    t0    = time.perf_counter()
+    head  = b"POST /webhook HTTP/1.1\r\nContent-Length: 50\r\n\r\n"
+    reply = raw_exchange(head + b'{"tick', read_timeout=0.2)          # 6 of 50 bytes, then silence
+    assert reply == b"" and time.perf_counter() - t0 < 3